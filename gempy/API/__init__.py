@@ -8,7 +8,13 @@ from .initialization_API import (
 # Compute API
 from .compute_API import (
     compute_model,
-    compute_model_at
+    compute_model_at,
+    compute_model_async,
+    compute_model_progressive,
+    compute_model_at_async,
+    compute_scalar_fields_at,
+    compute_model_tiled,
+    compute_models_batch
 )
 
 # Map stack to surfaces API
@@ -23,11 +29,12 @@ from .grid_API import (
     set_topography_from_random,
     set_topography_from_file,
     set_topography_from_subsurface_structured_grid,
-    set_topography_from_arrays
+    set_topography_from_arrays,
+    set_topography_from_dem
 )
 
 # Examples generator
-from .examples_generator import generate_example_model
+from .examples_generator import generate_example_model, generate_synthetic_model
 
 # Faults API
 from .faults_API import (
@@ -60,16 +67,22 @@ from ..modules.data_manipulation.manipulate_structural_frame import (
 )
 
 # Geophysics
-from gempy_engine.modules.geophysics.gravity_gradient import calculate_gravity_gradient
+from ..modules.geophysics.gravity_kernel import calculate_gravity_gradient
+from ..modules.geophysics.fft_gravity import compute_gravity_fft
+from ..modules.geophysics.gravity_batch import compute_gravity_batch, gravity_density_operator
+
+# Precision
+from ..core.data.precision import set_float_dtype, get_float_dtype, float_precision
 
 __all__ = [
         'create_data_legacy', 'create_geomodel', 'structural_elements_from_borehole_set',
-        'compute_model', 'compute_model_at', 'map_stack_to_surfaces',
-        'set_section_grid', 'set_active_grid', 'set_topography_from_random', 'set_topography_from_file', 'set_topography_from_subsurface_structured_grid', 'set_topography_from_arrays',
+        'compute_model', 'compute_model_at', 'compute_model_async', 'compute_model_progressive', 'compute_model_at_async', 'compute_scalar_fields_at', 'compute_model_tiled', 'compute_models_batch', 'map_stack_to_surfaces',
+        'set_section_grid', 'set_active_grid', 'set_topography_from_random', 'set_topography_from_file', 'set_topography_from_subsurface_structured_grid', 'set_topography_from_arrays', 'set_topography_from_dem',
         'set_custom_grid', 'set_centered_grid',
-        'generate_example_model', 'set_fault_relation', 'set_is_fault', 'set_is_finite_fault',
+        'generate_example_model', 'generate_synthetic_model', 'set_fault_relation', 'set_is_fault', 'set_is_finite_fault',
         'add_surface_points', 'add_orientations', 'delete_surface_points', 'delete_orientations',
         'create_orientations_from_surface_points_coords', 'modify_surface_points', 'modify_orientations',
         'add_structural_group', 'remove_structural_group_by_index', 'remove_structural_group_by_name', 'remove_element_by_name',
-        'calculate_gravity_gradient'
+        'calculate_gravity_gradient', 'compute_gravity_fft', 'compute_gravity_batch', 'gravity_density_operator',
+        'set_float_dtype', 'get_float_dtype', 'float_precision'
 ]
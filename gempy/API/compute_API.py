@@ -1,4 +1,15 @@
-﻿from typing import Optional
+﻿import asyncio
+import concurrent.futures
+import contextlib
+import copy
+import dataclasses
+import functools
+import itertools
+import multiprocessing
+import pickle
+import queue
+import threading
+from typing import Optional, Iterator, Union, Sequence, Callable
 
 import numpy as np
 
@@ -6,12 +17,28 @@ import gempy_engine
 from gempy_engine.core.backend_tensor import BackendTensor
 from gempy.API.gp2_gp3_compatibility.gp3_to_gp2_input import gempy3_to_gempy2
 from gempy_engine.config import AvailableBackends
-from gempy_engine.core.data import Solutions
+from gempy_engine.API.interp_single.interp_features import interpolate_all_fields_no_octree
+from gempy_engine.core.data import Solutions, SurfacePoints, Orientations, InterpolationOptions
+from gempy_engine.core.data.geophysics_input import GeophysicsInput
+from gempy_engine.core.data.input_data_descriptor import InputDataDescriptor
+from gempy_engine.core.data.interp_output import InterpOutput
 from gempy_engine.core.data.interpolation_input import InterpolationInput
-from .grid_API import set_custom_grid
+from gempy_engine.core.data.output.blocks_value_type import ValueType
+from gempy_engine.core.data.transforms import Transform
+from gempy_engine.modules.weights_cache.weights_cache_interface import WeightCache
 from ..core.data.gempy_engine_config import GemPyEngineConfig
 from ..core.data.geo_model import GeoModel
-from ..modules.data_manipulation.engine_factory import interpolation_input_from_structural_frame
+from ..core.data.grid_modules import RegularGrid, CustomGrid, GridTile
+from ..core.data.compute_profile import ComputeProfile
+from ..core.data.precision import engine_dtype, get_float_dtype, set_float_dtype
+from ..core.data.solution_cache import solution_cache_key
+from ..modules.data_manipulation.engine_factory import interpolation_input_from_structural_frame, interpolation_input_at, interpolation_input_at_points
+from ..modules.grids.octree_roi_refinement import restrict_next_octree_grid
+from ..modules.parallel.compute_control import model_lock, engine_lock, cancellation_scope, in_cancellation_scope, raise_if_cancelled
+from ..modules.parallel.parallel_groups import interpolate_all_fields_in_parallel, worker_pool
+from ..modules.progressive.progressive_octree import compute_model_progressively
+from ..modules.profiling.compute_profiler import ComputeProfiler, profile_stage
+from ..modules.profiling.profiled_interpolation import interpolate_all_fields_by_group
 from ..optional_dependencies import require_gempy_legacy
 
 
@@ -30,57 +57,457 @@ def compute_model(gempy_model: GeoModel, engine_config: Optional[GemPyEngineConf
         Solutions: The computed geological model.
     """
     engine_config = engine_config or GemPyEngineConfig(use_gpu=False)
+    profiler: Optional[ComputeProfiler] = ComputeProfiler(trace_memory=engine_config.profile_memory) if engine_config.profiling else None
+
+    with model_lock(gempy_model), engine_lock(), profiler or contextlib.nullcontext():
+        match engine_config.backend:
+            case AvailableBackends.numpy | AvailableBackends.PYTORCH:
+
+                BackendTensor.change_backend_gempy(
+                    engine_backend=engine_config.backend,
+                    use_gpu=engine_config.use_gpu,
+                    dtype=engine_dtype(engine_config.dtype)
+                )
+
+                # * Cached solutions cannot carry the gradient tape, so the cache is skipped when computing gradients
+                use_cache: bool = engine_config.solution_cache is not None and BackendTensor.COMPUTE_GRADS is False
+                cached_solutions: Optional[Solutions] = None
+                if use_cache:
+                    with profile_stage("solution cache lookup"):
+                        cache_key = solution_cache_key(gempy_model, engine_config)
+                        cached_solutions = engine_config.solution_cache.get(cache_key)
+
+                if cached_solutions is not None:
+                    with profile_stage("solutions post-processing"):
+                        gempy_model.solutions = _copy_for_cache(cached_solutions)
+                else:
+                    # TODO: To decide what to do with this.
+                    with profile_stage("input building"):
+                        interpolation_input = interpolation_input_from_structural_frame(gempy_model, reuse_unchanged=True)
+                    gempy_model.taped_interpolation_input = interpolation_input  # * This is used for gradient tape
+
+                    with profile_stage("engine"):
+                        refine_next_grid = _octree_roi_function(gempy_model)
+                        if _uses_octree_loop(engine_config) or refine_next_grid is not None:
+                            solutions = compute_model_progressively(
+                                interpolation_input=interpolation_input,
+                                options=gempy_model.interpolation_options,
+                                data_descriptor=gempy_model.input_data_descriptor,
+                                geophysics_input=gempy_model.geophysics_input,
+                                time_budget=engine_config.octree_time_budget,
+                                memory_budget=engine_config.octree_memory_budget,
+                                on_octree_level=engine_config.on_octree_level,
+                                interpolate_fields=_interpolate_fields_function(engine_config),
+                                refine_next_grid=refine_next_grid
+                            )
+                        else:
+                            solutions = gempy_engine.compute_model(
+                                interpolation_input=interpolation_input,
+                                options=gempy_model.interpolation_options,
+                                data_descriptor=gempy_model.input_data_descriptor,
+                                geophysics_input=gempy_model.geophysics_input,
+                            )
+
+                    with profile_stage("solutions post-processing"):
+                        gempy_model.solutions = solutions
+
+                    # * Solutions cut short by a budget are not the solutions of the model
+                    is_complete = len(solutions.octrees_output) == gempy_model.interpolation_options.number_octree_levels
+                    if use_cache and is_complete:
+                        engine_config.solution_cache.put(cache_key, _copy_for_cache(gempy_model.solutions))
+
+            case AvailableBackends.aesara | AvailableBackends.legacy:
+                gempy_model.legacy_model = _legacy_compute_model(gempy_model)
+            case _:
+                raise ValueError(f'Backend {engine_config} not supported')
+
+    if profiler is not None:
+        _attach_profile(gempy_model.solutions, profiler.report, engine_config)
+    return gempy_model.solutions
 
-    match engine_config.backend:
-        case AvailableBackends.numpy | AvailableBackends.PYTORCH:
-
-            BackendTensor.change_backend_gempy(
-                engine_backend=engine_config.backend,
-                use_gpu=engine_config.use_gpu,
-                dtype=engine_config.dtype
-            )
-
-            # TODO: To decide what to do with this.
-            interpolation_input = interpolation_input_from_structural_frame(gempy_model)
-            gempy_model.taped_interpolation_input = interpolation_input  # * This is used for gradient tape
 
-            gempy_model.solutions = gempy_engine.compute_model(
-                interpolation_input=interpolation_input,
-                options=gempy_model.interpolation_options,
-                data_descriptor=gempy_model.input_data_descriptor,
-                geophysics_input=gempy_model.geophysics_input,
-            )
+def compute_model_progressive(gempy_model: GeoModel, engine_config: Optional[GemPyEngineConfig] = None) -> Iterator[Solutions]:
+    """
+    Compute the geological model in the background and yield a `Solutions` snapshot after every octree level.
 
-        case AvailableBackends.aesara | AvailableBackends.legacy:
-            gempy_model.legacy_model = _legacy_compute_model(gempy_model)
-        case _:
-            raise ValueError(f'Backend {engine_config} not supported')
+    The coarse levels are available in a fraction of the time of the full model, so a viewer can show them while
+    the finer levels are computed. The last yielded solutions are the solutions of the model, which are also set on
+    `gempy_model` as in `compute_model`. `engine_config.octree_time_budget` and `octree_memory_budget` still apply.
+    If the generator is closed early, the computation stops at the next octree level.
 
-    return gempy_model.solutions
+    Args:
+        gempy_model (GeoModel): The GemPy model to compute.
+        engine_config (Optional[GemPyEngineConfig]): Configuration for the computational engine. Defaults to None, in which case a default configuration will be used.
 
+    Yields:
+        Solutions: The solutions of the octree levels computed so far.
+    """
+    engine_config = copy.copy(engine_config or GemPyEngineConfig(use_gpu=False))
+    snapshots: queue.Queue = queue.Queue()
+    engine_config.on_octree_level = snapshots.put
+    cancel_event = threading.Event()
+    done = object()
 
-def compute_model_at(gempy_model: GeoModel, at: np.ndarray,
-                     engine_config: Optional[GemPyEngineConfig] = None) -> np.ndarray:
+    def run():
+        try:
+            with cancellation_scope(cancel_event):
+                snapshots.put(compute_model(gempy_model, engine_config))
+        except BaseException as e:
+            snapshots.put(e)
+        finally:
+            snapshots.put(done)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while (item := snapshots.get()) is not done:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        cancel_event.set()
+        thread.join()
+
+
+def compute_model_at(gempy_model: GeoModel, at: Union[np.ndarray, RegularGrid, CustomGrid],
+                     engine_config: Optional[GemPyEngineConfig] = None,
+                     chunk_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Compute the geological model at specific coordinates.
-    
-    Note: This function sets a custom grid and computes the model so be wary of side effects.
+
+    The model is not modified and only the given coordinates are evaluated. The kriging weights solved by the last
+    `compute_model` are taken from the engine weights cache, so unless the input data changed since then, a query
+    only evaluates the already solved system at the new points.
+
+    For very large sets of points, `chunk_size` streams the coordinates through the engine in blocks and `out`
+    receives the results block by block, so the peak memory is bounded by the chunk. Both `at` and `out` can be
+    memory-mapped arrays (e.g. `np.load(..., mmap_mode='r')` and `np.lib.format.open_memmap`). For a `CustomGrid`
+    read from a file, `CustomGrid.open_output` creates such an `out` next to it.
 
     Args:
         gempy_model (GeoModel): The GemPy model to compute.
-        at (np.ndarray): The coordinates at which to compute the model.
+        at (Union[np.ndarray, RegularGrid, CustomGrid]): The coordinates at which to compute the model, a `RegularGrid` whose coordinates are generated chunk by chunk (see `RegularGrid(implicit=True)`) or a `CustomGrid`, which can be memory-mapped from a `.npy` file.
         engine_config (Optional[GemPyEngineConfig], optional): Configuration for the computational engine. Defaults to None, in which case a default configuration will be used.
+        chunk_size (Optional[int], optional): Number of points evaluated at once. Defaults to None, in which case all the points are evaluated at once.
+        out (Optional[np.ndarray], optional): Preallocated array of shape (n_points,) where the results are written. Defaults to None, in which case a new array is allocated.
 
     Returns:
         np.ndarray: The computed geological model at the specified coordinates.
     """
-    set_custom_grid(
-        grid=gempy_model.grid,
-        xyz_coord=at
+    at = _check_query_points(at)
+    if out is None:
+        out = np.empty(len(at), dtype=get_float_dtype())
+    _check_query_output(out, (len(at),))
+
+    for chunk, outputs in _iter_interpolate_at(gempy_model, at, engine_config, chunk_size):
+        out[chunk] = BackendTensor.t.to_numpy(outputs[-1].custom_grid_values)
+    return out
+
+
+def compute_scalar_fields_at(gempy_model: GeoModel, at: Union[np.ndarray, RegularGrid, CustomGrid],
+                             engine_config: Optional[GemPyEngineConfig] = None,
+                             chunk_size: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute the scalar fields of every structural group at specific coordinates.
+
+    Like `compute_model_at`, the model is not modified, the kriging weights of the last `compute_model` are reused
+    and the points can be streamed through the engine in chunks.
+
+    Args:
+        gempy_model (GeoModel): The GemPy model to compute.
+        at (Union[np.ndarray, RegularGrid, CustomGrid]): The coordinates at which to compute the scalar fields, a `RegularGrid` whose coordinates are generated chunk by chunk or a `CustomGrid`.
+        engine_config (Optional[GemPyEngineConfig], optional): Configuration for the computational engine. Defaults to None, in which case a default configuration will be used.
+        chunk_size (Optional[int], optional): Number of points evaluated at once. Defaults to None, in which case all the points are evaluated at once.
+        out (Optional[np.ndarray], optional): Preallocated array of shape (n_groups, n_points) where the results are written. Defaults to None, in which case a new array is allocated.
+
+    Returns:
+        np.ndarray: The scalar fields at the specified coordinates with shape (n_groups, n_points).
+    """
+    at = _check_query_points(at)
+    n_groups = gempy_model.input_data_descriptor.stack_structure.n_stacks
+    if out is None:
+        out = np.empty((n_groups, len(at)), dtype=get_float_dtype())
+    _check_query_output(out, (n_groups, len(at)))
+
+    for chunk, outputs in _iter_interpolate_at(gempy_model, at, engine_config, chunk_size):
+        for i, output in enumerate(outputs):
+            out[i, chunk] = BackendTensor.t.to_numpy(output.get_block_from_value_type(ValueType.scalar, slice_=output.grid.custom_grid_slice))
+    return out
+
+
+def compute_model_tiled(gempy_model: GeoModel, tile_shape: Sequence[int], grid: Optional[RegularGrid] = None,
+                        halo: int = 1, engine_config: Optional[GemPyEngineConfig] = None,
+                        lith_block: Optional[np.ndarray] = None, scalar_block: Optional[np.ndarray] = None,
+                        max_workers: Optional[int] = None,
+                        on_tile: Optional[Callable[[GridTile, np.ndarray, np.ndarray], None]] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the geological model on a dense regular grid tile by tile.
+
+    The grid is split into boxes of `tile_shape` cells that are evaluated independently, so only the coordinates and
+    results of one tile are in memory at once. The results are assembled into `lith_block` and `scalar_block`, which
+    can be memory-mapped (e.g. `np.lib.format.open_memmap`) for grids larger than memory. Like `compute_model_at`,
+    the model is not modified and the kriging weights of the last `compute_model` are reused.
+
+    With `max_workers`, the input data and the kriging weights are copied when the call starts and sent to the worker
+    processes, which therefore never see later changes to the model. The weights are solved first if they are not
+    cached yet, unless the weights cache is disabled in the interpolation options, in which case every worker solves
+    the system again.
+
+    Every tile is evaluated with a halo of `halo` cells around it. `on_tile` receives the results including the halo,
+    so meshes extracted per tile (e.g. with marching cubes) close across the tile borders.
+
+    Args:
+        gempy_model (GeoModel): The GemPy model to compute.
+        tile_shape (Sequence[int]): Maximum number of cells of a tile along x, y and z.
+        grid (Optional[RegularGrid], optional): Grid to evaluate. Defaults to None, in which case the dense grid of the model is used. Implicit grids are never materialized.
+        halo (int, optional): Number of cells evaluated around every tile. Defaults to 1.
+        engine_config (Optional[GemPyEngineConfig], optional): Configuration for the computational engine. Defaults to None, in which case a default configuration will be used.
+        lith_block (Optional[np.ndarray], optional): Preallocated array of shape `grid.resolution` where the lithology is written. Defaults to None, in which case a new array is allocated.
+        scalar_block (Optional[np.ndarray], optional): Preallocated array of shape (n_groups, *grid.resolution) where the scalar fields are written. Defaults to None, in which case a new array is allocated.
+        max_workers (Optional[int], optional): If given, the tiles are evaluated in that many worker processes. Defaults to None, in which case they are evaluated in this process.
+        on_tile (Optional[Callable[[GridTile, np.ndarray, np.ndarray], None]], optional): Called with every tile and its lithology and scalar fields, shaped `tile.halo_shape` and (n_groups, *tile.halo_shape).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The lithology block with shape `grid.resolution` and the scalar fields with shape (n_groups, *grid.resolution).
+    """
+    grid = grid if grid is not None else gempy_model.grid.dense_grid
+    if grid is None:
+        raise ValueError('The model has no dense grid. Set one or pass the grid to evaluate.')
+    engine_config = engine_config or GemPyEngineConfig(use_gpu=False)
+
+    resolution = tuple(int(n) for n in grid.resolution)
+    n_groups = gempy_model.input_data_descriptor.stack_structure.n_stacks
+    if lith_block is None:
+        lith_block = np.empty(resolution, dtype=get_float_dtype())
+    if scalar_block is None:
+        scalar_block = np.empty((n_groups, *resolution), dtype=get_float_dtype())
+    _check_query_output(lith_block, resolution)
+    _check_query_output(scalar_block, (n_groups, *resolution))
+
+    def assemble(tile: GridTile, tile_lith: np.ndarray, tile_scalar: np.ndarray):
+        lith_block[tile.slices] = tile_lith[tile.interior]
+        scalar_block[(slice(None), *tile.slices)] = tile_scalar[(slice(None), *tile.interior)]
+        if on_tile is not None:
+            on_tile(tile, tile_lith, tile_scalar)
+
+    tiles = grid.iter_tiles(tile_shape, halo=halo)
+    if max_workers is None:
+        for tile in tiles:
+            raise_if_cancelled()
+            assemble(tile, *_compute_tile(gempy_model, grid, tile, engine_config))
+        return lith_block, scalar_block
+
+    with model_lock(gempy_model), engine_lock():
+        # * Pickled while the model is locked, since the workers receive their input only when they start
+        snapshot = pickle.dumps(_tile_snapshot(gempy_model, grid, engine_config))
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_tile_worker,
+        initargs=(snapshot,)
     )
+    with executor:
+        pending: dict[concurrent.futures.Future, GridTile] = {}
+        for tile in itertools.chain(tiles, [None]):
+            # * Bound the tiles in flight, so the results waiting to be assembled stay small
+            while pending and (tile is None or len(pending) >= 2 * max_workers):
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    assemble(pending.pop(future), *future.result())
+            if tile is not None:
+                raise_if_cancelled()
+                pending[executor.submit(_compute_tile_in_worker, tile)] = tile
+    return lith_block, scalar_block
+
+
+async def compute_model_async(gempy_model: GeoModel, engine_config: Optional[GemPyEngineConfig] = None,
+                              executor: Optional[concurrent.futures.Executor] = None) -> Solutions:
+    """
+    Asyncio variant of `compute_model` that does not block the event loop.
+
+    The computation runs in `executor`, but all the computations of the process are serialized by `engine_lock`,
+    because the engine backend is global to the process. Concurrent requests therefore run one at a time, even for
+    different models, and never overwrite each other's `taped_interpolation_input` and `solutions`. The executor
+    only keeps the event loop free. If the awaiting task is cancelled, the computation stops at the next octree
+    level and the cancellation is propagated once the model is no longer in use.
+
+    Args:
+        gempy_model (GeoModel): The GemPy model to compute.
+        engine_config (Optional[GemPyEngineConfig]): Configuration for the computational engine. Defaults to None, in which case a default configuration will be used.
+        executor (Optional[concurrent.futures.Executor]): Thread pool where the computation runs. Defaults to None, in which case the default executor of the event loop is used.
+
+    Returns:
+        Solutions: The computed geological model.
+    """
+    return await _run_in_executor(executor, compute_model, gempy_model, engine_config)
+
+
+async def compute_model_at_async(gempy_model: GeoModel, at: Union[np.ndarray, RegularGrid, CustomGrid],
+                                 engine_config: Optional[GemPyEngineConfig] = None,
+                                 chunk_size: Optional[int] = None, out: Optional[np.ndarray] = None,
+                                 executor: Optional[concurrent.futures.Executor] = None) -> np.ndarray:
+    """
+    Asyncio variant of `compute_model_at` that does not block the event loop.
+
+    Like `compute_model_async`, it runs in `executor`, waits for the other computations of the process and stops
+    between chunks of `chunk_size` points when the awaiting task is cancelled.
+
+    Args:
+        gempy_model (GeoModel): The GemPy model to compute.
+        at (Union[np.ndarray, RegularGrid, CustomGrid]): The coordinates at which to compute the model, a `RegularGrid` whose coordinates are generated chunk by chunk (see `RegularGrid(implicit=True)`) or a `CustomGrid`, which can be memory-mapped from a `.npy` file.
+        engine_config (Optional[GemPyEngineConfig], optional): Configuration for the computational engine. Defaults to None, in which case a default configuration will be used.
+        chunk_size (Optional[int], optional): Number of points evaluated at once. Defaults to None, in which case all the points are evaluated at once.
+        out (Optional[np.ndarray], optional): Preallocated array of shape (n_points,) where the results are written. Defaults to None, in which case a new array is allocated.
+        executor (Optional[concurrent.futures.Executor]): Thread pool where the computation runs. Defaults to None, in which case the default executor of the event loop is used.
+
+    Returns:
+        np.ndarray: The computed geological model at the specified coordinates.
+    """
+    return await _run_in_executor(executor, compute_model_at, gempy_model, at, engine_config, chunk_size, out)
+
+
+def compute_models_batch(geo_model: GeoModel, surface_points_xyz: np.ndarray,
+                         orientations_xyz: Optional[np.ndarray] = None,
+                         orientations_gradients: Optional[np.ndarray] = None,
+                         engine_config: Optional[GemPyEngineConfig] = None,
+                         max_workers: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute an ensemble of realizations of the same geological model.
+
+    The grid, the input data descriptor and the interpolation options are built once from `geo_model` and
+    shared by every realization. Only the coordinates of the surface points and orientations change between
+    realizations, so the structure of the model (elements, groups and faults) must stay the same. The input
+    and grid transforms of the model are kept fixed for the whole ensemble. The model itself is not modified.
+
+    Realizations are independent, so with `max_workers` they are split into blocks that are computed in the worker
+    processes of the parallel structural groups. The shared input is sent once per block.
+
+    Args:
+        geo_model (GeoModel): The GemPy model used as template for all the realizations.
+        surface_points_xyz (np.ndarray): Stacked surface points coordinates of shape (n_realizations, n_points, 3)
+            in the same order as `geo_model.surface_points_copy`.
+        orientations_xyz (Optional[np.ndarray]): Stacked orientations coordinates of shape
+            (n_realizations, n_orientations, 3). Defaults to None, in which case the model orientations are used.
+        orientations_gradients (Optional[np.ndarray]): Stacked orientations gradients of shape
+            (n_realizations, n_orientations, 3). Defaults to None, in which case the model gradients are used.
+        engine_config (Optional[GemPyEngineConfig]): Configuration for the computational engine. Defaults to None,
+            in which case a default configuration will be used.
+        max_workers (Optional[int]): If given, the realizations are computed in that many worker processes. Only
+            supported with the numpy backend. Defaults to None, in which case they are computed in this process.
+
+    Raises:
+        ValueError: If the backend is not supported or the shapes of the arrays do not match the model.
 
-    sol = compute_model(gempy_model, engine_config)
-    return sol.raw_arrays.custom
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Stacked lithology blocks of shape (n_realizations, n_voxels) and stacked
+        scalar field matrices of shape (n_realizations, n_groups, n_voxels).
+    """
+    engine_config = engine_config or GemPyEngineConfig(use_gpu=False)
+    if engine_config.backend not in (AvailableBackends.numpy, AvailableBackends.PYTORCH):
+        raise ValueError(f'Backend {engine_config} not supported for batch computations')
+    if max_workers is not None and engine_config.backend is not AvailableBackends.numpy:
+        raise ValueError(f'Realizations can only be computed in worker processes with the numpy backend. Received {engine_config.backend}')
+
+    surface_points_xyz = np.asarray(surface_points_xyz, dtype=float)
+    n_realizations = surface_points_xyz.shape[0]
+    _check_batch_shape(surface_points_xyz, n_realizations, len(geo_model.surface_points_copy), 'surface_points_xyz')
+    n_orientations = len(geo_model.orientations_copy)
+    if orientations_xyz is not None:
+        orientations_xyz = np.asarray(orientations_xyz, dtype=float)
+        _check_batch_shape(orientations_xyz, n_realizations, n_orientations, 'orientations_xyz')
+    if orientations_gradients is not None:
+        orientations_gradients = np.asarray(orientations_gradients, dtype=float)
+        _check_batch_shape(orientations_gradients, n_realizations, n_orientations, 'orientations_gradients')
+
+    with engine_lock():
+        BackendTensor.change_backend_gempy(
+            engine_backend=engine_config.backend,
+            use_gpu=engine_config.use_gpu,
+            dtype=engine_dtype(engine_config.dtype)
+        )
+
+        # * Everything that does not depend on the realization is computed only once
+        base_interpolation_input: InterpolationInput = interpolation_input_from_structural_frame(geo_model)
+        total_transform = geo_model.input_transform + geo_model.grid.transform
+        realizations = _BatchRealizations(
+            surface_points=_transform_realization_points(geo_model, surface_points_xyz),
+            orientations_positions=_transform_realization_points(geo_model, orientations_xyz) if orientations_xyz is not None else None,
+            orientations_gradients=(
+                total_transform.transform_gradient(orientations_gradients.reshape(-1, 3)).reshape(orientations_gradients.shape)
+                if orientations_gradients is not None else None
+            )
+        )
+        args = (base_interpolation_input, geo_model.interpolation_options, geo_model.input_data_descriptor, geo_model.geophysics_input)
+        if max_workers is None:
+            return _compute_realizations(*args, realizations)
+
+        executor = worker_pool(max_workers)
+        blocks = np.array_split(np.arange(n_realizations), min(n_realizations, max_workers))
+        futures = [executor.submit(_compute_realizations, *args, realizations.subset(block)) for block in blocks]
+        try:
+            results = [future.result() for future in futures]
+        finally:
+            for future in futures:
+                future.cancel()
+        return np.concatenate([lith for lith, _ in results]), np.concatenate([scalar for _, scalar in results])
+
+
+@dataclasses.dataclass
+class _BatchRealizations:
+    """Coordinates of a block of realizations, already in the coordinates of the engine."""
+    surface_points: np.ndarray
+    orientations_positions: Optional[np.ndarray] = None
+    orientations_gradients: Optional[np.ndarray] = None
+
+    def subset(self, index: np.ndarray) -> "_BatchRealizations":
+        return _BatchRealizations(*(array[index] if array is not None else None for array in dataclasses.astuple(self)))
+
+
+def _compute_realizations(base_interpolation_input: InterpolationInput, options: InterpolationOptions,
+                          data_descriptor: InputDataDescriptor, geophysics_input: Optional[GeophysicsInput],
+                          realizations: _BatchRealizations) -> tuple[np.ndarray, np.ndarray]:
+    """Computes a block of realizations. Runs in this process or in the worker processes."""
+    lith_blocks = []
+    scalar_field_matrices = []
+    for i in range(realizations.surface_points.shape[0]):
+        raise_if_cancelled()
+        surface_points = SurfacePoints(
+            sp_coords=realizations.surface_points[i],
+            nugget_effect_scalar=base_interpolation_input.surface_points.nugget_effect_scalar
+        )
+
+        orientations = base_interpolation_input.orientations
+        if realizations.orientations_positions is not None or realizations.orientations_gradients is not None:
+            orientations = Orientations(
+                dip_positions=(
+                    realizations.orientations_positions[i]
+                    if realizations.orientations_positions is not None else orientations.dip_positions
+                ),
+                dip_gradients=(
+                    realizations.orientations_gradients[i]
+                    if realizations.orientations_gradients is not None else orientations.dip_gradients
+                ),
+                nugget_effect_grad=orientations.nugget_effect_grad
+            )
+
+        interpolation_input = InterpolationInput(
+            surface_points=surface_points,
+            orientations=orientations,
+            grid=base_interpolation_input.original_grid,
+            unit_values=base_interpolation_input.unit_values
+        )
+
+        solutions: Solutions = gempy_engine.compute_model(
+            interpolation_input=interpolation_input,
+            options=options,
+            data_descriptor=data_descriptor,
+            geophysics_input=geophysics_input,
+        )
+
+        lith_blocks.append(BackendTensor.t.to_numpy(solutions.raw_arrays.lith_block))
+        scalar_field_matrices.append(BackendTensor.t.to_numpy(solutions.raw_arrays.scalar_field_matrix))
+
+    return np.stack(lith_blocks), np.stack(scalar_field_matrices)
 
 
 def optimize_and_compute(geo_model: GeoModel, engine_config: GemPyEngineConfig, max_epochs: int = 10,
@@ -88,15 +515,28 @@ def optimize_and_compute(geo_model: GeoModel, engine_config: GemPyEngineConfig,
     if engine_config.backend != AvailableBackends.PYTORCH:
         raise ValueError(f'Only PyTorch backend is supported for optimization. Received {engine_config.backend}')
 
+    if not engine_config.profiling:
+        with model_lock(geo_model), engine_lock():
+            return _optimize_and_compute(geo_model, engine_config, max_epochs, convergence_criteria)
+
+    with model_lock(geo_model), engine_lock(), ComputeProfiler(trace_memory=engine_config.profile_memory) as profiler:
+        solutions = _optimize_and_compute(geo_model, engine_config, max_epochs, convergence_criteria)
+    _attach_profile(solutions, profiler.report, engine_config)
+    return solutions
+
+
+def _optimize_and_compute(geo_model: GeoModel, engine_config: GemPyEngineConfig, max_epochs: int,
+                          convergence_criteria: float) -> Solutions:
     BackendTensor.change_backend_gempy(
         engine_backend=engine_config.backend,
         use_gpu=engine_config.use_gpu,
-        dtype=engine_config.dtype
+        dtype=engine_dtype(engine_config.dtype)
     )
 
     import torch
     from gempy_engine.core.data.continue_epoch import ContinueEpoch
-    interpolation_input: InterpolationInput = interpolation_input_from_structural_frame(geo_model)
+    with profile_stage("input building"):
+        interpolation_input: InterpolationInput = interpolation_input_from_structural_frame(geo_model)
 
     geo_model.taped_interpolation_input = interpolation_input
 
@@ -124,12 +564,13 @@ def optimize_and_compute(geo_model: GeoModel, engine_config: GemPyEngineConfig,
         try:
             # geo_model.taped_interpolation_input.grid = geo_model.interpolation_input_copy.grid
 
-            gempy_engine.compute_model(
-                interpolation_input=geo_model.taped_interpolation_input,
-                options=geo_model.interpolation_options,
-                data_descriptor=geo_model.input_data_descriptor,
-                geophysics_input=geo_model.geophysics_input,
-            )
+            with profile_stage(f"epoch {epoch}", epoch=epoch):
+                gempy_engine.compute_model(
+                    interpolation_input=geo_model.taped_interpolation_input,
+                    options=geo_model.interpolation_options,
+                    data_descriptor=geo_model.input_data_descriptor,
+                    geophysics_input=geo_model.geophysics_input,
+                )
         except ContinueEpoch:
             # Get absolute values of gradients
             grad_magnitudes = torch.abs(nugget_effect_scalar.grad)
@@ -168,15 +609,244 @@ def optimize_and_compute(geo_model: GeoModel, engine_config: GemPyEngineConfig,
 
     geo_model.interpolation_options.kernel_options.optimizing_condition_number = False
 
-    geo_model.solutions = gempy_engine.compute_model(
-        interpolation_input=geo_model.taped_interpolation_input,
-        options=geo_model.interpolation_options,
-        data_descriptor=geo_model.input_data_descriptor,
-        geophysics_input=geo_model.geophysics_input,
-    )
+    with profile_stage("engine"):
+        solutions = gempy_engine.compute_model(
+            interpolation_input=geo_model.taped_interpolation_input,
+            options=geo_model.interpolation_options,
+            data_descriptor=geo_model.input_data_descriptor,
+            geophysics_input=geo_model.geophysics_input,
+        )
+
+    with profile_stage("solutions post-processing"):
+        geo_model.solutions = solutions
     return geo_model.solutions
 
 
+def _copy_for_cache(solutions: Solutions) -> Solutions:
+    """Shallow copy of `solutions` without its profile, so every cache hit gets its own `Solutions` object."""
+    solutions = copy.copy(solutions)
+    vars(solutions).pop('profile', None)
+    return solutions
+
+
+def _attach_profile(solutions: Optional[Solutions], report: ComputeProfile, engine_config: GemPyEngineConfig):
+    if solutions is None:  # * Legacy backends do not return gempy_engine solutions
+        return
+    solutions.profile = report
+    if engine_config.profiling_trace_path is not None:
+        report.dump_chrome_trace(engine_config.profiling_trace_path)
+
+
+def _check_query_points(at: Union[np.ndarray, RegularGrid, CustomGrid]) -> Union[np.ndarray, RegularGrid]:
+    if isinstance(at, CustomGrid):
+        at = at.values
+    if isinstance(at, RegularGrid):
+        return at  # * Its coordinates are generated chunk by chunk
+    at = np.asarray(at)  # * No copy, so memory-mapped coordinates are only read chunk by chunk
+    if at.ndim == 1:
+        at = at.reshape(1, -1)
+    if at.ndim != 2 or at.shape[1] != 3:
+        raise ValueError(f'at must have shape (n_points, 3). Received {at.shape}')
+    return at
+
+
+def _query_points_block(at: Union[np.ndarray, RegularGrid], chunk: slice) -> np.ndarray:
+    if isinstance(at, RegularGrid):
+        return at.get_values_block(chunk.start, chunk.stop)
+    return np.asarray(at[chunk], dtype=float)
+
+
+def _check_query_output(out: np.ndarray, shape: tuple[int, ...]):
+    if out.shape != shape:
+        raise ValueError(f'out must have shape {shape}. Received {out.shape}')
+
+
+def _iter_interpolate_at(gempy_model: GeoModel, at: Union[np.ndarray, RegularGrid], engine_config: Optional[GemPyEngineConfig],
+                         chunk_size: Optional[int]) -> Iterator[tuple[slice, list[InterpOutput]]]:
+    engine_config = engine_config or GemPyEngineConfig(use_gpu=False)
+    if engine_config.backend not in (AvailableBackends.numpy, AvailableBackends.PYTORCH):
+        raise ValueError(f'Backend {engine_config} not supported for point queries')
+
+    n_points = len(at)
+    if chunk_size is None:
+        chunk_size = max(n_points, 1)
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be positive. Received {chunk_size}')
+
+    with model_lock(gempy_model), engine_lock():
+        _set_query_backend(engine_config)
+
+        # * The engine writes into the options and the fault data of the descriptor, so we work on copies
+        options = copy.deepcopy(gempy_model.interpolation_options)
+        data_descriptor = copy.deepcopy(gempy_model.input_data_descriptor)
+
+        for start in range(0, n_points, chunk_size):
+            raise_if_cancelled()
+            chunk = slice(start, min(start + chunk_size, n_points))
+            interpolation_input = interpolation_input_at(gempy_model, _query_points_block(at, chunk), reuse_unchanged=True)
+            yield chunk, _interpolate_points(interpolation_input, options, data_descriptor, engine_config)
+
+
+def _set_query_backend(engine_config: GemPyEngineConfig):
+    BackendTensor.change_backend_gempy(
+        engine_backend=engine_config.backend,
+        use_gpu=engine_config.use_gpu,
+        dtype=engine_dtype(engine_config.dtype)
+    )
+
+
+def _interpolate_points(interpolation_input: InterpolationInput, options: InterpolationOptions,
+                        data_descriptor: InputDataDescriptor, engine_config: GemPyEngineConfig) -> list[InterpOutput]:
+    if engine_config.parallel_groups:
+        return interpolate_all_fields_in_parallel(
+            interpolation_input=interpolation_input,
+            options=options,
+            data_descriptor=data_descriptor,
+            max_workers=engine_config.parallel_max_workers
+        )
+    return interpolate_all_fields_no_octree(
+        interpolation_input=interpolation_input,
+        options=options,
+        data_descriptor=data_descriptor
+    )
+
+
+def _compute_tile(gempy_model: GeoModel, grid: RegularGrid, tile: GridTile, engine_config: GemPyEngineConfig) -> tuple[np.ndarray, np.ndarray]:
+    points = grid.get_values_tile(tile.halo_slices)
+    outputs = next(_iter_interpolate_at(gempy_model, points, engine_config, chunk_size=None))[1]
+    return _tile_arrays(outputs, tile)
+
+
+def _tile_arrays(outputs: list[InterpOutput], tile: GridTile) -> tuple[np.ndarray, np.ndarray]:
+    lith = BackendTensor.t.to_numpy(outputs[-1].custom_grid_values).reshape(tile.halo_shape)
+    scalar = np.stack([
+            BackendTensor.t.to_numpy(output.get_block_from_value_type(ValueType.scalar, slice_=output.grid.custom_grid_slice))
+            for output in outputs
+    ]).reshape((len(outputs), *tile.halo_shape))
+    return lith, scalar
+
+
+@dataclasses.dataclass
+class _TileSnapshot:
+    """Everything a tile worker needs to evaluate the model, copied while the model is locked."""
+    surface_points: SurfacePoints
+    orientations: Orientations
+    unit_values: np.ndarray
+    input_transform: Transform
+    options: InterpolationOptions
+    data_descriptor: InputDataDescriptor
+    grid: RegularGrid
+    engine_config: GemPyEngineConfig
+    float_dtype: np.dtype
+    weights: dict[str, dict]
+
+
+def _tile_snapshot(gempy_model: GeoModel, grid: RegularGrid, engine_config: GemPyEngineConfig) -> _TileSnapshot:
+    # * Evaluating a single point solves the weights that are not cached yet, once for all the workers
+    for _ in _iter_interpolate_at(gempy_model, grid.get_values_block(0, 1), engine_config, chunk_size=None):
+        pass
+
+    interpolation_input = interpolation_input_at(gempy_model, np.empty((0, 3)), reuse_unchanged=True)
+    options = copy.deepcopy(gempy_model.interpolation_options)
+    weights_keys = (f"{options.cache_model_name}.{i}" for i in range(gempy_model.input_data_descriptor.stack_structure.n_stacks))
+    return _TileSnapshot(
+        surface_points=interpolation_input.surface_points,
+        orientations=interpolation_input.orientations,
+        unit_values=interpolation_input.unit_values,
+        input_transform=gempy_model.input_transform,
+        options=options,
+        data_descriptor=copy.deepcopy(gempy_model.input_data_descriptor),
+        grid=grid,
+        engine_config=engine_config,
+        float_dtype=get_float_dtype(),
+        weights={key: WeightCache.memory_cache[key] for key in weights_keys if key in WeightCache.memory_cache}
+    )
+
+
+_tile_worker_state: dict = {}
+
+
+def _init_tile_worker(pickled_snapshot: bytes):
+    snapshot: _TileSnapshot = pickle.loads(pickled_snapshot)
+    set_float_dtype(snapshot.float_dtype)  # * Spawned workers start with the default precision
+    _set_query_backend(snapshot.engine_config)
+    WeightCache.memory_cache.update(snapshot.weights)  # * The engine reuses them as long as the input hash matches
+    _tile_worker_state.update(snapshot=snapshot)
+
+
+def _compute_tile_in_worker(tile: GridTile) -> tuple[np.ndarray, np.ndarray]:
+    snapshot: _TileSnapshot = _tile_worker_state["snapshot"]
+    interpolation_input = interpolation_input_at_points(
+        surface_points=snapshot.surface_points,
+        orientations=snapshot.orientations,
+        unit_values=snapshot.unit_values,
+        input_transform=snapshot.input_transform,
+        xyz=snapshot.grid.get_values_tile(tile.halo_slices)
+    )
+    outputs = _interpolate_points(interpolation_input, snapshot.options, snapshot.data_descriptor, snapshot.engine_config)
+    return _tile_arrays(outputs, tile)
+
+
+async def _run_in_executor(executor: Optional[concurrent.futures.Executor], function, *args):
+    if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        raise ValueError("The model is computed in place, so the executor must run in this process, e.g. a ThreadPoolExecutor.")
+
+    cancel_event = threading.Event()
+
+    def run():
+        with cancellation_scope(cancel_event):
+            return function(*args)
+
+    future = asyncio.get_running_loop().run_in_executor(executor, run)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancel_event.set()
+        with contextlib.suppress(BaseException):  # * Wait until the computation stops and releases the model
+            await future
+        raise
+
+
+def _is_progressive(engine_config: GemPyEngineConfig) -> bool:
+    return engine_config.octree_time_budget is not None or engine_config.octree_memory_budget is not None or engine_config.on_octree_level is not None
+
+
+def _octree_roi_function(gempy_model: GeoModel) -> Optional[Callable]:
+    grid = gempy_model.grid
+    if not grid.octree_rois or grid.GridTypes.OCTREE not in grid.active_grids:
+        return None
+    return functools.partial(
+        restrict_next_octree_grid,
+        rois=grid.octree_rois,
+        levels_outside_rois=grid.octree_levels_outside_rois,
+        input_transform=gempy_model.input_transform
+    )
+
+
+def _uses_octree_loop(engine_config: GemPyEngineConfig) -> bool:
+    """Whether the octree levels are computed by `compute_model_progressively` instead of the engine `compute_model`."""
+    return _is_progressive(engine_config) or engine_config.parallel_groups or engine_config.profiling or in_cancellation_scope()
+
+
+def _interpolate_fields_function(engine_config: GemPyEngineConfig) -> Optional[Callable]:
+    if engine_config.parallel_groups:
+        return functools.partial(interpolate_all_fields_in_parallel, max_workers=engine_config.parallel_max_workers)
+    if engine_config.profiling:
+        return interpolate_all_fields_by_group
+    return None
+
+
+def _check_batch_shape(array: np.ndarray, n_realizations: int, n_items: int, name: str):
+    if array.shape != (n_realizations, n_items, 3):
+        raise ValueError(f'{name} must have shape {(n_realizations, n_items, 3)}. Received {array.shape}')
+
+
+def _transform_realization_points(geo_model: GeoModel, xyz: np.ndarray) -> np.ndarray:
+    # * Same order as `GeoModel.surface_points_copy_transformed`: first the grid transform and then the input one
+    points = geo_model.grid.transform.apply_with_cached_pivot(xyz.reshape(-1, 3))
+    return geo_model.input_transform.apply(points).reshape(xyz.shape)
+
+
 def _legacy_compute_model(gempy_model: GeoModel) -> 'gempy_legacy.Project':
     gpl = require_gempy_legacy()
     legacy_model: gpl.Project = gempy3_to_gempy2(gempy_model)
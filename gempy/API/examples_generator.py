@@ -1,9 +1,11 @@
 ﻿import os
+from typing import Optional
 
 import numpy as np
 
 import gempy as gp
 from gempy_engine.core.data.stack_relation_type import StackRelationType
+from gempy.core.color_generator import ColorsGenerator
 from gempy.core.data.enumerators import ExampleModel
 
 
@@ -29,6 +31,162 @@ def generate_example_model(example_model: ExampleModel, compute_model: bool = Tr
             raise NotImplementedError(f"Example model {example_model} not implemented.")
 
 
+def generate_synthetic_model(
+        n_surfaces: int = 3,
+        n_faults: int = 1,
+        n_surface_points: int = 100,
+        n_orientations: int = 10,
+        clustering: float = 0.,
+        n_clusters: int = 5,
+        extent: Optional[list] = None,
+        refinement: int = 4,
+        seed: Optional[int] = None,
+        compute_model: bool = False
+) -> gp.data.GeoModel:
+    """
+    Generates a parametric geological model of arbitrary size, e.g. to measure how the computation scales with the
+    number of input points.
+
+    The model has one stratigraphic group of gently folded layers, cut by steep planar faults that displace the layers.
+    Each fault is a group of its own. Surface points and orientations are split as evenly as possible between the
+    elements and lie exactly on the generated geometry. The same arguments and seed always give the same model.
+
+    Args:
+        n_surfaces (int): Number of stratigraphic surfaces. Defaults to 3.
+        n_faults (int): Number of faults. Defaults to 1.
+        n_surface_points (int): Total number of surface points. At least two per surface and fault. Defaults to 100.
+        n_orientations (int): Total number of orientations. At least one per group. Defaults to 10.
+        clustering (float): Fraction, between 0 and 1, of the points sampled around a few cluster centers instead of
+            uniformly, mimicking data concentrated around boreholes or outcrops. Defaults to 0.
+        n_clusters (int): Number of cluster centers per element. Defaults to 5.
+        extent (list, optional): Extent of the model. Defaults to [0, 1000, 0, 1000, 0, 1000].
+        refinement (int): Number of octree levels. Defaults to 4.
+        seed (int, optional): Seed of the random generator. Defaults to None.
+        compute_model (bool): If True, computes the model before returning it. Defaults to False.
+
+    Returns:
+        gp.data.GeoModel: The generated model.
+
+    Raises:
+        ValueError: If there are not enough surface points or orientations for the requested elements or the
+            clustering is not between 0 and 1.
+    """
+    n_elements = n_surfaces + n_faults
+    if n_surfaces < 1 or n_faults < 0:
+        raise ValueError("The model needs at least one surface and a non-negative number of faults.")
+    if n_surface_points < 2 * n_elements:
+        raise ValueError(f"At least {2 * n_elements} surface points are needed for {n_surfaces} surfaces and {n_faults} faults.")
+    if n_orientations < n_faults + 1:
+        raise ValueError(f"At least {n_faults + 1} orientations are needed, one per structural group.")
+    if not 0 <= clustering <= 1:
+        raise ValueError("clustering must be between 0 and 1.")
+
+    rng = np.random.default_rng(seed)
+    extent = np.array([0, 1000, 0, 1000, 0, 1000] if extent is None else extent, dtype=float)
+    size = extent[1::2] - extent[::2]
+
+    # * Faults are the first elements so they get the spare points and orientations
+    points_per_element = [len(split) for split in np.array_split(np.arange(n_surface_points), n_elements)]
+    orientations_per_element = [len(split) for split in np.array_split(np.arange(n_orientations), n_elements)]
+    if n_faults > 0 and sum(orientations_per_element[n_faults:]) == 0:
+        orientations_per_element[n_faults - 1] -= 1
+        orientations_per_element[n_faults] += 1
+
+    # region Geometry
+    # * Steep faults: x = x_0 + a (y - y_c) + b (z - z_c), spread along the x axis
+    faults = [{
+            "x_0"  : extent[0] + size[0] * (i + 1) / (n_faults + 1),
+            "a"    : rng.uniform(-.3, .3),
+            "b"    : rng.choice([-1, 1]) / np.tan(np.radians(rng.uniform(60, 85))),
+            "throw": rng.choice([-1, 1]) * rng.uniform(.05, .1) * size[2]
+    } for i in range(n_faults)]
+    center = extent[::2] + size / 2
+
+    def fault_x(fault, y, z):
+        return fault["x_0"] + fault["a"] * (y - center[1]) + fault["b"] * (z - center[2])
+
+    # * Folded layers: z = z_i + A sin(k_x x + phi_x) cos(k_y y + phi_y), stacked in the central part of the extent
+    amplitude = .05 * size[2]
+    k = 2 * np.pi * rng.uniform(.5, 1.5, size=2) / size[:2]
+    phase = rng.uniform(0, 2 * np.pi, size=2)
+    levels = extent[4] + size[2] * np.linspace(.7, .3, n_surfaces)  # * From top to bottom
+
+    def layer_z(level, x, y):
+        z = level + amplitude * np.sin(k[0] * x + phase[0]) * np.cos(k[1] * y + phase[1])
+        for fault in faults:
+            z += np.where(x > fault_x(fault, y, z), fault["throw"], 0)
+        return z
+
+    def layer_normal(x, y):
+        dz_dx = amplitude * k[0] * np.cos(k[0] * x + phase[0]) * np.cos(k[1] * y + phase[1])
+        dz_dy = -amplitude * k[1] * np.sin(k[0] * x + phase[0]) * np.sin(k[1] * y + phase[1])
+        return np.stack([-dz_dx, -dz_dy, np.ones_like(x)], axis=1)
+
+    def sample(n: int, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        n_clustered = int(round(clustering * n))
+        uniform = rng.uniform(low, high, size=(n - n_clustered, 2))
+        centers = rng.uniform(low, high, size=(n_clusters, 2))
+        clustered = centers[rng.integers(n_clusters, size=n_clustered)] + rng.normal(scale=.05 * (high - low), size=(n_clustered, 2))
+        return np.clip(np.concatenate([uniform, clustered]), low, high)
+
+    # endregion
+
+    color_gen = ColorsGenerator()
+    structural_groups = []
+    for i, fault in enumerate(faults):
+        y, z = sample(points_per_element[i] + orientations_per_element[i], extent[2:6:2], extent[3:6:2]).T
+        x = fault_x(fault, y, z)
+        n_points = points_per_element[i]
+        gradient = np.array([1, -fault["a"], -fault["b"]]) / np.linalg.norm([1, -fault["a"], -fault["b"]])
+        element = _synthetic_element(f"fault{i + 1}", next(color_gen), x, y, z, n_points, np.tile(gradient, (len(x) - n_points, 1)))
+        structural_groups.append(gp.data.StructuralGroup(
+            name=f"Fault{i + 1}",
+            elements=[element],
+            structural_relation=StackRelationType.FAULT,
+            fault_relations=gp.data.FaultsRelationSpecialCase.OFFSET_FORMATIONS
+        ))
+
+    elements = []
+    for i, level in enumerate(levels):
+        n_points, n_element_orientations = points_per_element[n_faults + i], orientations_per_element[n_faults + i]
+        x, y = sample(n_points + n_element_orientations, extent[:4:2], extent[1:4:2]).T
+        z = np.clip(layer_z(level, x, y), extent[4], extent[5])
+        gradient = layer_normal(x[n_points:], y[n_points:])
+        elements.append(_synthetic_element(f"surface{i + 1}", next(color_gen), x, y, z, n_points, gradient / np.linalg.norm(gradient, axis=1, keepdims=True)))
+    structural_groups.append(gp.data.StructuralGroup(
+        name="Strat_Series",
+        elements=elements,
+        structural_relation=StackRelationType.ERODE
+    ))
+
+    geo_model: gp.data.GeoModel = gp.create_geomodel(
+        project_name=f"synthetic_{n_surfaces}_surfaces_{n_faults}_faults_{n_surface_points}_points",
+        extent=extent.tolist(),
+        refinement=refinement,
+        structural_frame=gp.data.StructuralFrame(structural_groups=structural_groups, color_gen=color_gen)
+    )
+
+    if compute_model:
+        gp.compute_model(geo_model)
+
+    return geo_model
+
+
+def _synthetic_element(name: str, color: str, x: np.ndarray, y: np.ndarray, z: np.ndarray, n_points: int,
+                       gradient: np.ndarray) -> gp.data.StructuralElement:
+    """The first `n_points` coordinates become surface points and the rest orientations."""
+    return gp.data.StructuralElement(
+        name=name,
+        color=color,
+        surface_points=gp.data.SurfacePointsTable.from_arrays(x=x[:n_points], y=y[:n_points], z=z[:n_points], names=name),
+        orientations=gp.data.OrientationsTable.from_arrays(
+            x=x[n_points:], y=y[n_points:], z=z[n_points:],
+            G_x=gradient[:, 0], G_y=gradient[:, 1], G_z=gradient[:, 2],
+            names=name
+        )
+    )
+
+
 def _generate_2_5d_model(compute_model: bool) -> gp.data.GeoModel:
     geo_model: gp.data.GeoModel = gp.create_geomodel(
         project_name='Model1',
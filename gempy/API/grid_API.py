@@ -1,4 +1,5 @@
-﻿from typing import Union, Sequence
+﻿import os
+from typing import Union, Sequence
 
 import numpy as np
 
@@ -6,6 +7,7 @@ from ..core.data import Grid
 from ..core.data.grid_modules import CustomGrid, Sections
 from ..core.data.grid_modules.topography import Topography
 from ..modules.grids.create_topography import create_random_topography
+from ..modules.grids.dem_reader import is_georeferenced_dem, read_dem_window
 from ..optional_dependencies import require_subsurface
 
 
@@ -77,6 +79,24 @@ def set_topography_from_arrays(grid: Grid,  xyz_vertices: np.ndarray):
 
 
 def set_topography_from_file(grid: Grid, filepath: str, crop_to_extent: Union[Sequence, None] = None):
+    """
+    Sets the topography of the grid from a raster file.
+
+    ESRI ASCII grids and raw binary rasters with an ESRI `.hdr` header (see `set_topography_from_dem`) are read
+    directly, only within `crop_to_extent` if given. Other formats are read with subsurface.
+
+    Args:
+        grid (Grid): The grid object on which to set the topography.
+        filepath (str): Path of the raster.
+        crop_to_extent (Union[Sequence, None], optional): [x_min, x_max, y_min, y_max] to crop the raster to.
+
+    Returns:
+        Topography: The topography object that was set on the grid.
+    """
+    if is_georeferenced_dem(filepath):
+        # * Like subsurface, the whole raster is read unless it is cropped
+        return set_topography_from_dem(grid, filepath, extent=[-np.inf, np.inf, -np.inf, np.inf] if crop_to_extent is None else crop_to_extent)
+
     ss = require_subsurface()
     struct: ss.StructuredData = ss.modules.reader.read_structured_topography(
         path=filepath,
@@ -85,7 +105,61 @@ def set_topography_from_file(grid: Grid, filepath: str, crop_to_extent: Union[Se
     return set_topography_from_subsurface_structured_grid(grid, struct)
 
 
-def set_custom_grid(grid: Grid, xyz_coord: np.ndarray):
+def set_topography_from_dem(grid: Grid, filepath: Union[str, os.PathLike], resolution: Union[Sequence[int], None] = None,
+                            extent: Union[Sequence[float], None] = None, raster_extent: Union[Sequence[float], None] = None,
+                            nodata: Union[float, None] = None):
+    """
+    Sets the topography of the grid from the window of a large DEM that covers the model.
+
+    The raster is memory-mapped (or scanned line by line for ESRI ASCII grids) and only the cells within the window
+    are read, averaged into blocks on the fly if a coarser `resolution` is requested. The full raster is never loaded.
+
+    Args:
+        grid (Grid): The grid object on which to set the topography.
+        filepath (Union[str, os.PathLike]): Path of an ESRI ASCII grid (`.asc`), a `.npy` array or a raw binary
+            raster (`.bil`, `.flt`, `.bin`, `.raw`) with an ESRI `.hdr` header next to it.
+        resolution (Union[Sequence[int], None], optional): Maximum number of cells of the topography along X and Y.
+            If None, the resolution of the raster is kept.
+        extent (Union[Sequence[float], None], optional): [x_min, x_max, y_min, y_max] of the window. Defaults to the
+            extent of the regular grid.
+        raster_extent (Union[Sequence[float], None], optional): [x_min, x_max, y_min, y_max] of the outer edges of
+            the raster. Required for `.npy` files, whose first row must be the northernmost one.
+        nodata (Union[float, None], optional): Value of the cells without data, if not given in the header.
+
+    Returns:
+        Topography: The topography object that was set on the grid.
+
+    Raises:
+        ValueError: If a cell of the window has no data. A coarser `resolution` averages the cells without data
+            away as long as every block has some data.
+    """
+    x, y, z = read_dem_window(
+        path=filepath,
+        extent=grid.regular_grid.extent if extent is None else extent,
+        resolution=resolution,
+        raster_extent=raster_extent,
+        nodata=nodata
+    )
+    if np.isnan(z).any():
+        raise ValueError(f"{np.isnan(z).sum()} cells of the topography read from {filepath} have no data. "
+                         f"Choose an extent within the data or a coarser resolution.")
+    grid.topography = Topography(regular_grid=grid.regular_grid).set_values_from_axes(x, y, z)
+    set_active_grid(grid, [Grid.GridTypes.TOPOGRAPHY])
+    return grid.topography
+
+
+def set_custom_grid(grid: Grid, xyz_coord: Union[np.ndarray, str, os.PathLike]):
+    """
+    Sets a grid of arbitrary coordinates and makes it the active grid.
+
+    Args:
+        grid (Grid): The grid object on which to set the custom grid.
+        xyz_coord (Union[np.ndarray, str, os.PathLike]): Coordinates with shape (n, 3), a `np.memmap` or the path of
+            a `.npy` file with them. Files are memory-mapped and never loaded at once.
+
+    Returns:
+        CustomGrid: The custom grid that was set on the grid.
+    """
     custom_grid = CustomGrid(xyx_coords=xyz_coord)
     grid.custom_grid = custom_grid
     
@@ -94,8 +168,22 @@ def set_custom_grid(grid: Grid, xyz_coord: np.ndarray):
 
 
 def set_centered_grid(grid: Grid, centers: np.ndarray, resolution: Sequence[float], radius: Union[float, Sequence[float]]):
-    from gempy_engine.core.data.centered_grid import CenteredGrid
-    centered_grid = CenteredGrid(
+    """
+    Sets a centered grid around a set of devices, e.g. gravity stations, and activates it.
+
+    All the devices share the same voxel stencil, which is cached by resolution and radius (see `GravityKernelCache`).
+
+    Args:
+        grid (Grid): Grid of the model.
+        centers (np.ndarray): XYZ coordinates of the devices, of shape (n, 3).
+        resolution (Sequence[float]): Resolution of the stencil in each axis.
+        radius (Union[float, Sequence[float]]): Radius of the stencil, in each axis or for all of them.
+
+    Returns:
+        CenteredGrid: The centered grid.
+    """
+    from ..modules.geophysics.gravity_kernel import CachedCenteredGrid
+    centered_grid = CachedCenteredGrid(
         centers=centers,
         resolution=resolution,
         radius=radius
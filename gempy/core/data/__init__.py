@@ -5,8 +5,12 @@ from .structural_element import StructuralElement
 from .orientations import OrientationsTable
 from .surface_points import SurfacePointsTable
 from .grid import Grid, Topography
+from .grid_modules import OctreeROI
 from .importer_helper import ImporterHelper
 from .gempy_engine_config import GemPyEngineConfig
+from .solution_cache import SolutionCache
+from .gravity_kernel_cache import GravityKernelCache
+from .compute_profile import ComputeProfile, ProfileStage
 from .structural_group import FaultsRelationSpecialCase
 from ..color_generator import ColorsGenerator
 
@@ -23,8 +27,8 @@ from gempy_engine.core.data.geophysics_input import GeophysicsInput
 __all__ = [
     # From gempy
     'GeoModel', 'StructuralFrame', 'StructuralGroup', 'StructuralElement', 'OrientationsTable', 'SurfacePointsTable',
-    'Grid', 'Topography',
-    'ImporterHelper', 'GemPyEngineConfig', 'FaultsRelationSpecialCase', 'ColorsGenerator',
+    'Grid', 'Topography', 'OctreeROI',
+    'ImporterHelper', 'GemPyEngineConfig', 'SolutionCache', 'GravityKernelCache', 'ComputeProfile', 'ProfileStage', 'FaultsRelationSpecialCase', 'ColorsGenerator',
     # From gempy engine
     'StackRelationType', 'InterpolationOptions', 'Solutions', 'RawArraysSolution', 'GlobalAnisotropy', 'Transform',
     'FaultsData', 'FiniteFaultData', 'AvailableBackends', 'GeophysicsInput'
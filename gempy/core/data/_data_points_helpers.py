@@ -1,11 +1,13 @@
-﻿from typing import Sequence
+﻿import hashlib
+from typing import Sequence
 
 import numpy as np
 
 
 def structural_element_hasher(i: int, name: str, hash_length: int = 8) -> int:
     # Get the last 'hash_length' digits from the hash
-    name_hash = abs(hash(name)) % (10 ** hash_length)
+    # * Python's hash() is salted per process, so we use a digest to get the same ids across processes
+    name_hash = int(hashlib.blake2b(name.encode(), digest_size=8).hexdigest(), 16) % (10 ** hash_length)
 
     return i * (10 ** hash_length) + name_hash
 
@@ -0,0 +1,79 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class ProfileStage:
+    """
+    Timing and memory of one stage of a computation.
+
+    Attributes:
+        name (str): Name of the stage, e.g. `input building` or `engine`.
+        start (float): Start time in seconds relative to the start of the profile.
+        duration (float): Wall time of the stage in seconds.
+        peak_memory (Optional[int]): Peak of the memory allocated during the stage in bytes, relative to the memory in
+            use when the stage started. None if memory was not traced.
+        depth (int): Nesting level of the stage. Top level stages have depth 0.
+        args (dict): Extra information about the stage, e.g. the octree `level` and structural `group` it belongs to
+            or the epoch of an optimization.
+    """
+
+    name: str
+    start: float
+    duration: float
+    peak_memory: Optional[int]
+    depth: int
+    args: dict = field(default_factory=dict)
+
+
+@dataclass
+class ComputeProfile:
+    """
+    Per-stage report of a profiled `compute_model` or `optimize_and_compute`.
+
+    Attributes:
+        stages (list[ProfileStage]): Stages in the order they started.
+    """
+
+    stages: list[ProfileStage] = field(default_factory=list)
+
+    def __repr__(self):
+        lines = [f"{'Stage':<50}{'Time [s]':>12}{'Peak memory [MB]':>20}"]
+        for stage in self.stages:
+            peak_memory = f"{stage.peak_memory / 1024 ** 2:.2f}" if stage.peak_memory is not None else "-"
+            lines.append(f"{'  ' * stage.depth + stage.name:<50}{stage.duration:>12.4f}{peak_memory:>20}")
+        return "\n".join(lines)
+
+    @property
+    def total_time(self) -> float:
+        """Returns the wall time of all the top level stages in seconds."""
+        return sum(stage.duration for stage in self.stages if stage.depth == 0)
+
+    def get_stages(self, name: str) -> list[ProfileStage]:
+        """Returns all the stages with the given name."""
+        return [stage for stage in self.stages if stage.name == name]
+
+    def to_chrome_trace(self) -> dict:
+        """Returns the report in the Chrome trace event format (see chrome://tracing or https://ui.perfetto.dev)."""
+        trace_events = []
+        for stage in self.stages:
+            args = dict(stage.args)
+            if stage.peak_memory is not None:
+                args["peak_memory_bytes"] = stage.peak_memory
+            trace_events.append({
+                    "name": stage.name,
+                    "ph"  : "X",  # * Complete event
+                    "ts"  : stage.start * 1e6,
+                    "dur" : stage.duration * 1e6,
+                    "pid" : os.getpid(),
+                    "tid" : 0,
+                    "args": args
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def dump_chrome_trace(self, path: str) -> None:
+        """Writes the report as a Chrome trace JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
@@ -1,4 +1,7 @@
-﻿import numpy as np
+﻿import enum
+import hashlib
+
+import numpy as np
 
 from gempy.optional_dependencies import require_scipy
 
@@ -32,11 +35,60 @@ def interpolate_zvals_at_xy(xy, topography, method='DEP'):
         np.ndarray: z values, i.e., topography along the profile.
     """
     scipy = require_scipy()
-    xj = topography.values_2d[:, 0, 0]
-    yj = topography.values_2d[0, :, 1]
-    zj = topography.values_2d[:, :, 2]
+    xj = topography.x
+    yj = topography.y
+    zj = topography.z
 
     spline = scipy.interpolate.RectBivariateSpline(xj, yj, zj)
     zi = spline.ev(xy[:, 0], xy[:, 1])
     
     return zi
+
+
+def fingerprint(*items) -> str:
+    """
+    Compute a process-stable digest of arrays and plain python values.
+
+    It is used to detect changes in the input data without keeping copies of it around. Arrays are hashed by
+    dtype, shape and content; lists, tuples, dicts and dataclass-like objects are hashed recursively.
+
+    Args:
+        *items: Arrays, numbers, strings, enums, containers or objects to include in the digest.
+
+    Returns:
+        str: Hexadecimal digest of the items.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for item in items:
+        _update_fingerprint(digest, item)
+    return digest.hexdigest()
+
+
+def _update_fingerprint(digest: "hashlib.blake2b", item) -> None:
+    match item:
+        case np.ndarray() if item.dtype.hasobject:
+            digest.update(f"ndarray{item.shape}".encode())
+            _update_fingerprint(digest, item.tolist())
+        case np.ndarray():
+            digest.update(f"ndarray{item.dtype.descr}{item.shape}".encode())
+            digest.update(np.ascontiguousarray(item).reshape(-1).view(np.uint8).data)
+        case np.generic():
+            digest.update(repr(item.item()).encode())
+        case enum.Enum():
+            digest.update(f"{type(item).__name__}.{item.name}".encode())
+        case list() | tuple():
+            digest.update(f"{type(item).__name__}{len(item)}".encode())
+            for sub_item in item:
+                _update_fingerprint(digest, sub_item)
+        case dict():
+            digest.update(f"dict{len(item)}".encode())
+            for key in sorted(item, key=repr):
+                _update_fingerprint(digest, key)
+                _update_fingerprint(digest, item[key])
+        case None | bool() | int() | float() | str():
+            digest.update(repr(item).encode())
+        case _ if hasattr(item, "__dict__"):
+            digest.update(type(item).__name__.encode())
+            _update_fingerprint(digest, vars(item))
+        case _:
+            digest.update(repr(item).encode())
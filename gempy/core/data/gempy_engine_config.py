@@ -1,13 +1,27 @@
 ﻿from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Callable
 
 from gempy_engine import config
 from gempy_engine.config import AvailableBackends
 
+from .solution_cache import SolutionCache
+
 
 @dataclass
 class GemPyEngineConfig:
     backend: AvailableBackends = config.DEFAULT_BACKEND # ? This can be grabbed from gempy.config file?
     use_gpu: bool = False
     dtype: Optional[str] = None  #: The data type used in the engine. If None, the default data type of the backend is used.
-    
\ No newline at end of file
+    
+    solution_cache: Optional[SolutionCache] = None  #: If given, `compute_model` reuses the solutions of identical models stored in it.
+
+    profiling: bool = False  #: If True, `compute_model` and `optimize_and_compute` attach a per-stage `ComputeProfile` to the solutions as `solutions.profile`. `compute_model` then runs the octree levels in GemPy, so every level, structural group and the meshing are profiled.
+    profile_memory: bool = True  #: If True, the profile also traces the peak memory of each stage. This slows the computation down noticeably.
+    profiling_trace_path: Optional[str] = None  #: If given, the profile is also written to this path as a Chrome trace JSON.
+
+    parallel_groups: bool = False  #: If True, independent structural groups are solved and evaluated concurrently in a process pool. The octree levels are then evaluated by GemPy and the meshes are extracted sequentially. Only for the numpy backend.
+    parallel_max_workers: Optional[int] = None  #: Number of worker processes used by `parallel_groups`. If None, the number of CPUs is used.
+
+    octree_time_budget: Optional[float] = None  #: If given, `compute_model` stops refining the octree before the next level would exceed this wall time in seconds.
+    octree_memory_budget: Optional[float] = None  #: If given, `compute_model` stops refining the octree before the next level would exceed this resident memory of the process in MB. Linux only.
+    on_octree_level: Optional[Callable] = None  #: If given, `compute_model` calls it with a `Solutions` snapshot after every octree level but the last one.
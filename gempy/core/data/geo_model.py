@@ -66,6 +66,8 @@ class GeoModel:
     interpolation_grid: EngineGrid = None  #: Optional grid used for interpolation. Can be seen as a cache field.
     _interpolationInput: InterpolationInput = None  #: Input data for interpolation. Fed by the structural frame and can be seen as a cache field.
     _input_data_descriptor: InputDataDescriptor = None  #: Descriptor of the input data. Fed by the structural frame and can be seen as a cache field.
+    _interpolation_input_pieces: dict = None  #: Engine inputs built by the last computation, reused while their data does not change. Cache field.
+    _gravity_operator_cache: tuple = field(default=None, repr=False)  #: Gravity of every unit at every device for the last solutions. Cache field.
 
     # endregion
     _solutions: Solutions = field(init=False, default=None)  #: The computed solutions of the geological model. 
@@ -225,9 +227,7 @@ class GeoModel:
 
     @property
     def regular_grid_coordinates_transformed(self) -> np.ndarray:
-        values_transformed = self.grid.regular_grid.get_values_vtk_format(orthogonal=True)
-        values_transformed = self.input_transform.apply(values_transformed)
-        return values_transformed
+        return self.input_transform.apply(self.grid.regular_grid.get_values_vtk_format(orthogonal=True))
 
     @property
     def orientations(self) -> OrientationsTable:
@@ -266,7 +266,6 @@ class GeoModel:
 
     @property
     def input_data_descriptor(self) -> InputDataDescriptor:
-        # TODO: This should have the exact same dirty logic as interpolation_input
         return self.structural_frame.input_data_descriptor
 
     def add_surface_points(self, X: Sequence[float], Y: Sequence[float], Z: Sequence[float],
@@ -0,0 +1,91 @@
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+class GravityKernelCache:
+    """
+    Cache of the arrays that only depend on the resolution and radius of a centered grid.
+
+    The voxel stencil of a `CenteredGrid` and its gravity kernel (`tz`) are the same for every device, so they are
+    computed once per resolution, radius and dtype and shared by all the devices and all the computations. Arrays
+    are kept in memory with least-recently-used eviction and, optionally, saved as `.npy` files into a directory so
+    other processes and sessions can reuse them. Cached arrays are read-only.
+
+    Attributes:
+        max_entries (int): Maximum number of arrays kept in memory.
+        cache_dir (Optional[str]): Directory of the disk cache. If None, arrays are only kept in memory.
+    """
+
+    def __init__(self, max_entries: int = 32, cache_dir: Optional[str] = None):
+        if max_entries < 0:
+            raise ValueError(f'max_entries must be non-negative. Received {max_entries}')
+
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def __contains__(self, key: str):
+        return key in self._memory or (self.cache_dir is not None and os.path.exists(self._path(key)))
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Returns the array stored under `key` or None. Disk hits are promoted to the memory cache."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if self.cache_dir is None:
+            return None
+
+        try:
+            array = np.load(self._path(key))
+        except (FileNotFoundError, EOFError, ValueError):
+            return None
+
+        array.flags.writeable = False
+        self._put_in_memory(key, array)
+        return array
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        """Stores `array` under `key` in memory and, if a directory was given, on disk. Returns the cached array."""
+        array = np.array(array)
+        array.flags.writeable = False
+        self._put_in_memory(key, array)
+
+        if self.cache_dir is not None:
+            # * Write to a temporary file first so other processes never read half written arrays
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, self._path(key))
+        return array
+
+    def clear(self, disk: bool = False) -> None:
+        """Removes all the arrays from memory and, if `disk` is True, from the disk cache."""
+        self._memory.clear()
+        if disk and self.cache_dir is not None:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.npy'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def _put_in_memory(self, key: str, array: np.ndarray):
+        self._memory[key] = array
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.npy')
+
+
+#: Cache used when no other is given to `calculate_gravity_gradient` and by the centered grids created by GemPy.
+default_gravity_kernel_cache = GravityKernelCache()
@@ -3,12 +3,13 @@ import warnings
 import dataclasses
 import enum
 import numpy as np
-from typing import Optional
+from typing import Optional, Union, Sequence
 
 from gempy_engine.core.data.centered_grid import CenteredGrid
 from gempy_engine.core.data.options import EvaluationOptions
 from gempy_engine.core.data.transforms import Transform
-from .grid_modules import RegularGrid, CustomGrid, Sections
+from .core_utils import fingerprint
+from .grid_modules import RegularGrid, CustomGrid, Sections, OctreeROI
 from .grid_modules.topography import Topography
 
 
@@ -25,9 +26,6 @@ class Grid:
 
     # ? What should we do with the extent?
 
-    values: np.ndarray
-    length: np.ndarray
-    
     _octree_grid: Optional[RegularGrid] = None
     _dense_grid: Optional[RegularGrid] = None
     _custom_grid: Optional[CustomGrid] = None
@@ -39,12 +37,14 @@ class Grid:
     _transform: Optional[Transform] = None
 
     _octree_levels: int = -1
+    _octree_rois: tuple[OctreeROI, ...] = ()
+    _octree_levels_outside_rois: Optional[int] = None
+
+    _values_cache: Optional[tuple[tuple, np.ndarray]] = dataclasses.field(default=None, repr=False)  #: Combined values with the sub-grids and versions they were built from
 
     def __init__(self, extent=None, resolution=None):
-        
-        self.values = np.empty((0, 3))
-        self.length = np.empty(0)
-        
+        self._values_cache = None
+
         # Init basic grid empty
         if extent is not None and resolution is not None:
             self.dense_grid = RegularGrid(extent, resolution)
@@ -58,7 +58,6 @@ class Grid:
             resolution=np.array([2 ** octree_levels] * 3),
         )
         grid.active_grids |= grid.GridTypes.OCTREE
-        grid._update_values()
         return grid
 
     @classmethod
@@ -124,7 +123,68 @@ class Grid:
     @active_grids.setter
     def active_grids(self, value):
         self._active_grids = value
-        self._update_values()
+        self._check_active_grids()
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Returns the coordinates of all the active grids, one after another in the order of `GridTypes`.
+
+        The combined array is only built when it is accessed and reused while the active grids and the versions of
+        their values do not change. In place edits of the arrays of a sub-grid are not detected. The engine input is
+        built from the sub-grids directly, so computing a model never needs it. Use `grid_slices` or `get_grid_args`
+        to locate one grid without building it.
+        """
+        self._check_active_grids()
+        sub_grids = [sub_grid for grid_type, sub_grid in self._sub_grids().items() if grid_type in self.active_grids]
+        # * The key holds the sub-grids themselves, so they are compared by identity and cannot be replaced by a new object with the same id
+        cache_key = (self.active_grids, tuple(sub_grids), tuple(_values_version(sub_grid) for sub_grid in sub_grids))
+        if self._values_cache is None or not _same_values_key(self._values_cache[0], cache_key):
+            sub_grids_values = [sub_grid.values for sub_grid in sub_grids]
+            if len(sub_grids_values) == 1:
+                combined_values = sub_grids_values[0]  # * No copy, e.g. of a memory-mapped custom grid
+            else:
+                combined_values = np.concatenate(sub_grids_values) if sub_grids_values else np.empty((0, 3))
+            self._values_cache = (cache_key, combined_values)
+        return self._values_cache[1]
+
+    @property
+    def grid_slices(self) -> dict["Grid.GridTypes", slice]:
+        """Returns the slice of `values` that belongs to each active grid."""
+        slices = {}
+        start = 0
+        for grid_type, values in self._active_grids_values():
+            slices[grid_type] = slice(start, start + values.shape[0])
+            start += values.shape[0]
+        return slices
+
+    @property
+    def length(self) -> np.ndarray:
+        """Returns the offsets of every grid in `values` in the order of `GridTypes`. Inactive grids have length 0."""
+        lengths = dict((grid_type, values.shape[0]) for grid_type, values in self._active_grids_values())
+        return np.concatenate([[0], np.cumsum([lengths.get(grid_type, 0) for grid_type in self._grid_types_order])])
+
+    def get_grid_args(self, grid_type: "Union[str, Grid.GridTypes]") -> tuple[int, int]:
+        """
+        Returns the start and stop of one grid in `values`.
+
+        Args:
+            grid_type (Union[str, Grid.GridTypes]): The grid, either as `GridTypes` or by name, e.g. 'sections'.
+
+        Returns:
+            tuple[int, int]: Start and stop indices. Both are equal if the grid is not active.
+        """
+        if isinstance(grid_type, str):
+            names = {"octree": self.GridTypes.OCTREE, "dense": self.GridTypes.DENSE, "regular": self.GridTypes.DENSE,
+                     "custom": self.GridTypes.CUSTOM, "topography": self.GridTypes.TOPOGRAPHY,
+                     "sections": self.GridTypes.SECTIONS, "centered": self.GridTypes.CENTERED}
+            if grid_type not in names:
+                raise ValueError(f"Grid type {grid_type} not recognized. Use one of {list(names)}")
+            grid_type = names[grid_type]
+
+        index = self._grid_types_order.index(grid_type)
+        length = self.length
+        return int(length[index]), int(length[index + 1])
 
     @property
     def dense_grid(self) -> RegularGrid:
@@ -134,7 +194,6 @@ class Grid:
     def dense_grid(self, value):
         self._dense_grid = value
         self.active_grids |= self.GridTypes.DENSE
-        self._update_values()
 
     @property
     def octree_grid(self):
@@ -156,19 +215,42 @@ class Grid:
 
         self._octree_grid = regular_grid
         self.active_grids |= self.GridTypes.OCTREE
-        self._update_values()
     
-    def set_octree_grid_by_levels(self, octree_levels: int, evaluation_options: EvaluationOptions, extent: Optional[np.ndarray] = None):
+    def set_octree_grid_by_levels(self, octree_levels: int, evaluation_options: EvaluationOptions, extent: Optional[np.ndarray] = None,
+                                  rois: Optional[Sequence[OctreeROI]] = None):
+        """
+        Sets the octree grid from its number of levels.
+
+        Args:
+            octree_levels (int): Number of octree levels. With `rois`, the number of levels outside the regions of interest.
+            evaluation_options (EvaluationOptions): Options where the number of octree levels is written.
+            extent (Optional[np.ndarray]): Extent of the octree. Defaults to the extent of the grid.
+            rois (Optional[Sequence[OctreeROI]]): Regions of interest with their own number of levels. The octree is
+                refined beyond `octree_levels` only inside them. Defaults to None, which refines the whole extent.
+        """
         if extent is None:
             extent = self.extent
-        
+
+        rois = tuple(rois or ())
+        total_levels = max([octree_levels] + [roi.max_level for roi in rois])
         self._octree_grid = RegularGrid(
             extent=extent,
-            resolution=np.array([2 ** octree_levels] * 3),
+            resolution=np.array([2 ** total_levels] * 3),
         )
-        evaluation_options.number_octree_levels = octree_levels
+        self._octree_rois = rois
+        self._octree_levels_outside_rois = octree_levels if rois else None
+        evaluation_options.number_octree_levels = total_levels
         self.active_grids |= self.GridTypes.OCTREE
-        self._update_values()
+
+    @property
+    def octree_rois(self) -> tuple[OctreeROI, ...]:
+        """Regions of interest of the octree. Set them with `set_octree_grid_by_levels`."""
+        return self._octree_rois
+
+    @property
+    def octree_levels_outside_rois(self) -> Optional[int]:
+        """Number of octree levels outside the regions of interest. None if there are no regions of interest."""
+        return self._octree_levels_outside_rois
     
     @property
     def octree_levels(self):
@@ -186,7 +268,6 @@ class Grid:
     def custom_grid(self, value):
         self._custom_grid = value
         self.active_grids |= self.GridTypes.CUSTOM
-        self._update_values()
 
     @property
     def topography(self):
@@ -196,7 +277,6 @@ class Grid:
     def topography(self, value):
         self._topography = value
         self.active_grids |= self.GridTypes.TOPOGRAPHY
-        self._update_values()
 
     @property
     def sections(self):
@@ -206,7 +286,6 @@ class Grid:
     def sections(self, value):
         self._sections = value
         self.active_grids |= self.GridTypes.SECTIONS
-        self._update_values()
 
     @property
     def centered_grid(self):
@@ -216,7 +295,6 @@ class Grid:
     def centered_grid(self, value):
         self._centered_grid = value
         self.active_grids |= self.GridTypes.CENTERED
-        self._update_values()
 
     @property
     def regular_grid(self):
@@ -232,32 +310,51 @@ class Grid:
         else:
             return None
 
-    # noinspection t
-    def _update_values(self):
-        values = []
-
-        if self.GridTypes.OCTREE in self.active_grids:
-            if self.octree_grid is None: raise AttributeError('Octree grid is active but not defined')
-            values.append(self.octree_grid.values)
-        if self.GridTypes.DENSE in self.active_grids:
-            if self.dense_grid is None: raise AttributeError('Dense grid is active but not defined')
-            values.append(self.dense_grid.values)
-        if self.GridTypes.CUSTOM in self.active_grids:
-            if self.custom_grid is None: raise AttributeError('Custom grid is active but not defined')
-            values.append(self.custom_grid.values)
-        if self.GridTypes.TOPOGRAPHY in self.active_grids:
-            if self.topography is None: raise AttributeError('Topography grid is active but not defined')
-            values.append(self.topography.values)
-        if self.GridTypes.SECTIONS in self.active_grids:
-            if self.sections is None: raise AttributeError('Sections grid is active but not defined')
-            values.append(self.sections.values)
-        if self.GridTypes.CENTERED in self.active_grids:
-            if self.centered_grid is None: raise AttributeError('Centered grid is active but not defined')
-            values.append(self.centered_grid.values)
-
-        self.values = np.concatenate(values)
-
-        return self.values
+    @property
+    def fingerprint(self) -> str:
+        """Returns a digest of the active grids. It changes with any edit of their definition or their values."""
+        has_regular_grid = self.dense_grid is not None or self.octree_grid is not None
+        dense_active = self.GridTypes.DENSE in self.active_grids and self.dense_grid is not None
+        custom_active = self.GridTypes.CUSTOM in self.active_grids and self.custom_grid is not None
+        topography_active = self.GridTypes.TOPOGRAPHY in self.active_grids and self.topography is not None
+        sections_active = self.GridTypes.SECTIONS in self.active_grids and self.sections is not None
+        centered_active = self.GridTypes.CENTERED in self.active_grids and self.centered_grid is not None
+
+        return fingerprint(
+            self.active_grids,
+            self.extent if has_regular_grid else None,
+            (self.octree_rois, self.octree_levels_outside_rois) if self.octree_rois else None,
+            self.transform,
+            self.dense_grid.resolution if dense_active else None,
+            self.custom_grid.values if custom_active else None,
+            (self.topography.x, self.topography.y, self.topography.z) if topography_active else None,
+            self.sections.values if sections_active else None,
+            (self.centered_grid.centers, self.centered_grid.resolution, self.centered_grid.radius) if centered_active else None
+        )
+
+    @property
+    def _grid_types_order(self) -> list["Grid.GridTypes"]:
+        return [self.GridTypes.OCTREE, self.GridTypes.DENSE, self.GridTypes.CUSTOM, self.GridTypes.TOPOGRAPHY,
+                self.GridTypes.SECTIONS, self.GridTypes.CENTERED]
+
+    def _sub_grids(self) -> dict["Grid.GridTypes", object]:
+        return {
+                self.GridTypes.OCTREE    : self.octree_grid,
+                self.GridTypes.DENSE     : self.dense_grid,
+                self.GridTypes.CUSTOM    : self.custom_grid,
+                self.GridTypes.TOPOGRAPHY: self.topography,
+                self.GridTypes.SECTIONS  : self.sections,
+                self.GridTypes.CENTERED  : self.centered_grid
+        }
+
+    def _check_active_grids(self):
+        for grid_type, sub_grid in self._sub_grids().items():
+            if grid_type in self.active_grids and sub_grid is None:
+                raise AttributeError(f'{grid_type.name.capitalize()} grid is active but not defined')
+
+    def _active_grids_values(self) -> list[tuple["Grid.GridTypes", np.ndarray]]:
+        self._check_active_grids()
+        return [(grid_type, sub_grid.values) for grid_type, sub_grid in self._sub_grids().items() if grid_type in self.active_grids]
 
     def get_section_args(self, section_name: str):
         # TODO: This method should be part of the sections
@@ -265,3 +362,16 @@ class Grid:
         l0, l1 = self.get_grid_args('sections')
         where = np.where(self.sections.names == section_name)[0][0]
         return l0 + self.sections.length[where], l0 + self.sections.length[where + 1]
+
+
+def _same_values_key(a: tuple, b: tuple) -> bool:
+    return a[0] == b[0] and len(a[1]) == len(b[1]) and all(x is y for x, y in zip(a[1], b[1])) and a[2] == b[2]
+
+
+def _values_version(sub_grid) -> Union[int, str]:
+    """Returns a value that changes whenever the values of `sub_grid` change, without building them."""
+    version = getattr(sub_grid, "_version", None)
+    if version is not None:
+        return version
+    # * Centered grids belong to the engine, but they are small enough to fingerprint
+    return fingerprint(sub_grid.centers, sub_grid.resolution, sub_grid.radius)
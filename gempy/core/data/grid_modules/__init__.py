@@ -1,2 +1,3 @@
-from .grid_types import Sections, RegularGrid, CustomGrid
+from .grid_types import Sections, RegularGrid, CustomGrid, GridTile
 from .topography import Topography
+from .octree_roi import OctreeROI
@@ -1,10 +1,13 @@
 import dataclasses
+import itertools
+import os
 
-from typing import Optional, Sequence
+from typing import Optional, Sequence, Union, Iterator
 
 import numpy as np
 
-from ..core_utils import calculate_line_coordinates_2points
+from ..core_utils import calculate_line_coordinates_2points, fingerprint
+from ..precision import coordinates_dtype
 from .... import optional_dependencies
 from ....optional_dependencies import require_pandas
 from gempy_engine.core.data.transforms import Transform, TransformOpsOrder
@@ -15,35 +18,136 @@ class RegularGrid:
     """
     Class with the methods and properties to manage 3D regular grids where the model will be interpolated.
 
+    With `implicit=True` the grid is described only by its extent, resolution and transform. The coordinates are not
+    stored: `values` generates them on every access and `iter_values_blocks` generates them block by block, so very
+    large grids can be evaluated (e.g. with `gp.compute_model_at`) without ever holding all the coordinates in memory.
     """
     resolution: np.ndarray
     extent: np.ndarray  #: this is the ORTHOGONAL extent. If the grid is rotated, the extent will be different
-    values: np.ndarray
     mask_topo: np.ndarray
     _transform: Transform  #: If a transform exists, it will be applied to the grid
+    implicit: bool = False  #: If True, the coordinates are generated on demand instead of stored
+    _values: Optional[np.ndarray] = dataclasses.field(default=None, repr=False)
+    _vtk_axes_cache: Optional[tuple] = dataclasses.field(default=None, repr=False)  #: Corner axes with the extent and resolution they were built for
+    _version: int = dataclasses.field(default=0, repr=False, compare=False)  #: Increased every time the values or the transform change
 
-    def __init__(self, extent: np.ndarray, resolution: np.ndarray, transform: Optional[Transform] = None):
+    def __init__(self, extent: np.ndarray, resolution: np.ndarray, transform: Optional[Transform] = None, implicit: bool = False):
         self.resolution = np.ones((0, 3), dtype='int64')
         self.extent = np.zeros(6, dtype='float64')
-        self.values = np.zeros((0, 3))
+        self.implicit = implicit
+        self._values = np.zeros((0, 3))
+        self._vtk_axes_cache = None
+        self._version = 0
         self.mask_topo = np.zeros((0, 3), dtype=bool)
 
         self.set_regular_grid(extent, resolution, transform)
 
-    def _create_regular_grid_3d(self):
-        coords = self.x_coord, self.y_coord, self.z_coord
+    def __len__(self):
+        return int(np.prod(self.resolution))
+
+    @property
+    def values(self) -> np.ndarray:
+        if self.implicit:
+            return self.get_values_block(0, len(self))
+        return self._values
 
-        g = np.meshgrid(*coords, indexing="ij")
-        values = np.vstack(tuple(map(np.ravel, g))).T.astype("float64")
+    @values.setter
+    def values(self, value: np.ndarray):
+        self._values = value
+        self._version += 1
 
-        # Transform the values
+    def get_values_block(self, start: int, stop: int) -> np.ndarray:
+        """
+        Generates the coordinates of the cells `start` to `stop`, in the same order as `values`.
+
+        Args:
+            start (int): Flat index of the first cell.
+            stop (int): Flat index after the last cell.
+
+        Returns:
+            np.ndarray: Coordinates with shape (stop - start, 3).
+        """
+        i, j, k = np.unravel_index(np.arange(start, stop), self.resolution)  # * Same order as meshgrid(indexing="ij").ravel()
+        values = np.stack([self.x_coord[i], self.y_coord[j], self.z_coord[k]], axis=1)
+        return self._apply_transform(values).astype(coordinates_dtype(self.extent), copy=False)
+
+    def iter_values_blocks(self, block_size: int):
+        """
+        Yields the coordinates of the grid in blocks of at most `block_size` cells.
+
+        Args:
+            block_size (int): Number of cells per block.
+
+        Yields:
+            tuple[slice, np.ndarray]: The slice of `values` covered by the block and its coordinates.
+        """
+        n_cells = len(self)
+        for start in range(0, n_cells, block_size):
+            stop = min(start + block_size, n_cells)
+            yield slice(start, stop), self.get_values_block(start, stop)
+
+    def get_values_tile(self, index_slices: tuple[slice, slice, slice]) -> np.ndarray:
+        """
+        Generates the coordinates of a box of cells, in the same order as `values` restricted to the box.
+
+        Args:
+            index_slices (tuple[slice, slice, slice]): Cells of the box along x, y and z.
+
+        Returns:
+            np.ndarray: Coordinates with shape (n_cells_in_box, 3).
+        """
+        x, y, z = self.x_coord[index_slices[0]], self.y_coord[index_slices[1]], self.z_coord[index_slices[2]]
+        xv, yv, zv = np.meshgrid(x, y, z, indexing="ij")
+        values = np.stack([xv.ravel(), yv.ravel(), zv.ravel()], axis=1)
+        return self._apply_transform(values).astype(coordinates_dtype(self.extent), copy=False)
+
+    def iter_tiles(self, tile_shape: Sequence[int], halo: int = 0) -> Iterator["GridTile"]:
+        """
+        Splits the grid into boxes of at most `tile_shape` cells.
+
+        Args:
+            tile_shape (Sequence[int]): Maximum number of cells of a tile along x, y and z.
+            halo (int): Number of cells added around every tile, clipped at the grid borders. Neighbouring tiles
+                overlap by the halo, so meshes extracted per tile close across the tile borders. Defaults to 0.
+
+        Yields:
+            GridTile: The tiles, x slowest and z fastest.
+        """
+        tile_shape = np.broadcast_to(np.asarray(tile_shape, dtype=int), (3,))
+        if np.any(tile_shape < 1) or halo < 0:
+            raise ValueError(f"tile_shape must be positive and halo non negative. Received {tile_shape} and {halo}.")
+
+        resolution = [int(n) for n in self.resolution]
+        tile_shape = [int(size) for size in tile_shape]
+        starts = [range(0, n, size) for n, size in zip(resolution, tile_shape)]
+        for i, j, k in itertools.product(*starts):
+            slices = tuple(slice(start, min(start + size, n)) for start, size, n in zip((i, j, k), tile_shape, resolution))
+            halo_slices = tuple(slice(max(s.start - halo, 0), min(s.stop + halo, n)) for s, n in zip(slices, resolution))
+            yield GridTile(slices=slices, halo_slices=halo_slices)
+
+    def _apply_transform(self, values: np.ndarray) -> np.ndarray:
         if self.transform is not None:
-            self.values = self.transform.apply_inverse_with_pivot(
+            return self.transform.apply_inverse_with_pivot(
                 points=values,
                 pivot=np.array([self.extent[0], self.extent[2], self.extent[4]])
             )
-        else:
-            self.values = values
+        return values
+
+    def _create_regular_grid_3d(self):
+        if self.implicit:
+            self.values = np.zeros((0, 3))
+            return
+
+        # * Filled axis by axis, so no full-size temporaries are created in float64
+        dtype = coordinates_dtype(self.extent)
+        values = np.empty((len(self), 3), dtype=dtype)
+        values_3d = values.reshape(*self.resolution, 3)
+        values_3d[..., 0] = self.x_coord[:, None, None]
+        values_3d[..., 1] = self.y_coord[None, :, None]
+        values_3d[..., 2] = self.z_coord[None, None, :]
+
+        # Transform the values
+        self.values = self._apply_transform(values).astype(dtype, copy=False)
 
     def set_regular_grid(self, extent: Sequence[float], resolution: Sequence[int], transform: Optional[Transform] = None):
         """
@@ -73,6 +177,7 @@ class RegularGrid:
     @transform.setter
     def transform(self, value: Transform):
         self._transform = value
+        self._version += 1
 
     @classmethod
     def from_corners_box(cls, pivot: tuple, point_x_axis: tuple, distance_point3: float,
@@ -198,25 +303,51 @@ class RegularGrid:
     @property
     def values_vtk_format(self) -> np.ndarray:
         return self.get_values_vtk_format()
-    
-    def get_values_vtk_format(self, orthogonal: bool = False) -> np.ndarray:
+
+    @property
+    def vtk_axes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the corner coordinates along x, y and z before the transform. The VTK values are their meshgrid.
+
+        The axes are reused until the extent or resolution change, so they are read-only.
+        """
+        key = fingerprint(self.extent, self.resolution)
+        if self._vtk_axes_cache is not None and self._vtk_axes_cache[0] == key:
+            return self._vtk_axes_cache[1]
+
         extent = self.extent
         resolution = self.resolution + 1
+        axes = tuple(np.linspace(extent[2 * i], extent[2 * i + 1], resolution[i], dtype="float64") for i in range(3))
+        for axis in axes:
+            axis.flags.writeable = False
+        self._vtk_axes_cache = (key, axes)
+        return axes
 
-        x = np.linspace(extent[0], extent[1], resolution[0], dtype="float64")
-        y = np.linspace(extent[2], extent[3], resolution[1], dtype="float64")
-        z = np.linspace(extent[4], extent[5], resolution[2], dtype="float64")
-        xv, yv, zv = np.meshgrid(x, y, z, indexing="ij")
-        g = np.vstack((xv.ravel(), yv.ravel(), zv.ravel())).T
+    def get_values_vtk_format(self, orthogonal: bool = False) -> np.ndarray:
+        """
+        Builds the coordinates of the cell corners in VTK order, shape ((nx + 1) * (ny + 1) * (nz + 1), 3).
+
+        Only the axes are cached (see `vtk_axes`). Every call returns a new writable array, so keep the result
+        instead of calling it repeatedly for large grids.
 
+        Args:
+            orthogonal (bool): If True, the transform of the grid is not applied. Defaults to False.
+        """
+        x, y, z = self.vtk_axes
+        transformed = self.transform is not None and orthogonal is False
+
+        # * Filled axis by axis, so no meshgrid temporaries are created
+        g = np.empty((x.size * y.size * z.size, 3), dtype="float64" if transformed else coordinates_dtype(self.extent))
+        g_3d = g.reshape(x.size, y.size, z.size, 3)
+        g_3d[..., 0] = x[:, None, None]
+        g_3d[..., 1] = y[None, :, None]
+        g_3d[..., 2] = z[None, None, :]
 
         # Transform the values
-        if self.transform is not None and orthogonal is False:
+        if transformed:
             g = self.transform.apply_inverse_with_pivot(
                 points=g,
                 pivot=np.array([self.extent[0], self.extent[2], self.extent[4]])
-            )
-
+            ).astype(coordinates_dtype(self.extent), copy=False)
         return g
 
     @staticmethod
@@ -248,6 +379,32 @@ class RegularGrid:
         plt.show()
 
 
+@dataclasses.dataclass(frozen=True)
+class GridTile:
+    """
+    Box of cells of a `RegularGrid` (see `RegularGrid.iter_tiles`).
+
+    Attributes:
+        slices (tuple[slice, slice, slice]): Cells of the tile along x, y and z.
+        halo_slices (tuple[slice, slice, slice]): Cells of the tile with its halo.
+    """
+    slices: tuple[slice, slice, slice]
+    halo_slices: tuple[slice, slice, slice]
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return tuple(s.stop - s.start for s in self.slices)
+
+    @property
+    def halo_shape(self) -> tuple[int, int, int]:
+        return tuple(s.stop - s.start for s in self.halo_slices)
+
+    @property
+    def interior(self) -> tuple[slice, slice, slice]:
+        """Slices of the tile inside an array of `halo_shape`."""
+        return tuple(slice(s.start - h.start, s.stop - h.start) for s, h in zip(self.slices, self.halo_slices))
+
+
 class Sections:
     """
     Object that creates a grid of cross sections between two points.
@@ -272,6 +429,7 @@ class Sections:
         self.dist = []
         self.df = pd.DataFrame()
         self.df['dist'] = self.dist
+        self._version = 0  #: Increased every time the values change
         self.values = np.empty((0, 3))
         self.extent = None
 
@@ -281,12 +439,54 @@ class Sections:
     def _repr_html_(self):
         return self.df.to_html()
 
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @values.setter
+    def values(self, value: np.ndarray):
+        self._values = value
+        self._version += 1
+
     def __repr__(self):
         return self.df.to_string()
 
     def show(self):
         pass
 
+    @classmethod
+    def from_arrays(cls, start: np.ndarray, stop: np.ndarray, resolution: np.ndarray, names: Optional[Sequence[str]] = None,
+                    regular_grid=None, z_ext=None) -> "Sections":
+        """
+        Creates many sections at once, e.g. fence sections along well paths.
+
+        Args:
+            start (np.ndarray): XY of the first point of every section, shape (n, 2).
+            stop (np.ndarray): XY of the last point of every section, shape (n, 2).
+            resolution (np.ndarray): Resolution along the section and along z, shape (n, 2) or (2,) for all sections.
+            names (Optional[Sequence[str]]): Names of the sections. Defaults to `section_0`, `section_1`, ...
+            regular_grid: Grid used to take the z extent from.
+            z_ext: Z extent of the sections if `regular_grid` is not given.
+
+        Returns:
+            Sections: The sections with their coordinates computed.
+        """
+        start = np.atleast_2d(np.asarray(start, dtype="float64"))
+        stop = np.atleast_2d(np.asarray(stop, dtype="float64"))
+        resolution = np.broadcast_to(np.asarray(resolution, dtype=int), (start.shape[0], 2))
+        if start.shape != stop.shape or start.shape[1] != 2:
+            raise ValueError("start and stop must have the same shape (n, 2).")
+        if names is None:
+            names = [f"section_{i}" for i in range(start.shape[0])]
+        if len(names) != start.shape[0]:
+            raise ValueError("There must be one name per section.")
+
+        section_dict = {
+                name: (start[i].tolist(), stop[i].tolist(), resolution[i].tolist())
+                for i, name in enumerate(names)
+        }
+        return cls(regular_grid=regular_grid, z_ext=z_ext, section_dict=section_dict)
+
     def set_sections(self, section_dict, regular_grid=None, z_ext=None):
         pd = require_pandas()
         self.section_dict = section_dict
@@ -303,41 +503,45 @@ class Sections:
         self.compute_section_coordinates()
 
     def get_section_params(self):
-        self.points = []
-        self.resolution = []
-        self.length = [0]
+        sections = [self.section_dict[section] for section in self.names]
+        self.points = [[section[0], section[1]] for section in sections]
+        self.resolution = [section[2] for section in sections]
 
-        for i, section in enumerate(self.names):
-            points = [self.section_dict[section][0], self.section_dict[section][1]]
-            assert points[0] != points[
-                1], 'The start and end points of the section must not be identical.'
+        coordinates = np.array([section[0] for section in sections] + [section[1] for section in sections],
+                               dtype="float64").reshape(2, -1, 2)
+        assert not np.any(np.all(coordinates[0] == coordinates[1], axis=1)), \
+            'The start and end points of the section must not be identical.'
 
-            self.points.append(points)
-            self.resolution.append(self.section_dict[section][2])
-            self.length = np.append(self.length, self.section_dict[section][2][0] *
-                                    self.section_dict[section][2][1])
-        self.length = np.array(self.length).cumsum()
+        resolution = np.array(self.resolution, dtype=int).reshape(-1, 2)
+        self.length = np.concatenate(([0], resolution[:, 0] * resolution[:, 1])).cumsum()
 
     def calculate_all_distances(self):
-        self.coordinates = np.array(self.points).ravel().reshape(-1,
-                                                                 4)  # axis are x1,y1,x2,y2
+        self.coordinates = np.array(self.points, dtype="float64").reshape(-1, 4)  # axis are x1,y1,x2,y2
         self.dist = np.sqrt(np.diff(self.coordinates[:, [0, 2]]) ** 2 + np.diff(
             self.coordinates[:, [1, 3]]) ** 2)
 
     def compute_section_coordinates(self):
-        for i in range(len(self.names)):
-            xy = calculate_line_coordinates_2points(self.coordinates[i, :2],
-                                                    self.coordinates[i, 2:],
-                                                    self.resolution[i][0])
-            zaxis = np.linspace(self.z_ext[0], self.z_ext[1], self.resolution[i][1],
-                                dtype="float64")
-            X, Z = np.meshgrid(xy[:, 0], zaxis, indexing='ij')
-            Y, _ = np.meshgrid(xy[:, 1], zaxis, indexing='ij')
-            xyz = np.vstack((X.flatten(), Y.flatten(), Z.flatten())).T
-            if i == 0:
-                self.values = xyz
-            else:
-                self.values = np.vstack((self.values, xyz))
+        """Computes the coordinates of all the sections in one pass into `values`."""
+        resolution = np.array(self.resolution, dtype=int).reshape(-1, 2)
+        xy_res, z_res = resolution[:, 0], resolution[:, 1]
+        n_sections = resolution.shape[0]
+
+        # * Section and position in the section of every point. Points run over z first, as in meshgrid with `ij` indexing
+        section_id = np.repeat(np.arange(n_sections), xy_res * z_res)
+        local_index = np.arange(self.length[-1]) - self.length[:-1][section_id]
+        xy_index = local_index // z_res[section_id]
+        z_index = local_index % z_res[section_id]
+
+        xy_fraction = _linspace_fraction(xy_index, xy_res[section_id])
+        z_fraction = _linspace_fraction(z_index, z_res[section_id])
+
+        start, stop = self.coordinates[:, :2], self.coordinates[:, 2:]
+        xy = self.coordinates.reshape(-1, 2)
+        extent = [*xy.min(axis=0), *xy.max(axis=0), *self.z_ext] if n_sections > 0 else [0, 1, 0, 1, 0, 1]
+        values = np.empty((self.length[-1], 3), dtype=coordinates_dtype(np.asarray(extent)[[0, 2, 1, 3, 4, 5]]))
+        values[:, :2] = start[section_id] + (stop - start)[section_id] * xy_fraction[:, None]
+        values[:, 2] = self.z_ext[0] + (self.z_ext[1] - self.z_ext[0]) * z_fraction
+        self.values = values
 
     def generate_axis_coord(self):
         for i, name in enumerate(self.names):
@@ -357,36 +561,98 @@ class Sections:
         return self.values[l0:l1]
 
 
+def _linspace_fraction(index: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Returns the position of `index` in `np.linspace(0, 1, n)` for arrays of indices and lengths."""
+    return np.where(n > 1, index / np.maximum(n - 1, 1), 0.)
+
+
 class CustomGrid:
     """Object that contains arbitrary XYZ coordinates.
 
+    The coordinates can also be read from a `.npy` file. The file is memory-mapped, so it is never loaded into memory
+    at once: evaluate it with `gp.compute_model_at(geo_model, at=custom_grid, chunk_size=...)` and write the results
+    to a file next to it with `open_output`.
+
     Args:
-        xyx_coords (numpy.ndarray like): XYZ (in columns) of the desired coordinates
+        xyx_coords (numpy.ndarray like or path): XYZ (in columns) of the desired coordinates, a `np.memmap` or the
+            path of a `.npy` file with them.
 
     Attributes:
         values (np.ndarray): XYZ coordinates
+        path (Optional[str]): File the coordinates are memory-mapped from. None if they are in memory.
     """
 
-    def __init__(self, xyx_coords: np.ndarray):
+    def __init__(self, xyx_coords: Union[np.ndarray, str, os.PathLike]):
+        self._version = 0  #: Increased every time the values change
         self.values = np.zeros((0, 3))
+        self.path: Optional[str] = None
         self.set_custom_grid(xyx_coords)
 
-    def set_custom_grid(self, custom_grid: np.ndarray):
+    @classmethod
+    def from_file(cls, path: Union[str, os.PathLike]) -> "CustomGrid":
+        """Creates a custom grid memory-mapped from a `.npy` file with shape (n, 3)."""
+        return cls(xyx_coords=path)
+
+    def set_custom_grid(self, custom_grid: Union[np.ndarray, str, os.PathLike]):
         """
         Give the coordinates of an external generated grid
 
         Args:
-            custom_grid (numpy.ndarray like): XYZ (in columns) of the desired coordinates
+            custom_grid (numpy.ndarray like or path): XYZ (in columns) of the desired coordinates, a `np.memmap` or
+                the path of a `.npy` file with them. Files and memory maps are not copied.
 
         Returns:
               numpy.ndarray: Unraveled 3D numpy array where every row correspond to the xyz coordinates of a regular
                grid
         """
+        path = None
+        if isinstance(custom_grid, (str, os.PathLike)):
+            path = os.fspath(custom_grid)
+            custom_grid = np.load(path, mmap_mode='r')
+        elif isinstance(custom_grid, np.memmap):
+            path = custom_grid.filename
+
         custom_grid = np.atleast_2d(custom_grid)
-        assert type(custom_grid) is np.ndarray and custom_grid.shape[1] == 3, \
+        assert isinstance(custom_grid, np.ndarray) and custom_grid.shape[1] == 3, \
             'The shape of new grid must be (n,3)  where n is the number of' \
             ' points of the grid'
 
         self.values = custom_grid
+        self.path = path
         self.length = self.values.shape[0]
         return self.values
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @values.setter
+    def values(self, value: np.ndarray):
+        self._values = value
+        self._version += 1
+
+    def output_path(self, name: str) -> str:
+        """Returns the path of the output file `name` next to the coordinates file, e.g. `points.lith_block.npy`."""
+        if self.path is None:
+            raise ValueError("The custom grid is not backed by a file. Pass a path or a np.memmap to use output files.")
+        root, _ = os.path.splitext(self.path)
+        return f"{root}.{name}.npy"
+
+    def open_output(self, name: str = "lith_block", n_rows: Optional[int] = None, dtype="float64") -> np.memmap:
+        """
+        Creates a memory-mapped `.npy` file next to the coordinates file to receive the results computed on the grid.
+
+        Args:
+            name (str): Name of the output, used in the file name. Defaults to `lith_block`.
+            n_rows (Optional[int]): If given, the output has shape (n_rows, n_points), e.g. for the scalar fields of
+                every group. Defaults to None, which gives shape (n_points,).
+            dtype: Data type of the output. Defaults to float64.
+
+        Returns:
+            np.memmap: The output array, to pass as `out` of `gp.compute_model_at` or `gp.compute_scalar_fields_at`.
+        """
+        shape = (len(self),) if n_rows is None else (n_rows, len(self))
+        return np.lib.format.open_memmap(self.output_path(name), mode='w+', dtype=dtype, shape=shape)
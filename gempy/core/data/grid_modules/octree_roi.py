@@ -0,0 +1,71 @@
+import dataclasses
+import itertools
+from typing import Optional
+
+import numpy as np
+
+
+@dataclasses.dataclass
+class OctreeROI:
+    """
+    Region of interest where the octree is refined up to `max_level` (see `Grid.set_octree_grid_by_levels`).
+
+    The region is either a box given by `extent` or a boolean `mask` of arbitrary resolution that spans `mask_extent`.
+
+    Attributes:
+        max_level (int): Number of octree levels inside the region. The finest voxels are 1 / 2^max_level of the extent.
+        extent (Optional[np.ndarray]): Box of the region as [x_min, x_max, y_min, y_max, z_min, z_max].
+        mask (Optional[np.ndarray]): Boolean array (nx, ny, nz) marking the cells of `mask_extent` inside the region.
+        mask_extent (Optional[np.ndarray]): Box covered by `mask`.
+    """
+    max_level: int
+    extent: Optional[np.ndarray] = None
+    mask: Optional[np.ndarray] = None
+    mask_extent: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        if self.max_level < 1:
+            raise ValueError(f"max_level must be at least 1. Received {self.max_level}")
+        if (self.extent is None) == (self.mask is None):
+            raise ValueError("Either extent or mask must be given.")
+        if self.extent is not None:
+            self.extent = np.asarray(self.extent, dtype=float)
+        if self.mask is not None:
+            if self.mask_extent is None:
+                raise ValueError("mask_extent must be given with mask.")
+            self.mask = np.asarray(self.mask, dtype=bool)
+            self.mask_extent = np.asarray(self.mask_extent, dtype=float)
+            if self.mask.ndim != 3:
+                raise ValueError(f"mask must be a 3D array. Received shape {self.mask.shape}")
+
+    def intersects(self, centers: np.ndarray, half_size: np.ndarray) -> np.ndarray:
+        """
+        Returns which voxels overlap the region.
+
+        Args:
+            centers (np.ndarray): Centers of the voxels, shape (n, 3).
+            half_size (np.ndarray): Half of the size of the voxels along x, y and z.
+
+        Returns:
+            np.ndarray: Boolean array of shape (n,).
+        """
+        if self.extent is not None:
+            box_min, box_max = self.extent[::2], self.extent[1::2]
+            return np.all((centers + half_size >= box_min) & (centers - half_size <= box_max), axis=1)
+
+        # * Voxels are sampled at their center and corners, so regions smaller than a voxel can be missed
+        inside = self._mask_at(centers)
+        for signs in itertools.product((-1, 1), repeat=3):
+            inside |= self._mask_at(centers + np.array(signs) * half_size)
+        return inside
+
+    def _mask_at(self, points: np.ndarray) -> np.ndarray:
+        box_min, box_max = self.mask_extent[::2], self.mask_extent[1::2]
+        resolution = np.array(self.mask.shape)
+        index = np.floor((points - box_min) / (box_max - box_min) * resolution).astype(int)
+        in_box = np.all((index >= 0) & (index < resolution), axis=1)
+
+        inside = np.zeros(points.shape[0], dtype=bool)
+        i, j, k = index[in_box].T
+        inside[in_box] = self.mask[i, j, k]
+        return inside
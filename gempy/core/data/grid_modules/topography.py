@@ -4,6 +4,8 @@ from typing import Optional
 import numpy as np
 
 from .grid_types import RegularGrid
+from ..core_utils import fingerprint
+from ..precision import coordinates_dtype
 from ....modules.grids.create_topography import _LoadDEMArtificial
 
 from ....optional_dependencies import require_skimage
@@ -13,6 +15,9 @@ class Topography:
     """
     Object to include topography in the model.
 
+    The topography is stored as a structured raster: the axes `x` and `y` and the heights `z`. The XYZ coordinates
+    (`values` and `values_2d`) are generated from them on every access.
+
     Notes:
         This always assumes that the topography we pass fits perfectly the extent
 
@@ -20,27 +25,20 @@ class Topography:
 
     def __init__(self, regular_grid: RegularGrid, values_2d: Optional[np.ndarray] = None):
 
-        self._mask_topo = None
+        self._mask_topo = None  #: Column index of the mask, with the key of the topography and grid it was computed for
+        self._version = 0  #: Increased every time the values change
         self._regular_grid = regular_grid
 
-        # Values (n, 3)
-        self.values = np.zeros((0, 3))
-
-        # Values (n, n, 3)
-        self.values_2d = np.zeros((0, 0, 3))
-
         # Shape original
         self.raster_shape = tuple()
 
-        # Topography Resolution
-        self.resolution = np.zeros((0, 3))
-
         # Source for the
         self.source = None
 
-        # Coords
-        self._x = None
-        self._y = None
+        # Raster axes (n,), (m,) and heights (n, m)
+        self._x = np.zeros(0)
+        self._y = np.zeros(0)
+        self._z = np.zeros((0, 0))
 
         if values_2d is not None:
             self.set_values(values_2d)
@@ -80,12 +78,10 @@ class Topography:
 
         # Generate the regular grid points
         from scipy.interpolate import griddata
-        
-        x_regular, y_regular = np.meshgrid(
-            np.linspace(regular_grid.extent[0], regular_grid.extent[1], regular_grid.resolution[0]),
-            np.linspace(regular_grid.extent[2], regular_grid.extent[3], regular_grid.resolution[1]),
-            indexing='ij'
-        )
+
+        x_coordinates = np.linspace(regular_grid.extent[0], regular_grid.extent[1], regular_grid.resolution[0])
+        y_coordinates = np.linspace(regular_grid.extent[2], regular_grid.extent[3], regular_grid.resolution[1])
+        x_regular, y_regular = np.meshgrid(x_coordinates, y_coordinates, indexing='ij')
 
         # Interpolate the z-values onto the regular grid
         z_regular = griddata(
@@ -96,22 +92,12 @@ class Topography:
             fill_value=np.nan  # You can choose a different fill value or method
         )
 
-        # Reshape the grid for compatibility with existing structure
-        values_2d = np.stack((x_regular, y_regular, z_regular), axis=-1)
+        return cls(regular_grid=regular_grid).set_values_from_axes(x_coordinates, y_coordinates, z_regular)
 
-        return cls(regular_grid=regular_grid, values_2d=values_2d)
-    
     
     @classmethod
     def from_arrays(cls, regular_grid, x_coordinates, y_coordinates, height_values,):
-        x_vals, y_vals = np.meshgrid(x_coordinates, y_coordinates, indexing='ij')
-        # Reshape arrays for stacking
-        x_vals = x_vals[:, :, np.newaxis]  # shape (73, 34, 1)
-        y_vals = y_vals[:, :, np.newaxis]  # shape (73, 34, 1)
-        topography_vals = height_values.values[:, :, np.newaxis]  # shape (73, 34, 1)
-        # Stack along the last dimension
-        result = np.concatenate([x_vals, y_vals, topography_vals], axis=2)  # shape (73, 34, 3)
-        return cls(regular_grid=regular_grid, values_2d=result)
+        return cls(regular_grid=regular_grid).set_values_from_axes(x_coordinates, y_coordinates, height_values)
 
     @property
     def extent(self):
@@ -122,81 +108,136 @@ class Topography:
         return self._regular_grid.resolution
 
     @property
-    def x(self):
-        if self._x is not None:
-            return self._x
-        else:
-            val = self.values[:, 0].copy()
-            val.sort()
-            return np.unique(val)
+    def x(self) -> np.ndarray:
+        """X coordinates of the rows of the raster."""
+        return self._x
+
+    @property
+    def y(self) -> np.ndarray:
+        """Y coordinates of the columns of the raster."""
+        return self._y
+
+    @property
+    def z(self) -> np.ndarray:
+        """Heights of the raster, of shape (n, m)."""
+        return self._z
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        return self._z.shape
+
+    @property
+    def values_2d(self) -> np.ndarray:
+        """XYZ coordinates of the raster, of shape (n, m, 3)."""
+        values_2d = np.empty((*self._z.shape, 3), dtype=self._z.dtype)
+        values_2d[:, :, 0] = self._x[:, np.newaxis]
+        values_2d[:, :, 1] = self._y[np.newaxis, :]
+        values_2d[:, :, 2] = self._z
+        return values_2d
 
     @property
-    def y(self):
-        if self._y is not None:
-            return self._y
-        else:
-            val = self.values[:, 1].copy()
-            val.sort()
-            return np.unique(val)
+    def values(self) -> np.ndarray:
+        """XYZ coordinates of the raster, of shape (n * m, 3)."""
+        return self.values_2d.reshape((-1, 3), order='C')
 
     def set_values(self, values_2d: np.ndarray):
         """General method to set topography
 
         Args:
             values_2d (numpy.ndarray[float,float, 3]): array with the XYZ values
-             in 2D
+             in 2D. X must only change along the first axis and Y along the second one.
 
         Returns:
             :class:`gempy.core.grid_modules.topography.Topography`
 
 
         """
-        # Original topography data
-        self.values_2d = values_2d
-        self.resolution = values_2d.shape[:2]
+        values_2d = np.asarray(values_2d)
+        x_coordinates, y_coordinates = values_2d[:, 0, 0], values_2d[0, :, 1]
+        if not (np.array_equal(values_2d[:, :, 0], np.broadcast_to(x_coordinates[:, np.newaxis], values_2d.shape[:2])) and
+                np.array_equal(values_2d[:, :, 1], np.broadcast_to(y_coordinates[np.newaxis, :], values_2d.shape[:2]))):
+            raise ValueError("values_2d must be a structured raster: X must only change along the first axis and Y along the second one.")
 
-        # n,3 array
-        self.values = values_2d.reshape((-1, 3), order='C')
+        return self.set_values_from_axes(x_coordinates, y_coordinates, values_2d[:, :, 2])
+
+    def set_values_from_axes(self, x_coordinates: np.ndarray, y_coordinates: np.ndarray, height_values: np.ndarray):
+        """Sets the topography from the axes of a raster and its heights.
+
+        Args:
+            x_coordinates (np.ndarray): X coordinates of the rows, of shape (n,).
+            y_coordinates (np.ndarray): Y coordinates of the columns, of shape (m,).
+            height_values (np.ndarray): Heights, of shape (n, m).
+
+        Returns:
+            :class:`gempy.core.grid_modules.topography.Topography`
+        """
+        dtype = coordinates_dtype(self._regular_grid.extent)
+        x_coordinates = np.asarray(x_coordinates, dtype=dtype).reshape(-1)
+        y_coordinates = np.asarray(y_coordinates, dtype=dtype).reshape(-1)
+        height_values = np.asarray(height_values, dtype=dtype)
+        if height_values.shape != (x_coordinates.size, y_coordinates.size):
+            raise ValueError(f"height_values must have shape {(x_coordinates.size, y_coordinates.size)}. Received {height_values.shape}")
+
+        self._x, self._y, self._z = x_coordinates, y_coordinates, height_values
+        self._version += 1
         return self
 
     @property
-    def topography_mask(self):
-        """This method takes a topography grid of the same extent as the regular
-         grid and creates a mask of voxels
+    def topography_mask_index(self) -> np.ndarray:
+        """Index along z of the lowest voxel above the topography for every column of the regular grid.
+
+        Voxels `[i, j, k]` with `k >= topography_mask_index[i, j]` are masked. The index is cached until the
+        topography or the extent or resolution of the regular grid change.
 
+        Returns:
+            np.ndarray: int32 array of shape (nx, ny).
         """
+        key = (self._version, fingerprint(self._regular_grid.extent, self._regular_grid.resolution))
+        if self._mask_topo is not None and self._mask_topo[0] == key:
+            return self._mask_topo[1]
 
-        # * Check if the topography is the same as the cached one and if so, return the cached mask
-        if self._mask_topo is not None:
-            return self._mask_topo
+        topography_z = self.interpolate_z(self._regular_grid.x_coord, self._regular_grid.y_coord)
 
-        # interpolate topography values to the regular grid
-        skimage = require_skimage()
-        regular_grid_topo = skimage.transform.resize(
-            image=self.values_2d,
-            output_shape=(self.regular_grid_resolution[0], self.regular_grid_resolution[1]),
-            mode='constant',
-            anti_aliasing=False,
-            preserve_range=True
-        )
+        # * Voxels are masked if their center is above the topography lowered by two voxel heights
+        topography_z = topography_z - self._regular_grid.dz * 2
+        index = np.searchsorted(self._regular_grid.z_coord, topography_z, side='right').astype(np.int32)
+        index.flags.writeable = False
 
-        # Adjust the topography to be lower by half a voxel height
-        # Assumes your voxel heights are uniform and can be calculated as the total height divided by resolution
-        voxel_height = self._regular_grid.dz * 2
-        regular_grid_topo = regular_grid_topo - voxel_height
+        self._mask_topo = (key, index)
+        return index
 
-        # Reshape the Z values of the regular grid to 3d
-        values_3d = self._regular_grid.values[:, 2].reshape(self.regular_grid_resolution)
-        if regular_grid_topo.ndim == 3:
-            regular_grid_topo_z = regular_grid_topo[:, :, [2]]
-        elif regular_grid_topo.ndim == 2:
-            regular_grid_topo_z = regular_grid_topo
-        else:
-            raise ValueError()
-        mask = np.greater(values_3d[:, :, :], regular_grid_topo_z)
+    @property
+    def topography_mask(self) -> np.ndarray:
+        """Boolean mask of shape (nx, ny, nz) of the voxels of the regular grid that are above the topography.
 
-        self._mask_topo = mask
-        return self._mask_topo
+        It is built from `topography_mask_index` on every access, so only the index is kept in memory.
+        """
+        z_index = np.arange(self.regular_grid_resolution[2], dtype=np.int32)
+        return z_index[np.newaxis, np.newaxis, :] >= self.topography_mask_index[:, :, np.newaxis]
+
+    def interpolate_z(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Bilinearly interpolates the height of the topography at every combination of `x` and `y`.
+
+        Points outside the topography take the height of the closest edge.
+
+        Args:
+            x (np.ndarray): X coordinates, of shape (n,).
+            y (np.ndarray): Y coordinates, of shape (m,).
+
+        Returns:
+            np.ndarray: Heights of shape (n, m).
+        """
+        z, x_axis, y_axis = self._z, self._x, self._y
+        if x_axis[0] > x_axis[-1]:
+            x_axis, z = x_axis[::-1], z[::-1]
+        if y_axis[0] > y_axis[-1]:
+            y_axis, z = y_axis[::-1], z[:, ::-1]
+
+        x_lower, x_upper, x_weight = _linear_weights(x_axis, x)
+        y_lower, y_upper, y_weight = _linear_weights(y_axis, y)
+        x_weight, y_weight = x_weight[:, np.newaxis], y_weight[np.newaxis, :]
+        return ((z[np.ix_(x_lower, y_lower)] * (1 - y_weight) + z[np.ix_(x_lower, y_upper)] * y_weight) * (1 - x_weight) +
+                (z[np.ix_(x_upper, y_lower)] * (1 - y_weight) + z[np.ix_(x_upper, y_upper)] * y_weight) * x_weight)
 
     def resize_topo(self):
         skimage = require_skimage()
@@ -219,16 +260,22 @@ class Topography:
         dem = _LoadDEMArtificial(extent=self.extent,
                                  resolution=self.regular_grid_resolution, **kwargs)
 
-        self._x, self._y = dem.x, dem.y
-        self.set_values(dem.get_values())
+        self.set_values_from_axes(dem.x, dem.y, dem.dem_zval)
 
     def save(self, path):
         np.save(path, self.values_2d)
 
     def load(self, path):
         self.set_values(np.load(path))
-        self._x, self._y = None, None
         return self.values
 
     def load_from_saved(self, *args, **kwargs):
         self.load(*args, **kwargs)
+
+
+def _linear_weights(axis: np.ndarray, points: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the neighbours in the increasing `axis` of every point and the weight of the upper one."""
+    position = np.interp(points, axis, np.arange(axis.size))
+    lower = np.clip(np.floor(position).astype(int), 0, max(axis.size - 2, 0))
+    upper = np.minimum(lower + 1, axis.size - 1)
+    return lower, upper, position - lower
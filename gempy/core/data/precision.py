@@ -0,0 +1,74 @@
+import contextlib
+import warnings
+from typing import Optional, Union
+
+import numpy as np
+
+_SUPPORTED_DTYPES = (np.dtype("float32"), np.dtype("float64"))
+_float_dtype: np.dtype = np.dtype("float64")
+
+# * Below this ratio between the distance of an extent to the origin and its size, float32 resolves it to about 1e-4
+_MAX_FLOAT32_OFFSET_RATIO = 1e3
+
+
+def get_float_dtype() -> np.dtype:
+    """Returns the floating point type of the grids, the engine and the solution arrays."""
+    return _float_dtype
+
+
+def set_float_dtype(dtype: Union[str, np.dtype]) -> None:
+    """
+    Sets the floating point type of the grids, the engine and the solution arrays.
+
+    With float32, the coordinates of `RegularGrid`, `Sections` and `Topography`, the engine tensors (unless
+    `GemPyEngineConfig.dtype` says otherwise) and the arrays returned by the point queries take half the memory. The
+    inputs reach the engine normalized by the input transform, so the interpolation keeps its accuracy. Tables of
+    surface points and orientations stay in float64: they are small and their coordinates are the reference of the
+    transform.
+
+    Args:
+        dtype (Union[str, np.dtype]): `float32` or `float64`.
+    """
+    global _float_dtype
+    dtype = np.dtype(dtype)
+    if dtype not in _SUPPORTED_DTYPES:
+        raise ValueError(f"dtype must be float32 or float64. Received {dtype}")
+    _float_dtype = dtype
+
+
+@contextlib.contextmanager
+def float_precision(dtype: Union[str, np.dtype]):
+    """Context manager that sets the floating point type with `set_float_dtype` and restores the previous one."""
+    previous = get_float_dtype()
+    set_float_dtype(dtype)
+    try:
+        yield
+    finally:
+        set_float_dtype(previous)
+
+
+def coordinates_dtype(extent: np.ndarray) -> np.dtype:
+    """
+    Returns the type to store coordinates in `extent` with.
+
+    float32 is used if it is the active precision and can resolve the extent. Extents far from the origin compared to
+    their size (e.g. a few hundred metres in UTM coordinates) keep float64.
+    """
+    if _float_dtype == np.float64:
+        return _float_dtype
+
+    extent = np.asarray(extent, dtype="float64")
+    size = np.max(extent[1::2] - extent[::2])
+    offset = np.max(np.abs(extent))
+    if size > 0 and offset / size > _MAX_FLOAT32_OFFSET_RATIO:
+        warnings.warn("The extent is too far from the origin to be resolved in float32. Its coordinates are kept in "
+                      "float64; translate the model closer to the origin to store them in float32.")
+        return np.dtype("float64")
+    return _float_dtype
+
+
+def engine_dtype(dtype: Optional[str]) -> Optional[str]:
+    """Returns the dtype of the engine tensors: `dtype` if given, otherwise the active precision."""
+    if dtype is not None:
+        return dtype
+    return "float32" if _float_dtype == np.float32 else None
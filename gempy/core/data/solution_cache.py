@@ -0,0 +1,190 @@
+import functools
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+import gempy_engine
+from gempy_engine.core.data import Solutions
+from gempy_engine.core.data.kernel_classes.faults import FaultsData
+
+from .core_utils import fingerprint
+from .precision import engine_dtype
+
+
+class SolutionCache:
+    """
+    Content-addressed cache of computed `Solutions`.
+
+    Solutions are kept in memory with least-recently-used eviction and, optionally, pickled into a directory so
+    they can be shared between processes. The disk cache is bounded by size and the least recently used files
+    are deleted first. The keys are process-stable digests (see `solution_cache_key`), so any worker pointing to
+    the same directory can reuse the solutions computed by the others.
+
+    Attributes:
+        max_entries (int): Maximum number of solutions kept in memory.
+        cache_dir (Optional[str]): Directory of the disk cache. If None, solutions are only kept in memory.
+        max_disk_bytes (int): Maximum size in bytes of the disk cache.
+    """
+
+    def __init__(self, max_entries: int = 16, cache_dir: Optional[str] = None, max_disk_bytes: int = 2 * 1024 ** 3):
+        if max_entries < 0:
+            raise ValueError(f'max_entries must be non-negative. Received {max_entries}')
+
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, Solutions] = OrderedDict()
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def __contains__(self, key: str):
+        return key in self._memory or (self.cache_dir is not None and os.path.exists(self._path(key)))
+
+    def get(self, key: str) -> Optional[Solutions]:
+        """Returns the solutions stored under `key` or None. Disk hits are promoted to the memory cache."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                solutions: Solutions = pickle.load(f)
+            os.utime(path)  # * Mark as recently used
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        self._put_in_memory(key, solutions)
+        return solutions
+
+    def put(self, key: str, solutions: Solutions) -> None:
+        """Stores `solutions` under `key` in memory and, if a directory was given, on disk."""
+        self._put_in_memory(key, solutions)
+
+        if self.cache_dir is None:
+            return
+
+        # * Write to a temporary file first so other processes never read half written solutions
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(solutions, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._evict_disk()
+
+    def clear(self, disk: bool = False) -> None:
+        """Removes all the solutions from memory and, if `disk` is True, from the disk cache."""
+        self._memory.clear()
+        if disk and self.cache_dir is not None:
+            for path in self._disk_files():
+                os.remove(path)
+
+    def _put_in_memory(self, key: str, solutions: Solutions):
+        self._memory[key] = solutions
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _disk_files(self) -> list[str]:
+        return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.pkl')]
+
+    def _evict_disk(self):
+        files = []
+        for path in self._disk_files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # * Removed by another process
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_size <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+
+def solution_cache_key(geo_model: "gempy.data.GeoModel", engine_config: "gempy.data.GemPyEngineConfig") -> str:
+    """
+    Compute a process-stable key of everything `compute_model` depends on.
+
+    Args:
+        geo_model (GeoModel): The model to compute.
+        engine_config (GemPyEngineConfig): Configuration for the computational engine.
+
+    Returns:
+        str: Hexadecimal digest of the model input, grid, options and engine configuration.
+    """
+    structural_frame = geo_model.structural_frame
+    options = geo_model.interpolation_options
+    geophysics_input = geo_model.geophysics_input
+
+    return fingerprint(
+        gempy_engine.__version__,
+        engine_config.backend,
+        engine_dtype(engine_config.dtype),
+        structural_frame.surface_points_fingerprint,
+        structural_frame.orientations_fingerprint,
+        [[element.name for element in group.elements] for group in structural_frame.structural_groups],
+        structural_frame.groups_structural_relation,
+        structural_frame.fault_relations,
+        [_faults_data_key(faults_data) for faults_data in structural_frame.faults_input_data],
+        geo_model.grid.fingerprint,
+        geo_model.input_transform,
+        # * The condition number is written by the engine, so it is not part of the input
+        {key: value for key, value in vars(options.kernel_options).items() if key not in ('condition_number', 'optimizing_condition_number')},
+        _evaluation_options_key(options),
+        options.debug,
+        options.block_solutions_type,
+        options.sigmoid_slope,
+        (np.asarray(geophysics_input.tz), np.asarray(geophysics_input.densities)) if geophysics_input is not None else None
+    )
+
+
+def _evaluation_options_key(options: "gempy.data.InterpolationOptions") -> dict:
+    evaluation_options = vars(options.evaluation_options).copy()
+    # * Mesh extraction switches on the scalar gradient of the options it is given, so both states are equivalent
+    if evaluation_options['mesh_extraction']:
+        evaluation_options['compute_scalar_gradient'] = True
+    return evaluation_options
+
+
+def _faults_data_key(faults_data: Optional[FaultsData]):
+    # * The fault values are written by the engine during the computation, only the user given data is relevant
+    if faults_data is None:
+        return None
+
+    finite_fault_data = faults_data.finite_fault_data
+    if finite_fault_data is None:
+        return faults_data.thickness
+
+    return (
+        faults_data.thickness,
+        _callable_key(finite_fault_data.implicit_function),
+        finite_fault_data.implicit_function_transform,
+        finite_fault_data.pivot
+    )
+
+
+def _callable_key(function: callable):
+    # * Implicit functions are usually partials (see `ellipsoid_3d_factory`), so their arguments are part of the key
+    if isinstance(function, functools.partial):
+        return _callable_key(function.func), function.args, function.keywords
+    return f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', type(function).__name__)}"
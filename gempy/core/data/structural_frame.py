@@ -1,7 +1,7 @@
 ﻿import numpy as np
 import warnings
 from dataclasses import dataclass
-from typing import Generator
+from typing import Generator, Optional
 
 from gempy_engine.core.data.input_data_descriptor import InputDataDescriptor
 from gempy_engine.core.data.kernel_classes.faults import FaultsData
@@ -10,6 +10,7 @@ from .orientations import OrientationsTable
 from .structural_element import StructuralElement
 from .structural_group import StructuralGroup, FaultsRelationSpecialCase
 from .surface_points import SurfacePointsTable
+from .core_utils import fingerprint
 from ..color_generator import ColorsGenerator
 
 
@@ -21,13 +22,14 @@ class StructuralFrame:
     Attributes:
         structural_groups (list[StructuralGroup]): List of structural groups that constitute the geological model.
         color_generator (ColorsGenerator): Instance of ColorsGenerator used for assigning distinct colors to different structural elements.
-        is_dirty (bool): Boolean flag indicating if the structural frame has been modified.
+        is_dirty (bool): Boolean flag indicating if the structural frame has been modified since it was last marked as clean.
     """
 
     structural_groups: list[StructuralGroup] 
     color_generator: ColorsGenerator 
     # ? Should I create some sort of structural options class? For example, the masking descriptor and faults relations pointer
-    is_dirty: bool = True 
+    _clean_fingerprint: Optional[str] = None  #: Fingerprint of the frame the last time it was marked as clean.
+    _input_data_descriptor_cache: Optional[tuple[str, InputDataDescriptor]] = None
 
     def __init__(self, structural_groups: list[StructuralGroup], color_gen: ColorsGenerator):
         self.structural_groups = structural_groups  # ? This maybe could be optional
@@ -279,17 +281,64 @@ class StructuralFrame:
 
     @property
     def input_data_descriptor(self):
-        """Returns a descriptor for the input data, detailing the relations and faults between groups."""
-        # TODO: This should have the exact same dirty logic as interpolation_input
+        """Returns a descriptor for the input data, detailing the relations and faults between groups.
+        The descriptor is only rebuilt when the structure of the frame changes."""
 
         self._validate_faults_relations()
-        return InputDataDescriptor.from_structural_frame(
+        structure_fingerprint = self.structure_fingerprint
+        if self._input_data_descriptor_cache is not None and self._input_data_descriptor_cache[0] == structure_fingerprint:
+            return self._input_data_descriptor_cache[1]
+
+        input_data_descriptor = InputDataDescriptor.from_structural_frame(
             structural_frame=self,
             making_descriptor=self.groups_structural_relation,
             faults_relations=self.fault_relations,
             faults_input_data=self.faults_input_data
 
         )
+        self._input_data_descriptor_cache = (structure_fingerprint, input_data_descriptor)
+        return input_data_descriptor
+
+    # region Change tracking
+    @property
+    def surface_points_fingerprint(self) -> str:
+        """Returns a digest of the surface points of all structural elements. It changes with any edit of the tables."""
+        return fingerprint(*[element.surface_points.data for group in self.structural_groups for element in group.elements])
+
+    @property
+    def orientations_fingerprint(self) -> str:
+        """Returns a digest of the orientations of all structural elements. It changes with any edit of the tables."""
+        return fingerprint(*[element.orientations.data for group in self.structural_groups for element in group.elements])
+
+    @property
+    def structure_fingerprint(self) -> str:
+        """Returns a digest of the structure of the frame, i.e. everything the input data descriptor depends on."""
+        return fingerprint(
+            [element.name for group in self.structural_groups for element in group.elements],
+            self.number_of_points_per_group,
+            self.number_of_orientations_per_group,
+            self.number_of_elements_per_group,
+            [element.number_of_points for group in self.structural_groups for element in group.elements],
+            self.groups_structural_relation,
+            self.fault_relations,
+            [id(faults_data) for faults_data in self.faults_input_data]  # * The descriptor holds these objects by reference
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """Returns a digest of all the data of the frame that is used for the interpolation."""
+        return fingerprint(self.surface_points_fingerprint, self.orientations_fingerprint, self.structure_fingerprint)
+
+    @property
+    def is_dirty(self) -> bool:
+        """Returns True if the frame has been modified since it was last marked as clean."""
+        return self._clean_fingerprint != self.fingerprint
+
+    @is_dirty.setter
+    def is_dirty(self, value: bool):
+        self._clean_fingerprint = None if value else self.fingerprint
+
+    # endregion
 
     @property
     def faults_input_data(self):
@@ -1,17 +1,35 @@
-from typing import Optional
+from typing import Optional, Callable, Any
 
 import numpy as np
 
+from ...core.data.core_utils import fingerprint
 from ...core.data.grid import Grid
+from ...core.data.precision import get_float_dtype
 from ...core.data.structural_frame import StructuralFrame
+from ..geophysics.gravity_kernel import CachedCenteredGrid
+from ..profiling.compute_profiler import profile_stage
 
+from gempy_engine.config import AvailableBackends, NOT_MAKE_INPUT_DEEP_COPY
+from gempy_engine.core.backend_tensor import BackendTensor
 from gempy_engine.core.data import SurfacePoints, Orientations
 from gempy_engine.core.data import engine_grid
 from gempy_engine.core.data.interpolation_input import InterpolationInput
 from gempy_engine.core.data.transforms import Transform
 
 
-def interpolation_input_from_structural_frame(geo_model: "gempy.data.GeoModel") -> InterpolationInput:
+def interpolation_input_from_structural_frame(geo_model: "gempy.data.GeoModel", reuse_unchanged: bool = False) -> InterpolationInput:
+    """
+    Build the engine input from the structural frame, the grid and the transforms of a model.
+
+    Args:
+        geo_model (GeoModel): The model to convert.
+        reuse_unchanged (bool): If True, the surface points, orientations and grid built by a previous call are
+            reused when the data they depend on has not changed since. Only honoured when the engine copies its
+            input (numpy backend without gradients), since otherwise the engine may modify the cached objects.
+
+    Returns:
+        InterpolationInput: The input for `gempy_engine.compute_model`.
+    """
     import gempy # ! This is important for type safety
     geo_model: gempy.data.GeoModel = geo_model
 
@@ -21,25 +39,22 @@ def interpolation_input_from_structural_frame(geo_model: "gempy.data.GeoModel")
     input_transform: Transform = geo_model.input_transform
     grid: Grid = geo_model.grid
 
-    total_transform: Transform = input_transform + grid.transform
-
-    surface_points_copy_transformed = geo_model.surface_points_copy_transformed
-    surface_points: SurfacePoints = SurfacePoints(
-        sp_coords=geo_model.surface_points_copy_transformed.xyz,
-        nugget_effect_scalar=surface_points_copy_transformed.nugget
-    )
-
-    orientations_copy_transformed = geo_model.orientations_copy_transformed
-    orientations: Orientations = Orientations(
-        dip_positions=orientations_copy_transformed.xyz,
-        dip_gradients=orientations_copy_transformed.grads,
-        nugget_effect_grad=orientations_copy_transformed.nugget
-    )
-
-    grid: engine_grid.EngineGrid = _apply_input_transform_to_grids(
-        grid=grid,
-        input_transform=input_transform,
-        extent_transformed=geo_model.extent_transformed_transformed_by_input
+    pieces_cache, common_key = _pieces_cache(geo_model, reuse_unchanged)
+    surface_points, orientations = _get_or_build_input_data(geo_model, pieces_cache, common_key)
+
+    def _build_grid() -> engine_grid.EngineGrid:
+        with profile_stage("grids transform"):
+            return _apply_input_transform_to_grids(
+                grid=grid,
+                input_transform=input_transform,
+                extent_transformed=geo_model.extent_transformed_transformed_by_input
+            )
+
+    grid: engine_grid.EngineGrid = _get_or_build_piece(
+        pieces_cache=pieces_cache,
+        name="grid",
+        key_fn=lambda: fingerprint(common_key, grid.fingerprint),
+        build_fn=_build_grid
     )
 
     interpolation_input: InterpolationInput = InterpolationInput(
@@ -52,6 +67,124 @@ def interpolation_input_from_structural_frame(geo_model: "gempy.data.GeoModel")
     return interpolation_input
 
 
+def interpolation_input_at(geo_model: "gempy.data.GeoModel", xyz: np.ndarray, reuse_unchanged: bool = False) -> InterpolationInput:
+    """
+    Build the engine input to evaluate a model only at the given coordinates.
+
+    Unlike `interpolation_input_from_structural_frame`, the grid of the model is never built: the input only holds
+    the surface points, the orientations and `xyz` as a custom grid, all with the input transform applied.
+
+    Args:
+        geo_model (GeoModel): The model to convert.
+        xyz (np.ndarray): Coordinates of shape (n_points, 3).
+        reuse_unchanged (bool): If True, the surface points and orientations built by a previous call of either
+            function are reused when they have not changed since.
+
+    Returns:
+        InterpolationInput: The input for the engine interpolation without octrees.
+    """
+    pieces_cache, common_key = _pieces_cache(geo_model, reuse_unchanged)
+    surface_points, orientations = _get_or_build_input_data(geo_model, pieces_cache, common_key)
+    return interpolation_input_at_points(surface_points, orientations, geo_model.structural_frame.elements_ids, geo_model.input_transform, xyz)
+
+
+def interpolation_input_at_points(surface_points: SurfacePoints, orientations: Orientations, unit_values: np.ndarray,
+                                  input_transform: Transform, xyz: np.ndarray) -> InterpolationInput:
+    """
+    Build the engine input to evaluate already transformed input data at the given coordinates.
+
+    Same as `interpolation_input_at` without the model, e.g. in worker processes that received the input data.
+
+    Args:
+        surface_points (SurfacePoints): Surface points in engine coordinates.
+        orientations (Orientations): Orientations in engine coordinates.
+        unit_values (np.ndarray): Ids of the elements.
+        input_transform (Transform): Input transform of the model, applied to `xyz`.
+        xyz (np.ndarray): Coordinates of shape (n_points, 3).
+
+    Returns:
+        InterpolationInput: The input for the engine interpolation without octrees.
+    """
+    return InterpolationInput(
+        surface_points=surface_points,
+        orientations=orientations,
+        grid=engine_grid.EngineGrid.from_xyz_coords(  # * Same transform as the custom grid
+            _transform_grid_values(input_transform, xyz)
+        ),
+        unit_values=unit_values
+    )
+
+
+def _pieces_cache(geo_model: "gempy.data.GeoModel", reuse_unchanged: bool) -> tuple[Optional[dict], Optional[str]]:
+    if not (reuse_unchanged and _engine_copies_input()):
+        return None, None
+    if geo_model._interpolation_input_pieces is None:
+        geo_model._interpolation_input_pieces = {}
+
+    # * Everything the pieces depend on besides their own data
+    common_key = fingerprint(BackendTensor.engine_backend, BackendTensor.dtype, get_float_dtype().name, geo_model.input_transform, geo_model.grid.transform)
+    return geo_model._interpolation_input_pieces, common_key
+
+
+def _get_or_build_input_data(geo_model: "gempy.data.GeoModel", pieces_cache: Optional[dict], common_key: Optional[str]) -> tuple[SurfacePoints, Orientations]:
+    structural_frame: StructuralFrame = geo_model.structural_frame
+
+    def _build_surface_points() -> SurfacePoints:
+        with profile_stage("surface points transform"):
+            surface_points_copy_transformed = geo_model.surface_points_copy_transformed
+        return SurfacePoints(
+            sp_coords=surface_points_copy_transformed.xyz,
+            nugget_effect_scalar=surface_points_copy_transformed.nugget
+        )
+
+    def _build_orientations() -> Orientations:
+        with profile_stage("orientations transform"):
+            orientations_copy_transformed = geo_model.orientations_copy_transformed
+        return Orientations(
+            dip_positions=orientations_copy_transformed.xyz,
+            dip_gradients=orientations_copy_transformed.grads,
+            nugget_effect_grad=orientations_copy_transformed.nugget
+        )
+
+    surface_points: SurfacePoints = _get_or_build_piece(
+        pieces_cache=pieces_cache,
+        name="surface_points",
+        key_fn=lambda: fingerprint(common_key, structural_frame.surface_points_fingerprint),
+        build_fn=_build_surface_points
+    )
+    orientations: Orientations = _get_or_build_piece(
+        pieces_cache=pieces_cache,
+        name="orientations",
+        key_fn=lambda: fingerprint(common_key, structural_frame.orientations_fingerprint),
+        build_fn=_build_orientations
+    )
+    return surface_points, orientations
+
+
+def _engine_copies_input() -> bool:
+    # * With PyTorch (or gradients) the engine works directly on the input tensors, so they cannot be shared
+    return BackendTensor.engine_backend is AvailableBackends.numpy and NOT_MAKE_INPUT_DEEP_COPY is False
+
+
+def _get_or_build_piece(pieces_cache: Optional[dict], name: str, key_fn: Callable[[], str], build_fn: Callable[[], Any]) -> Any:
+    if pieces_cache is None:
+        return build_fn()
+
+    key = key_fn()
+    cached = pieces_cache.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    piece = build_fn()
+    pieces_cache[name] = (key, piece)
+    return piece
+
+
+def _transform_grid_values(input_transform: Transform, values: np.ndarray) -> np.ndarray:
+    # * The transform works in float64, so the coordinates are normalized before they are reduced to the active precision
+    return input_transform.apply(values).astype(get_float_dtype(), copy=False)
+
+
 def _apply_input_transform_to_grids(grid: Grid, input_transform: Transform, extent_transformed: np.ndarray) -> engine_grid.EngineGrid:
     new_extents = extent_transformed
     # Initialize all variables to None
@@ -68,13 +201,13 @@ def _apply_input_transform_to_grids(grid: Grid, input_transform: Transform, exte
             regular_grid_shape=grid.dense_grid.resolution,
         )
     if grid.GridTypes.CUSTOM in grid.active_grids and grid.custom_grid is not None:
-        custom_values = engine_grid.GenericGrid(values=input_transform.apply(grid.custom_grid.values))
+        custom_values = engine_grid.GenericGrid(values=_transform_grid_values(input_transform, grid.custom_grid.values))
     if grid.GridTypes.TOPOGRAPHY in grid.active_grids and grid.topography is not None:
-        topography_values = engine_grid.GenericGrid(values=input_transform.apply(grid.topography.values))
+        topography_values = engine_grid.GenericGrid(values=_transform_grid_values(input_transform, grid.topography.values))
     if grid.GridTypes.SECTIONS in grid.active_grids and grid.sections is not None:
-        section_values = engine_grid.GenericGrid(values=input_transform.apply(grid.sections.values))
+        section_values = engine_grid.GenericGrid(values=_transform_grid_values(input_transform, grid.sections.values))
     if grid.GridTypes.CENTERED in grid.active_grids and grid.centered_grid is not None:
-        centered_grid = engine_grid.CenteredGrid(
+        centered_grid = CachedCenteredGrid(
             centers=input_transform.apply(grid.centered_grid.centers),
             radius=input_transform.scale_points(np.atleast_2d(grid.centered_grid.radius))[0],
             resolution=grid.centered_grid.resolution
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from gempy_engine.core.backend_tensor import BackendTensor
+from gempy_engine.modules.geophysics import gravity_gradient
+
+from ...core.data.core_utils import fingerprint
+from ...core.data.gravity_kernel_cache import GravityKernelCache, default_gravity_kernel_cache
+from ...core.data.grid_modules import RegularGrid
+from ...core.data.precision import get_float_dtype
+
+
+@dataclass
+class _PrismStencil:
+    """Voxels around a device, laid out like the stencil of a `CenteredGrid`."""
+    kernel_grid_centers: np.ndarray
+    left_voxel_edges: np.ndarray
+    right_voxel_edges: np.ndarray
+
+
+def compute_gravity_fft(geo_model: "gempy.data.GeoModel", observation_height: float, densities: Optional[np.ndarray] = None,
+                        ugal: bool = True, cache: Optional[GravityKernelCache] = None) -> np.ndarray:
+    """
+    Computes the gravity of the dense grid of the last solutions at a plane of stations above the model.
+
+    There is one station above the center of every column of cells of the dense grid. The gravity of every layer of
+    cells is then a 2D convolution of its densities with the prism kernel, which is evaluated with FFTs for all the
+    stations at once. The kernel is the one of `calculate_gravity_gradient`, so the values have the same units and
+    sign convention as `Solutions.gravity`. The spectra of the kernels only depend on the geometry of the grid and
+    the height of the stations, and are cached.
+
+    Args:
+        geo_model (GeoModel): Computed model with an axis-aligned dense grid.
+        observation_height (float): Z coordinate of the stations. It must be above the dense grid.
+        densities (Optional[np.ndarray]): Density of each unit, in the order of the ids of the lithology block.
+            Defaults to the densities of `geo_model.geophysics_input`.
+        ugal (bool): If True, the gravity is in µGal. Otherwise it is in SI units.
+        cache (Optional[GravityKernelCache]): Cache of the kernel spectra. Defaults to the cache shared by the whole
+            process.
+
+    Returns:
+        np.ndarray: Gravity at the stations, of shape (nx, ny).
+    """
+    if cache is None:
+        cache = default_gravity_kernel_cache
+
+    regular_grid: RegularGrid = geo_model.grid.dense_grid
+    solutions = geo_model.solutions
+    if regular_grid is None or solutions is None or solutions.octrees_output[0].grid_centers.dense_grid is None:
+        raise ValueError("The model must be computed with the dense grid active.")
+    if not np.allclose(regular_grid.transform.get_transform_matrix(), np.eye(4)):
+        raise ValueError("The dense grid must be axis aligned.")
+    if observation_height <= regular_grid.extent[5]:
+        raise ValueError(f"observation_height must be above the dense grid top ({regular_grid.extent[5]}). Received {observation_height}")
+
+    if densities is None:
+        if geo_model.geophysics_input is None:
+            raise ValueError("densities must be given if the model has no geophysics_input.")
+        densities = geo_model.geophysics_input.densities
+    densities = np.asarray(BackendTensor.t.to_numpy(densities), dtype=get_float_dtype())
+
+    ids = BackendTensor.t.to_numpy(solutions.octrees_output[0].outputs_centers[-1].ids_block_dense_grid)
+    density_block = densities[np.rint(ids).astype(int) - 1].reshape(regular_grid.resolution)
+
+    nx, ny, _ = regular_grid.resolution
+    fft_shape = (3 * nx - 2, 3 * ny - 2)  # * Large enough for the linear convolution with the (2n - 1) wide kernels
+    kernel_spectra = _kernel_spectra(regular_grid, observation_height, fft_shape, ugal, cache)
+
+    density_spectra = np.fft.rfft2(density_block, s=fft_shape, axes=(0, 1))
+    gravity = np.fft.irfft2(np.einsum('ijk,ijk->ij', density_spectra, kernel_spectra), s=fft_shape)
+    return gravity[nx - 1:2 * nx - 1, ny - 1:2 * ny - 1].astype(get_float_dtype(), copy=False)
+
+
+def _kernel_spectra(regular_grid: RegularGrid, observation_height: float, fft_shape: tuple[int, int], ugal: bool,
+                    cache: GravityKernelCache) -> np.ndarray:
+    dtype = get_float_dtype()
+    dx, dy, dz = regular_grid.dx_dy_dz
+    heights = regular_grid.z_coord - observation_height
+    key = fingerprint("fft_tz", regular_grid.resolution, np.array([dx, dy, dz]), heights, fft_shape, ugal, dtype.name)
+    spectra = cache.get(key)
+    if spectra is not None:
+        return spectra
+
+    nx, ny, nz = regular_grid.resolution
+    # * Cell offsets from the station. The kernel is stored flipped, so the convolution gives the sum over the cells
+    offsets_x = np.arange(nx - 1, -nx, -1) * dx
+    offsets_y = np.arange(ny - 1, -ny, -1) * dy
+    centers_xy = np.stack(np.meshgrid(offsets_x, offsets_y, indexing='ij'), axis=-1).reshape(-1, 2)
+    half_cell = np.broadcast_to(np.array([dx, dy, dz]) / 2, (centers_xy.shape[0], 3))
+
+    spectra = np.empty((fft_shape[0], fft_shape[1] // 2 + 1, nz), dtype=np.result_type(dtype, np.complex64))
+    for k, height in enumerate(heights):
+        stencil = _PrismStencil(
+            kernel_grid_centers=np.column_stack((centers_xy, np.full(centers_xy.shape[0], height))),
+            left_voxel_edges=half_cell,
+            right_voxel_edges=half_cell
+        )
+        tz = gravity_gradient.calculate_gravity_gradient(stencil, ugal=ugal).reshape(2 * nx - 1, 2 * ny - 1)
+        spectra[..., k] = np.fft.rfft2(tz, s=fft_shape)
+    return cache.put(key, spectra)
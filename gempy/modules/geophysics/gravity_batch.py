@@ -0,0 +1,70 @@
+import numpy as np
+
+from gempy_engine.core.backend_tensor import BackendTensor
+
+from ...core.data.precision import get_float_dtype
+
+
+def gravity_density_operator(geo_model: "gempy.data.GeoModel") -> np.ndarray:
+    """
+    Returns the gravity that every unit with a unit density produces at every device of the centered grid.
+
+    The gravity of any densities is then the product of this operator with the density vector. The operator only
+    depends on the geometry, so it is computed once per solutions and gravity kernel and kept in the model.
+
+    Args:
+        geo_model (GeoModel): Model computed with the centered grid active and a `geophysics_input`.
+
+    Returns:
+        np.ndarray: Read-only array of shape (n_devices, n_units). Column `i` belongs to the lithology id `i + 1`.
+    """
+    solutions = geo_model.solutions
+    if solutions is None or geo_model.geophysics_input is None or solutions.octrees_output[0].grid_centers.geophysics_grid is None:
+        raise ValueError("The model must be computed with the centered grid active and a geophysics_input.")
+
+    tz = geo_model.geophysics_input.tz
+    cache = geo_model._gravity_operator_cache
+    if cache is not None and cache[0] is solutions and cache[1] is tz:
+        return cache[2]
+
+    ids = BackendTensor.t.to_numpy(solutions.octrees_output[0].outputs_centers[-1].ids_geophysics_grid)
+    ids = np.rint(ids).astype(int) - 1
+    tz = np.asarray(BackendTensor.t.to_numpy(tz), dtype=get_float_dtype()).reshape(-1)
+    n_devices = ids.shape[0] // tz.shape[0]
+    n_units = int(ids.max()) + 1
+
+    # * Sum the kernel of the voxels of every device by unit
+    devices = np.repeat(np.arange(n_devices), tz.shape[0])
+    operator = np.bincount(
+        devices * n_units + ids,
+        weights=np.tile(tz, n_devices),
+        minlength=n_devices * n_units
+    ).reshape(n_devices, n_units).astype(get_float_dtype(), copy=False)
+    operator.flags.writeable = False
+
+    geo_model._gravity_operator_cache = (solutions, geo_model.geophysics_input.tz, operator)
+    return operator
+
+
+def compute_gravity_batch(geo_model: "gempy.data.GeoModel", densities: np.ndarray) -> np.ndarray:
+    """
+    Computes the gravity of a computed model for many density vectors at once.
+
+    The geometry is not recomputed: the gravity of each density vector is the product of `gravity_density_operator`
+    with it, so evaluating a whole batch of densities, e.g. in a density inversion, costs a single matrix product.
+    The values are the same as `Solutions.gravity` for each of the density vectors.
+
+    Args:
+        geo_model (GeoModel): Model computed with the centered grid active and a `geophysics_input`.
+        densities (np.ndarray): Density of each unit, of shape (n_units,) or (n_batch, n_units), in the order of the
+            ids of the lithology block.
+
+    Returns:
+        np.ndarray: Gravity at the devices, of shape (n_devices,) or (n_batch, n_devices).
+    """
+    operator = gravity_density_operator(geo_model)
+    densities = np.asarray(BackendTensor.t.to_numpy(densities), dtype=operator.dtype)
+    if densities.shape[-1] < operator.shape[1]:
+        raise ValueError(f"densities must have at least one value per unit ({operator.shape[1]}). Received {densities.shape[-1]}")
+
+    return densities[..., :operator.shape[1]] @ operator.T
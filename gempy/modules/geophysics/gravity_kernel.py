@@ -0,0 +1,69 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from gempy_engine.core.data.centered_grid import CenteredGrid
+from gempy_engine.modules.geophysics import gravity_gradient
+
+from ...core.data.core_utils import fingerprint
+from ...core.data.gravity_kernel_cache import GravityKernelCache, default_gravity_kernel_cache
+from ...core.data.precision import get_float_dtype
+
+
+class CachedCenteredGrid(CenteredGrid):
+    """
+    `CenteredGrid` whose voxel stencil is shared through the default `GravityKernelCache`.
+
+    The stencil is only built once per resolution and radius, and `values` places it around every device by
+    broadcasting instead of stacking one copy per device.
+    """
+
+    def update_kernels(self, grid_resolution, scaling_factor, base_spacing=0.01, z_axis_shift=0.05, z_axis_scale=1.2) -> None:
+        key = fingerprint("stencil", *_kernel_parameters(grid_resolution, scaling_factor), base_spacing, z_axis_shift, z_axis_scale)
+        stencil = default_gravity_kernel_cache.get(key)
+        if stencil is None:
+            stencil = default_gravity_kernel_cache.put(key, np.stack(self.create_irregular_grid_kernel(
+                grid_resolution=grid_resolution,
+                scaling_factor=scaling_factor,
+                base_spacing=base_spacing,
+                z_axis_shift=z_axis_shift,
+                z_axis_scale=z_axis_scale
+            )))
+        self.kernel_grid_centers, self.left_voxel_edges, self.right_voxel_edges = stencil
+
+    @property
+    def values(self) -> np.ndarray:
+        centers = np.atleast_2d(self.centers)
+        return (centers[:, np.newaxis, :] + self.kernel_grid_centers[np.newaxis]).reshape(-1, 3)
+
+
+def calculate_gravity_gradient(centered_grid: CenteredGrid, ugal: bool = True, cache: Optional[GravityKernelCache] = None) -> np.ndarray:
+    """
+    Computes the vertical gravity kernel (`tz`) of the voxels of a centered grid.
+
+    The kernel does not depend on the position of the devices, so it is cached by resolution, radius, units and
+    the active float precision (see `set_float_dtype`) and a single kernel serves every device of the survey.
+
+    Args:
+        centered_grid (CenteredGrid): Centered grid whose kernel is computed. Its kernel must have been built with
+            the default spacing of `CenteredGrid`.
+        ugal (bool): If True, the kernel is in µGal. Otherwise it is in SI units.
+        cache (Optional[GravityKernelCache]): Cache to use. Defaults to the cache shared by the whole process.
+
+    Returns:
+        np.ndarray: Read-only kernel with one value per voxel of the stencil.
+    """
+    if cache is None:
+        cache = default_gravity_kernel_cache
+
+    dtype = get_float_dtype()
+    key = fingerprint("tz", *_kernel_parameters(centered_grid.resolution, centered_grid.radius), ugal, dtype.name)
+    tz = cache.get(key)
+    if tz is None:
+        tz = cache.put(key, gravity_gradient.calculate_gravity_gradient(centered_grid, ugal=ugal).astype(dtype))
+    return tz
+
+
+def _kernel_parameters(resolution: Sequence[float], radius: Union[float, Sequence[float]]) -> tuple[np.ndarray, np.ndarray]:
+    # * A scalar radius is the same as the same radius on every axis
+    return np.asarray(resolution, dtype="float64"), np.broadcast_to(np.asarray(radius, dtype="float64"), (3,)).copy()
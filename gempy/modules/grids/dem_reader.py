@@ -0,0 +1,247 @@
+import dataclasses
+import mmap
+import os
+from typing import Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+#: Extensions of the rasters read with `read_dem_window`. Binary rasters need an ESRI `.hdr` file next to them.
+DEM_EXTENSIONS = ('.asc', '.npy', '.bil', '.flt', '.bin', '.raw')
+
+_PIXEL_TYPES = {'signedint': 'i', 'unsignedint': 'u', 'float': 'f'}
+
+
+@dataclasses.dataclass
+class _Raster:
+    """A single band raster whose row 0 is the northernmost one."""
+    n_rows: int
+    n_cols: int
+    x_left: float  #: X of the western edge of the raster
+    y_top: float  #: Y of the northern edge of the raster
+    cell_x: float
+    cell_y: float
+    nodata: Optional[float] = None
+    data: Optional[np.ndarray] = None  #: Memory-mapped values. None for text rasters, which are read row by row
+    path: Optional[str] = None
+    data_offset: int = 0  #: Position of the first row in text rasters
+
+    def iter_rows(self, row_start: int, row_stop: int, col_start: int, col_stop: int, block_rows: int) -> Iterator[np.ndarray]:
+        """Yields the window in blocks of `block_rows` rows, as float64 with nodata as NaN."""
+        if self.data is not None:
+            for start in range(row_start, row_stop, block_rows):
+                yield self._mask_nodata(np.array(self.data[start:min(start + block_rows, row_stop), col_start:col_stop], dtype='float64'))
+            return
+
+        block = []
+        for row in self._iter_text_rows(row_start, row_stop):
+            block.append(row[col_start:col_stop])
+            if len(block) == block_rows:
+                yield self._mask_nodata(np.stack(block))
+                block = []
+        if block:
+            yield self._mask_nodata(np.stack(block))
+
+    def _iter_text_rows(self, row_start: int, row_stop: int) -> Iterator[np.ndarray]:
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as text:
+            text.seek(self.data_offset)
+            for row in range(row_stop):
+                line = text.readline()
+                if row < row_start:  # * Rows before the window are skipped without parsing them
+                    continue
+                values = np.array(line.split(), dtype='float64')
+                if values.shape[0] != self.n_cols:
+                    raise ValueError(f"Row {row} of {self.path} has {values.shape[0]} values instead of {self.n_cols}. "
+                                     f"Only rasters with one row per line are supported.")
+                yield values
+
+    def _mask_nodata(self, block: np.ndarray) -> np.ndarray:
+        if self.nodata is not None:
+            block[block == self.nodata] = np.nan
+        return block
+
+
+def read_dem_window(path: Union[str, os.PathLike], extent: Sequence[float], resolution: Optional[Sequence[int]] = None,
+                    raster_extent: Optional[Sequence[float]] = None, nodata: Optional[float] = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reads the part of a DEM that intersects `extent`, optionally downsampled, without loading the whole raster.
+
+    Supported formats are ESRI ASCII grids (`.asc`), `.npy` arrays and raw binary rasters (`.bil`, `.flt`, `.bin`,
+    `.raw`) described by an ESRI `.hdr` file with the same name. Binary rasters are memory-mapped and ASCII grids are
+    scanned line by line, so only the rows of the window are parsed. When downsampling, every output cell is the mean
+    of the block of raster cells it covers, ignoring nodata cells, and it is computed while the window is read.
+
+    Args:
+        path (Union[str, os.PathLike]): Path of the raster.
+        extent (Sequence[float]): [x_min, x_max, y_min, y_max] of the window. Further values (e.g. the Z extent of a
+            grid) are ignored.
+        resolution (Optional[Sequence[int]]): Maximum number of cells of the result along X and Y. If None, the
+            window is returned at the resolution of the raster.
+        raster_extent (Optional[Sequence[float]]): [x_min, x_max, y_min, y_max] of the outer edges of the raster.
+            Required for `.npy` files, whose row 0 must be the northernmost one. Ignored for the other formats.
+        nodata (Optional[float]): Value of the cells without data. Overrides the value in the header, if any.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: X coordinates (n,), Y coordinates (m,), both increasing, and the
+        heights (n, m) of the cell centers. Cells without data are NaN.
+    """
+    raster = _open_raster(os.fspath(path), raster_extent)
+    if nodata is not None:
+        raster.nodata = nodata
+
+    x_min, x_max, y_min, y_max = np.asarray(extent, dtype='float64')[:4]
+    col_start, col_stop = _window(x_min - raster.x_left, x_max - raster.x_left, raster.cell_x, raster.n_cols)
+    row_start, row_stop = _window(raster.y_top - y_max, raster.y_top - y_min, raster.cell_y, raster.n_rows)
+    if col_start >= col_stop or row_start >= row_stop:
+        raise ValueError(f"The extent {list(extent)} does not intersect the raster {path}.")
+
+    n_cols, n_rows = col_stop - col_start, row_stop - row_start
+    if resolution is None:
+        step_x = step_y = 1
+    else:
+        step_x, step_y = -(-n_cols // int(resolution[0])), -(-n_rows // int(resolution[1]))  # * Rounded up, so the result is never larger
+
+    n_out_cols = -(-n_cols // step_x)
+    padded_cols = n_out_cols * step_x
+    heights = []
+    for block in raster.iter_rows(row_start, row_stop, col_start, col_stop, block_rows=step_y):
+        if padded_cols > n_cols:
+            block = np.pad(block, ((0, 0), (0, padded_cols - n_cols)), constant_values=np.nan)
+        block = block.reshape(block.shape[0], n_out_cols, step_x)
+        valid = ~np.isnan(block)
+        count = valid.sum(axis=(0, 2))
+        total = np.where(valid, block, 0).sum(axis=(0, 2))
+        heights.append(np.divide(total, count, out=np.full(n_out_cols, np.nan), where=count > 0))
+
+    col_centers = raster.x_left + (np.arange(col_start, col_stop) + .5) * raster.cell_x
+    row_centers = raster.y_top - (np.arange(row_start, row_stop) + .5) * raster.cell_y
+    x = _block_means(col_centers, step_x)
+    y = _block_means(row_centers, step_y)
+
+    # * Rasters go from north to south; the topography from west to east along X and from south to north along Y
+    return x, y[::-1], np.stack(heights).T[:, ::-1]
+
+
+def is_georeferenced_dem(path: Union[str, os.PathLike]) -> bool:
+    """Returns True for the rasters `read_dem_window` can place without a `raster_extent`: ESRI ASCII grids and binary rasters with a `.hdr` file."""
+    path = os.fspath(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.asc':
+        return True
+    return extension in ('.bil', '.flt', '.bin', '.raw') and os.path.exists(os.path.splitext(path)[0] + '.hdr')
+
+
+def _window(start: float, stop: float, cell_size: float, n_cells: int) -> tuple[int, int]:
+    """Returns the range of cells that overlap [start, stop], measured from the first edge of the raster."""
+    first = int(np.clip(np.floor(start / cell_size), 0, n_cells))
+    last = int(np.clip(np.ceil(stop / cell_size), 0, n_cells))
+    return first, last
+
+
+def _block_means(values: np.ndarray, step: int) -> np.ndarray:
+    n_blocks = -(-values.shape[0] // step)
+    sums = np.add.reduceat(values, np.arange(n_blocks) * step)
+    counts = np.diff(np.append(np.arange(n_blocks) * step, values.shape[0]))
+    return sums / counts
+
+
+def _open_raster(path: str, raster_extent: Optional[Sequence[float]]) -> _Raster:
+    extension = os.path.splitext(path)[1].lower()
+    match extension:
+        case '.asc':
+            return _open_ascii_grid(path)
+        case '.npy':
+            return _open_npy(path, raster_extent)
+        case '.bil' | '.flt' | '.bin' | '.raw':
+            return _open_binary(path)
+        case _:
+            raise ValueError(f"Unsupported raster format {extension}. Supported formats are {DEM_EXTENSIONS}.")
+
+
+def _open_ascii_grid(path: str) -> _Raster:
+    header = {}
+    with open(path, 'rb') as f:
+        while True:
+            position = f.tell()
+            line = f.readline()
+            key = line.split(maxsplit=1)[0].decode().lower() if line.strip() else ''
+            if not key or not key[0].isalpha():  # * The first row of values
+                break
+            header[key] = float(line.split()[1])
+
+    raster = _raster_from_header(header)
+    raster.path = path
+    raster.data_offset = position
+    return raster
+
+
+def _open_npy(path: str, raster_extent: Optional[Sequence[float]]) -> _Raster:
+    if raster_extent is None:
+        raise ValueError(".npy rasters have no georeference. raster_extent must be given.")
+
+    data = np.load(path, mmap_mode='r')
+    if data.ndim != 2:
+        raise ValueError(f"The raster must be 2D. Received an array of shape {data.shape}")
+
+    x_min, x_max, y_min, y_max = np.asarray(raster_extent, dtype='float64')[:4]
+    n_rows, n_cols = data.shape
+    return _Raster(
+        n_rows=n_rows,
+        n_cols=n_cols,
+        x_left=x_min,
+        y_top=y_max,
+        cell_x=(x_max - x_min) / n_cols,
+        cell_y=(y_max - y_min) / n_rows,
+        data=data
+    )
+
+
+def _open_binary(path: str) -> _Raster:
+    header_path = os.path.splitext(path)[0] + '.hdr'
+    if not os.path.exists(header_path):
+        raise ValueError(f"Binary rasters need a header file. {header_path} does not exist.")
+
+    header = {}
+    with open(header_path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) >= 2:
+                header[fields[0].lower()] = fields[1].lower()
+
+    if int(header.get('nbands', 1)) != 1:
+        raise ValueError("Only single band rasters are supported.")
+
+    byte_order = '>' if header.get('byteorder', 'i') in ('m', 'msbfirst') else '<'
+    if 'pixeltype' in header or 'nbits' in header:
+        kind = _PIXEL_TYPES.get(header.get('pixeltype', 'signedint'), 'i')
+        dtype = np.dtype(f"{byte_order}{kind}{int(header.get('nbits', 8)) // 8}")
+    else:  # * ESRI float grids
+        dtype = np.dtype(f"{byte_order}f4")
+
+    raster = _raster_from_header({key: float(value) for key, value in header.items() if _is_number(value)})
+    raster.data = np.memmap(path, dtype=dtype, mode='r', offset=int(header.get('skipbytes', 0)), shape=(raster.n_rows, raster.n_cols))
+    return raster
+
+
+def _raster_from_header(header: dict) -> _Raster:
+    n_rows, n_cols = int(header['nrows']), int(header['ncols'])
+    if 'ulxmap' in header:  # * BIL headers give the center of the upper left cell
+        cell_x, cell_y = header['xdim'], header['ydim']
+        x_left, y_top = header['ulxmap'] - cell_x / 2, header['ulymap'] + cell_y / 2
+    else:
+        cell_x = cell_y = header['cellsize']
+        if 'xllcenter' in header:
+            x_left, y_bottom = header['xllcenter'] - cell_x / 2, header['yllcenter'] - cell_y / 2
+        else:
+            x_left, y_bottom = header['xllcorner'], header['yllcorner']
+        y_top = y_bottom + n_rows * cell_y
+
+    nodata = header.get('nodata_value', header.get('nodata'))
+    return _Raster(n_rows=n_rows, n_cols=n_cols, x_left=x_left, y_top=y_top, cell_x=cell_x, cell_y=cell_y, nodata=nodata)
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,61 @@
+import numpy as np
+
+from gempy_engine.core.backend_tensor import BackendTensor
+from gempy_engine.core.data.engine_grid import EngineGrid
+from gempy_engine.core.data.octree_level import OctreeLevel
+from gempy_engine.core.data.regular_grid import RegularGrid as EngineRegularGrid
+from gempy_engine.core.data.transforms import Transform
+from ...core.data.grid_modules import OctreeROI
+
+
+def restrict_next_octree_grid(next_grid: EngineGrid, prev_octree: OctreeLevel, current_octree_level: int,
+                              rois: tuple[OctreeROI, ...], levels_outside_rois: int, input_transform: Transform) -> EngineGrid:
+    """
+    Removes the voxels outside the regions of interest from the next octree level computed by the engine.
+
+    A voxel of octree level `i` is only split if a region it overlaps (or the rest of the extent, for voxels outside
+    every region) has more than `i + 1` levels. The engine splits every selected voxel into 8 consecutive voxels, so
+    the children of the voxels that may not be split are dropped from `next_grid`.
+
+    Args:
+        next_grid (EngineGrid): Grid of the next octree level, as returned by the engine `get_next_octree_grid`.
+        prev_octree (OctreeLevel): Octree level `next_grid` was computed from.
+        current_octree_level (int): Index of `prev_octree`.
+        rois (tuple[OctreeROI, ...]): Regions of interest in model coordinates.
+        levels_outside_rois (int): Number of octree levels outside the regions of interest.
+        input_transform (Transform): Transform from model coordinates to the coordinates of the engine.
+
+    Returns:
+        EngineGrid: Grid of the next octree level with only the voxels inside the regions of interest.
+    """
+    octree_grid = prev_octree.grid_centers.octree_grid
+    allowed = refinement_allowed(rois, levels_outside_rois, input_transform, BackendTensor.t.to_numpy(octree_grid.values),
+                                 prev_octree.dxdydz, current_octree_level)
+    if allowed.all():
+        return next_grid
+
+    voxel_select = np.asarray(BackendTensor.t.to_numpy(next_grid.octree_grid.active_cells), dtype=bool)
+    children = BackendTensor.t.array(np.repeat(allowed[voxel_select], 8))
+    return EngineGrid(
+        octree_grid=EngineRegularGrid.from_octree_level(
+            xyz_coords_octree=next_grid.octree_grid.values[children],
+            previous_regular_grid=octree_grid,
+            active_cells=BackendTensor.t.array(voxel_select & allowed),
+            left_right=next_grid.octree_grid.left_right[children]
+        ),
+    )
+
+
+def refinement_allowed(rois: tuple[OctreeROI, ...], levels_outside_rois: int, input_transform: Transform,
+                       centers: np.ndarray, dxdydz, current_octree_level: int) -> np.ndarray:
+    """Returns which voxels of the level, given by their centers in engine coordinates, may be split."""
+    allowed = np.full(centers.shape[0], current_octree_level + 1 < levels_outside_rois)
+    rois = [roi for roi in rois if current_octree_level + 1 < roi.max_level]
+    if allowed.all() or not rois:
+        return allowed
+
+    centers = input_transform.apply_inverse(centers)
+    half_size = np.abs(np.asarray(dxdydz, dtype=float) / 2 / input_transform.scale)  # * Exact without rotation
+    for roi in rois:
+        allowed |= roi.intersects(centers, half_size)
+    return allowed
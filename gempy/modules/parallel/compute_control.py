@@ -0,0 +1,70 @@
+import asyncio
+import contextlib
+import contextvars
+import threading
+import weakref
+from typing import Optional
+
+_active_cancel_event: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar("active_cancel_event", default=None)
+
+_model_locks_lock = threading.Lock()
+_model_locks: dict[int, threading.RLock] = {}
+
+_engine_lock = threading.RLock()
+
+
+def model_lock(geo_model) -> threading.RLock:
+    """
+    Returns the lock that serializes the computations of a `GeoModel`.
+
+    Computing a model writes `taped_interpolation_input`, `solutions` and the cached engine input of the model, so two
+    computations of the same model must not overlap. The lock is reentrant and lives as long as the model.
+    """
+    key = id(geo_model)
+    with _model_locks_lock:
+        lock = _model_locks.get(key)
+        if lock is None:
+            lock = _model_locks[key] = threading.RLock()
+            weakref.finalize(geo_model, _model_locks.pop, key, None)
+    return lock
+
+
+def engine_lock() -> threading.RLock:
+    """
+    Returns the lock that serializes the use of the engine backend in this process.
+
+    `BackendTensor.change_backend_gempy` changes the backend, dtype and gradient settings of the whole process, so a
+    computation holds this lock from the moment it switches the backend until the engine returns. Computations in
+    different threads therefore run one after another, even for different models. When both locks are needed, the
+    model lock is taken first.
+    """
+    return _engine_lock
+
+
+@contextlib.contextmanager
+def cancellation_scope(cancel_event: threading.Event):
+    """
+    Context manager that makes the computations in it stop between octree levels (or query chunks) once
+    `cancel_event` is set, raising `asyncio.CancelledError`.
+
+    The checks are the calls to `raise_if_cancelled` of GemPy, so `compute_model` runs the octree levels itself
+    (see `compute_model_progressively`) inside a scope.
+    """
+    token = _active_cancel_event.set(cancel_event)
+    try:
+        raise_if_cancelled()
+        yield
+    finally:
+        _active_cancel_event.reset(token)
+
+
+def in_cancellation_scope() -> bool:
+    """Returns True inside a `cancellation_scope`."""
+    return _active_cancel_event.get() is not None
+
+
+def raise_if_cancelled():
+    """Raises `asyncio.CancelledError` if the computation of the active cancellation scope was cancelled."""
+    cancel_event: Optional[threading.Event] = _active_cancel_event.get()
+    if cancel_event is not None and cancel_event.is_set():
+        raise asyncio.CancelledError("Computation cancelled")
@@ -0,0 +1,311 @@
+import concurrent.futures
+import copy
+import dataclasses
+import multiprocessing
+import threading
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from gempy_engine.API.interp_single import _multi_scalar_field_manager
+from gempy_engine.config import AvailableBackends, NOT_MAKE_INPUT_DEEP_COPY
+from gempy_engine.core.backend_tensor import BackendTensor
+from gempy_engine.core.data.engine_grid import EngineGrid
+from gempy_engine.core.data.input_data_descriptor import InputDataDescriptor
+from gempy_engine.core.data.interp_output import InterpOutput
+from gempy_engine.core.data.interpolation_functions import CustomInterpolationFunctions
+from gempy_engine.core.data.interpolation_input import InterpolationInput
+from gempy_engine.core.data.kernel_classes.faults import FaultsData
+from gempy_engine.core.data.options import InterpolationOptions
+from gempy_engine.core.data.scalar_field_output import ScalarFieldOutput
+from gempy_engine.core.data.stack_relation_type import StackRelationType
+from gempy_engine.core.data import TensorsStructure
+from gempy_engine.modules.weights_cache.weights_cache_interface import WeightCache
+
+_executor_lock = threading.Lock()
+_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_executor_key: Optional[tuple] = None
+
+
+def interpolate_all_fields_in_parallel(interpolation_input: InterpolationInput, options: InterpolationOptions,
+                                       data_descriptor: InputDataDescriptor, max_workers: Optional[int] = None) -> list[InterpOutput]:
+    """
+    Same as the engine `interpolate_all_fields`, but the structural groups are solved and evaluated in a process pool.
+
+    Groups only depend on the faults that offset them, so every group whose faults are already evaluated is sent to
+    the pool at once. Without faults all the groups run concurrently. The grid and the fault values are shared with
+    the workers through shared memory, the scalar fields come back to this process and are combined as usual
+    according to the structural relations. The kriging weights of the engine weights cache are exchanged with the
+    workers, so the cache keeps working across processes.
+
+    It is used by `compute_model` and the point queries when `GemPyEngineConfig.parallel_groups` is set. Only the
+    numpy backend is supported, because the gradient tape of PyTorch cannot cross process boundaries.
+
+    Args:
+        interpolation_input (InterpolationInput): Input of the engine, with the grid to evaluate.
+        options (InterpolationOptions): Interpolation options.
+        data_descriptor (InputDataDescriptor): Descriptor of the input data.
+        max_workers (Optional[int]): Number of worker processes. Defaults to None, which uses the number of CPUs.
+
+    Returns:
+        list[InterpOutput]: The output of every structural group.
+
+    Raises:
+        ValueError: If the engine backend is not numpy.
+    """
+    if BackendTensor.engine_backend is not AvailableBackends.numpy:
+        raise ValueError(f"Parallel structural groups are only supported with the numpy backend. Current backend: {BackendTensor.engine_backend}")
+    if data_descriptor.stack_structure.n_stacks < 2:
+        return _multi_scalar_field_manager.interpolate_all_fields(interpolation_input, options, data_descriptor)
+
+    all_scalar_fields_outputs = _interpolate_stack_in_parallel(data_descriptor, interpolation_input, options, max_workers or multiprocessing.cpu_count())
+    return combine_group_outputs(all_scalar_fields_outputs, options, data_descriptor)
+
+
+def combine_group_outputs(all_scalar_fields_outputs: list[ScalarFieldOutput], options: InterpolationOptions,
+                          data_descriptor: InputDataDescriptor) -> list[InterpOutput]:
+    """Combines the scalar fields of the structural groups according to their relations, as the engine `interpolate_all_fields` does."""
+    combined_scalar_output = _multi_scalar_field_manager._combine_scalar_fields(
+        all_scalar_fields_outputs=all_scalar_fields_outputs,
+        lithology_mask=_multi_scalar_field_manager._lithology_mask(all_scalar_fields_outputs, data_descriptor.stack_relation),
+        faults_mask=_multi_scalar_field_manager._faults_mask(all_scalar_fields_outputs, data_descriptor.stack_relation),
+        compute_scalar_grad=options.compute_scalar_gradient
+    )
+    return [InterpOutput(output, combined) for output, combined in zip(all_scalar_fields_outputs, combined_scalar_output)]
+
+
+def shutdown_parallel_groups_pool():
+    """Shuts the worker processes of the parallel groups down. The pool is created again when it is next needed."""
+    with _executor_lock:
+        _shutdown_executor()
+
+
+@dataclasses.dataclass
+class _GroupTask:
+    stack_number: int
+    tensor_structure: TensorsStructure
+    interpolation_input: InterpolationInput  #: Without grid. The workers rebuild it from the shared memory
+    active_faults_relations: np.ndarray
+    options: InterpolationOptions
+    grid_memory: tuple[str, tuple, str]  #: Name, shape and dtype of the shared grid values
+    stack_values_memory: tuple[str, tuple, str]  #: Name, shape and dtype of the shared values of every group, used for faults
+    cached_weights: Optional[dict] = None
+    external_interp_funct: Optional[CustomInterpolationFunctions] = None  #: Only set for groups evaluated in the calling process
+    external_segment_funct: Optional[callable] = None
+
+
+def _interpolate_stack_in_parallel(root_data_descriptor: InputDataDescriptor, root_interpolation_input: InterpolationInput,
+                                   options: InterpolationOptions, max_workers: int) -> list[ScalarFieldOutput]:
+    """Same as the engine `_interpolate_stack`, running independent groups concurrently."""
+    stack_structure = root_data_descriptor.stack_structure
+    grid_values = BackendTensor.t.to_numpy(root_interpolation_input.grid.values)
+    stack_values_shape = (stack_structure.n_stacks, grid_values.shape[0] + root_interpolation_input.surface_points.n_points)
+    grid_memory = _SharedArray(grid_values.shape, grid_values.dtype)
+    stack_values_memory = _SharedArray(stack_values_shape, np.dtype(BackendTensor.dtype_obj))
+    try:
+        grid_memory.array[:] = grid_values
+        stack_values_memory.array[:] = 0
+
+        tasks: list[_GroupTask] = []
+        dependencies: list[set[int]] = []
+        for i in range(stack_structure.n_stacks):
+            stack_structure.stack_number = i
+            interpolation_input_i = InterpolationInput.from_interpolation_input_subset(
+                all_interpolation_input=root_interpolation_input,
+                stack_structure=stack_structure
+            )
+            active_faults_relations = np.asarray(stack_structure.active_faults_relations, dtype=bool)
+            dependencies.append(set(np.flatnonzero(active_faults_relations).tolist()))
+
+            interpolation_input_i.set_temp_grid(None)
+            interpolation_input_i._original_grid = None
+            if interpolation_input_i._fault_values is not None:  # * Only the user given fault data. The values are shared
+                interpolation_input_i.fault_values = dataclasses.replace(
+                    interpolation_input_i._fault_values,
+                    fault_values_everywhere=None,
+                    fault_values_on_sp=None
+                )
+            tasks.append(_GroupTask(
+                stack_number=i,
+                tensor_structure=TensorsStructure.from_tensor_structure_subset(root_data_descriptor, i),
+                interpolation_input=interpolation_input_i,
+                active_faults_relations=active_faults_relations,
+                options=options,
+                grid_memory=grid_memory.descriptor,
+                stack_values_memory=stack_values_memory.descriptor
+            ))
+
+        # * Custom implicit functions are cheap and may not be picklable, so they are evaluated in this process
+        local_stacks = set()
+        for functions in (stack_structure.interp_functions_per_stack, stack_structure.segmentation_functions_per_stack):
+            local_stacks |= {i for i, function in enumerate(functions or []) if function is not None}
+        outputs = _run_tasks(tasks, dependencies, local_stacks, stack_structure, max_workers)
+    finally:
+        grid_memory.release()
+        stack_values_memory.release()
+
+    engine_copies_input = BackendTensor.engine_backend is not AvailableBackends.PYTORCH and NOT_MAKE_INPUT_DEEP_COPY is False
+    for output in outputs:
+        output.grid = copy.deepcopy(root_interpolation_input.grid) if engine_copies_input else root_interpolation_input.grid
+    return outputs
+
+
+def _run_tasks(tasks: list[_GroupTask], dependencies: list[set[int]], local_stacks: set[int], stack_structure,
+               max_workers: int) -> list[ScalarFieldOutput]:
+    executor = worker_pool(max_workers)
+    outputs: list[Optional[ScalarFieldOutput]] = [None] * len(tasks)
+    submitted: set[int] = set()
+    done: set[int] = set()
+    running: dict[concurrent.futures.Future, int] = {}
+
+    try:
+        while len(done) < len(tasks):
+            for i, task in enumerate(tasks):
+                if i in submitted or not dependencies[i] <= done:
+                    continue
+                submitted.add(i)
+                task.cached_weights = WeightCache.memory_cache.get(_weights_key(task))
+                if i in local_stacks:
+                    stack_structure.stack_number = i
+                    task.external_interp_funct = stack_structure.interp_function
+                    task.external_segment_funct = stack_structure.segmentation_function
+                    future = concurrent.futures.Future()
+                    future.set_result(_interpolate_group(task))
+                else:
+                    future = executor.submit(_interpolate_group, task)
+                running[future] = i
+
+            finished, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                i = running.pop(future)
+                outputs[i], weights_entry = future.result()
+                if weights_entry is not None and tasks[i].options.cache_mode is not InterpolationOptions.CacheMode.NO_CACHE:
+                    WeightCache.memory_cache[_weights_key(tasks[i])] = weights_entry
+                done.add(i)
+    finally:
+        for future in running:
+            future.cancel()
+        concurrent.futures.wait(running)  # * Workers must not touch the shared memory after it is released
+
+    return outputs
+
+
+def _interpolate_group(task: _GroupTask) -> tuple[ScalarFieldOutput, Optional[dict]]:
+    """Solves and evaluates one structural group. Runs in the worker processes."""
+    from gempy_engine.API.interp_single._interp_single_feature import input_preprocess, interpolate_feature
+
+    weights_key = _weights_key(task)
+    if task.cached_weights is None:
+        WeightCache.memory_cache.pop(weights_key, None)
+    else:
+        WeightCache.memory_cache[weights_key] = task.cached_weights
+
+    interpolation_input = task.interpolation_input
+    grid_memory = _SharedArray.attach(*task.grid_memory)
+    stack_values_memory = _SharedArray.attach(*task.stack_values_memory)
+    try:
+        grid = EngineGrid.from_xyz_coords(grid_memory.array)
+        interpolation_input.set_temp_grid(grid)
+        interpolation_input._original_grid = grid
+        del grid
+
+        # * Same as `_grab_stack_fault_data` of the engine
+        fault_input: FaultsData = interpolation_input.fault_values or FaultsData()
+        fault_input.fault_values_everywhere = stack_values_memory.array[task.active_faults_relations]
+        fv_on_all_sp = fault_input.fault_values_everywhere[:, grid_memory.array.shape[0]:]
+        fault_input.fault_values_on_sp = fv_on_all_sp[:, interpolation_input.slice_feature]
+        interpolation_input.fault_values = fault_input
+
+        solver_input = input_preprocess(task.tensor_structure, interpolation_input)
+        output: ScalarFieldOutput = interpolate_feature(
+            interpolation_input=interpolation_input,
+            options=task.options,
+            data_shape=task.tensor_structure,
+            solver_input=solver_input,
+            external_interp_funct=task.external_interp_funct,
+            external_segment_funct=task.external_segment_funct,
+            stack_number=task.stack_number
+        )
+
+        if interpolation_input.stack_relation is StackRelationType.FAULT:
+            stack_values_memory.array[task.stack_number, :] = _multi_scalar_field_manager._modify_faults_values_output(
+                fault_input=fault_input,
+                values_on_all_xyz=output.values_on_all_xyz,
+                xyz_to_interpolate=solver_input.xyz_to_interpolate
+            )
+
+        output.grid = None  # * The caller puts its own grid back. This one is a view of the shared memory
+        return output, WeightCache.memory_cache.get(weights_key)
+    finally:
+        # * The shared memory can only be closed once nothing points to it
+        interpolation_input.set_temp_grid(None)
+        interpolation_input._original_grid = None
+        grid_memory.release()
+        stack_values_memory.release()
+
+
+def _weights_key(task: _GroupTask) -> str:
+    return f"{task.options.cache_model_name}.{task.stack_number}"
+
+
+class _SharedArray:
+    """Numpy array backed by a `SharedMemory` block. The process that creates it also unlinks it."""
+
+    def __init__(self, shape: tuple, dtype: np.dtype, name: Optional[str] = None):
+        self._owner = name is None
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        self._memory = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._memory.buf)
+
+    @classmethod
+    def attach(cls, name: str, shape: tuple, dtype: str) -> "_SharedArray":
+        return cls(shape, np.dtype(dtype), name=name)
+
+    @property
+    def descriptor(self) -> tuple[str, tuple, str]:
+        return self._memory.name, self.array.shape, self.array.dtype.str
+
+    def release(self):
+        self.array = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+# region Pool
+def worker_pool(max_workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Returns the pool of worker processes of the parallel computations, running the numpy backend with the current dtype.
+
+    The pool is kept between calls and only created again when `max_workers` or the dtype change.
+    """
+    global _executor, _executor_key
+    key = (max_workers, BackendTensor.dtype)
+    with _executor_lock:  # * Checking the key and replacing the pool must not interleave with other threads
+        if _executor is not None and _executor_key == key:
+            return _executor
+        _shutdown_executor()
+        _executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),  # * Forking a process with BLAS threads is not safe
+            initializer=_initialize_worker,
+            initargs=(BackendTensor.dtype,)
+        )
+        _executor_key = key
+        return _executor
+
+
+def _shutdown_executor():
+    """Must be called with `_executor_lock` held."""
+    global _executor, _executor_key
+    if _executor is not None:
+        _executor.shutdown()
+    _executor, _executor_key = None, None
+
+
+def _initialize_worker(dtype: Optional[str]):
+    BackendTensor.change_backend_gempy(engine_backend=AvailableBackends.numpy, use_gpu=False, dtype=dtype)
+
+# endregion
+
@@ -0,0 +1,86 @@
+import contextlib
+import contextvars
+import time
+import tracemalloc
+from typing import Optional
+
+from ...core.data.compute_profile import ComputeProfile, ProfileStage
+
+_active_profiler: contextvars.ContextVar[Optional["ComputeProfiler"]] = contextvars.ContextVar("active_profiler", default=None)
+
+
+class ComputeProfiler:
+    """
+    Records the time and peak memory of the stages of a computation into a `ComputeProfile`.
+
+    Only the stages run by GemPy are recorded, i.e. the ones wrapped in `profile_stage`: input building, the
+    transforms of the input, the solutions post-processing and, inside "engine", every octree level, the solve and
+    evaluation of every structural group, the gravity and the meshing. The octree levels of profiled `compute_model`
+    calls are run by GemPy (see `compute_model_progressively`), which is what makes the inner stages visible. Memory
+    is traced with `tracemalloc`, which slows the computation down noticeably, so it can be switched off with
+    `trace_memory`.
+
+    Examples:
+        >>> with ComputeProfiler() as profiler:
+        ...     gp.compute_model(geo_model)
+        >>> print(profiler.report)
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.report = ComputeProfile()
+        self._origin: float = 0.
+        self._open_stages: list[dict] = []
+        self._token: Optional[contextvars.Token] = None
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "ComputeProfiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._origin = time.perf_counter()
+        self._token = _active_profiler.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _active_profiler.reset(self._token)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **args):
+        """Context manager that records the enclosed code as a stage of the report."""
+        stage = ProfileStage(name=name, start=time.perf_counter() - self._origin, duration=0., peak_memory=None,
+                             depth=len(self._open_stages), args=args)
+        self.report.stages.append(stage)
+
+        frame = {"start_memory": 0, "peak": 0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open_stages:  # * Keep the peak of the parent before resetting it
+                self._open_stages[-1]["peak"] = max(self._open_stages[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+            frame = {"start_memory": current, "peak": current}
+
+        self._open_stages.append(frame)
+        try:
+            yield stage
+        finally:
+            self._open_stages.pop()
+            stage.duration = time.perf_counter() - self._origin - stage.start
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(frame["peak"], peak)
+                stage.peak_memory = peak - frame["start_memory"]
+                if self._open_stages:
+                    self._open_stages[-1]["peak"] = max(self._open_stages[-1]["peak"], peak)
+
+
+def profile_stage(name: str, **args):
+    """Records the enclosed code as a stage of the active profiler. Does nothing if no profiler is active."""
+    profiler: Optional[ComputeProfiler] = _active_profiler.get()
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.stage(name, **args)
+
@@ -0,0 +1,23 @@
+import os
+import sys
+from typing import Optional
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Returns the peak resident memory of the process since it started in MB, or None where it is not available."""
+    try:
+        import resource
+    except ImportError:  # * Not available on Windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 1024 ** 2 if sys.platform == "darwin" else max_rss / 1024  # * Bytes on macOS, kilobytes on Linux
+
+
+def current_rss_mb() -> Optional[float]:
+    """Returns the resident memory of the process right now in MB, or None where it is not available."""
+    try:
+        with open("/proc/self/statm") as f:  # * Linux only. Sizes are in pages
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
@@ -0,0 +1,68 @@
+from gempy_engine.API.interp_single import _multi_scalar_field_manager
+from gempy_engine.API.interp_single._interp_single_feature import input_preprocess, interpolate_feature
+from gempy_engine.core.backend_tensor import BackendTensor
+from gempy_engine.core.data import TensorsStructure
+from gempy_engine.core.data.input_data_descriptor import InputDataDescriptor
+from gempy_engine.core.data.interp_output import InterpOutput
+from gempy_engine.core.data.interpolation_input import InterpolationInput
+from gempy_engine.core.data.kernel_classes.faults import FaultsData
+from gempy_engine.core.data.options import InterpolationOptions
+from gempy_engine.core.data.scalar_field_output import ScalarFieldOutput
+from gempy_engine.core.data.stack_relation_type import StackRelationType
+
+from .compute_profiler import profile_stage
+from ..parallel.parallel_groups import combine_group_outputs
+
+
+def interpolate_all_fields_by_group(interpolation_input: InterpolationInput, options: InterpolationOptions,
+                                    data_descriptor: InputDataDescriptor) -> list[InterpOutput]:
+    """
+    Same as the engine `interpolate_all_fields`, with the solve and evaluation of every structural group recorded as
+    a "structural group" stage of the active profiler.
+
+    It is used by `compute_model` when `GemPyEngineConfig.profiling` is set. The stages have the index of the group
+    and the octree level being evaluated as `group` and `level`.
+    """
+    stack_structure = data_descriptor.stack_structure
+    level = options.temp_interpolation_values.current_octree_level
+
+    all_scalar_fields_outputs: list[ScalarFieldOutput] = []
+    xyz_to_interpolate_size = interpolation_input.grid.len_all_grids + interpolation_input.surface_points.n_points
+    all_stack_values_block = BackendTensor.t.zeros((stack_structure.n_stacks, xyz_to_interpolate_size), dtype=BackendTensor.dtype_obj)  # * Used for faults
+
+    # * Same steps as the engine `_interpolate_stack`
+    for i in range(stack_structure.n_stacks):
+        with profile_stage("structural group", group=i, level=level):
+            stack_structure.stack_number = i
+            tensor_structure = TensorsStructure.from_tensor_structure_subset(data_descriptor, i)
+            interpolation_input_i = InterpolationInput.from_interpolation_input_subset(
+                all_interpolation_input=interpolation_input,
+                stack_structure=stack_structure
+            )
+
+            fault_input: FaultsData = interpolation_input_i.fault_values or FaultsData()
+            fault_input.fault_values_everywhere = all_stack_values_block[stack_structure.active_faults_relations]
+            fv_on_all_sp = fault_input.fault_values_everywhere[:, interpolation_input_i.grid.len_all_grids:]
+            fault_input.fault_values_on_sp = fv_on_all_sp[:, interpolation_input_i.slice_feature]
+            interpolation_input_i.fault_values = fault_input
+
+            solver_input = input_preprocess(tensor_structure, interpolation_input_i)
+            output: ScalarFieldOutput = interpolate_feature(
+                interpolation_input=interpolation_input_i,
+                options=options,
+                data_shape=tensor_structure,
+                solver_input=solver_input,
+                external_interp_funct=stack_structure.interp_function,
+                external_segment_funct=stack_structure.segmentation_function,
+                stack_number=i
+            )
+            all_scalar_fields_outputs.append(output)
+
+            if interpolation_input_i.stack_relation is StackRelationType.FAULT:
+                all_stack_values_block[i, :] = _multi_scalar_field_manager._modify_faults_values_output(
+                    fault_input=fault_input,
+                    values_on_all_xyz=output.values_on_all_xyz,
+                    xyz_to_interpolate=solver_input.xyz_to_interpolate
+                )
+
+    return combine_group_outputs(all_scalar_fields_outputs, options, data_descriptor)
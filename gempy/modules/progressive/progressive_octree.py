@@ -0,0 +1,171 @@
+import copy
+import time
+from typing import Optional, Callable
+
+from gempy_engine.config import AvailableBackends, NOT_MAKE_INPUT_DEEP_COPY
+from gempy_engine.core.backend_tensor import BackendTensor
+from gempy_engine.core.data import InterpolationOptions, Solutions
+from gempy_engine.core.data.engine_grid import EngineGrid
+from gempy_engine.core.data.geophysics_input import GeophysicsInput
+from gempy_engine.core.data.input_data_descriptor import InputDataDescriptor
+from gempy_engine.core.data.interp_output import InterpOutput
+from gempy_engine.core.data.interpolation_input import InterpolationInput
+from gempy_engine.core.data.octree_level import OctreeLevel
+
+from ..parallel.compute_control import raise_if_cancelled
+from ..profiling.compute_profiler import profile_stage
+from ..profiling.memory_usage import current_rss_mb
+
+
+def compute_model_progressively(interpolation_input: InterpolationInput, options: InterpolationOptions,
+                                data_descriptor: InputDataDescriptor, geophysics_input: Optional[GeophysicsInput] = None,
+                                time_budget: Optional[float] = None, memory_budget: Optional[float] = None,
+                                on_octree_level: Optional[Callable[[Solutions], None]] = None,
+                                interpolate_fields: Optional[Callable[[InterpolationInput, InterpolationOptions, InputDataDescriptor], list[InterpOutput]]] = None,
+                                refine_next_grid: Optional[Callable[[EngineGrid, OctreeLevel, int], EngineGrid]] = None) -> Solutions:
+    """
+    Same as `gempy_engine.compute_model`, but the octree is refined one level at a time.
+
+    Before every refinement the cost of the next level is estimated from the last one, scaled by the number of
+    voxels. If it would exceed a budget, the refinement stops and the solutions of the levels reached so far are
+    returned, including their meshes.
+
+    Every level, the gravity and the meshing are recorded as stages of the active profiler (see `profile_stage`).
+    Inside a `cancellation_scope`, the computation stops between levels once it is cancelled.
+
+    The octree levels are evaluated by GemPy itself, so the evaluation of the fields can be replaced with
+    `interpolate_fields`, e.g. by `interpolate_all_fields_in_parallel`, and the voxels of every next level can be
+    filtered with `refine_next_grid`. The meshes are always extracted by the engine.
+
+    Args:
+        interpolation_input (InterpolationInput): Input of the engine.
+        options (InterpolationOptions): Interpolation options.
+        data_descriptor (InputDataDescriptor): Descriptor of the input data.
+        geophysics_input (Optional[GeophysicsInput]): Geophysics input, if any.
+        time_budget (Optional[float]): Maximum wall time in seconds.
+        memory_budget (Optional[float]): Maximum resident memory of the process in MB. The memory a level adds is
+            measured as the change of the current resident memory, so memory freed by earlier computations is not
+            counted. Only supported on Linux.
+        on_octree_level (Optional[Callable[[Solutions], None]]): Called with the solutions of the levels computed so
+            far after every level but the last one.
+        interpolate_fields (Optional[Callable]): Function with the signature of the engine `interpolate_all_fields`
+            that evaluates the fields at the centers and corners of every level. Defaults to None, which uses the
+            engine one.
+        refine_next_grid (Optional[Callable[[EngineGrid, OctreeLevel, int], EngineGrid]]): Called with the grid of the
+            next level computed by the engine, the current level and its index. Returns the grid to evaluate, e.g.
+            `restrict_next_octree_grid`. Defaults to None, which keeps the grid of the engine.
+
+    Returns:
+        Solutions: The solutions of the levels reached.
+    """
+    from gempy_engine.API.model import model_api
+    from gempy_engine.API.interp_single import interp_features
+
+    if memory_budget is not None and current_rss_mb() is None:
+        raise ValueError("memory_budget is not supported on this platform.")
+
+    if BackendTensor.engine_backend is not AvailableBackends.PYTORCH and NOT_MAKE_INPUT_DEEP_COPY is False:
+        interpolation_input = copy.deepcopy(interpolation_input)
+
+    start = time.perf_counter()
+    output: list[OctreeLevel] = []
+    gravity = None
+    for i in range(options.number_octree_levels):
+        level_start, level_start_memory = time.perf_counter(), current_rss_mb() if memory_budget is not None else None
+        options.temp_interpolation_values.current_octree_level = i
+        with profile_stage("octree level", level=i):
+            if interpolate_fields is None:
+                octree: OctreeLevel = interp_features.interpolate_on_octree(interpolation_input, options, data_descriptor)
+            else:
+                octree: OctreeLevel = _interpolate_on_octree(interpolation_input, options, data_descriptor, interpolate_fields)
+        output.append(octree)
+
+        if i == 0 and geophysics_input is not None:
+            with profile_stage("gravity"):
+                gravity = model_api.compute_gravity(geophysics_input=geophysics_input, root_ouput=octree.outputs_centers[-1])
+
+        if options.is_last_octree_level:
+            break
+
+        raise_if_cancelled()
+        next_grid: EngineGrid = interp_features.get_next_octree_grid(
+            prev_octree=octree,
+            evaluation_options=options.evaluation_options,
+            current_octree_level=i
+        )
+        if refine_next_grid is not None:
+            next_grid = refine_next_grid(next_grid, octree, i)
+
+        # * The first level also evaluates the other grids, so its cost says nothing about the next octree level
+        growth = next_grid.octree_grid.values.shape[0] / max(octree.grid_centers.octree_grid.values.shape[0], 1) if i > 0 else 0
+        now = time.perf_counter()
+        over_time = time_budget is not None and now - start + (now - level_start) * growth > time_budget
+        if memory_budget is not None:
+            memory = current_rss_mb()
+            over_memory = memory + max(memory - level_start_memory, 0.) * growth > memory_budget
+        else:
+            over_memory = False
+        if over_time or over_memory:
+            break
+
+        if on_octree_level is not None:
+            on_octree_level(_solutions_from_levels(output, gravity, interpolation_input, options, data_descriptor))
+        interpolation_input.set_temp_grid(next_grid)
+
+    return _solutions_from_levels(output, gravity, interpolation_input, options, data_descriptor)
+
+
+def _interpolate_on_octree(interpolation_input: InterpolationInput, options: InterpolationOptions, data_descriptor: InputDataDescriptor,
+                           interpolate_fields: Callable[[InterpolationInput, InterpolationOptions, InputDataDescriptor], list[InterpOutput]]) -> OctreeLevel:
+    """Same as the engine `interpolate_on_octree`, with the fields evaluated by `interpolate_fields`."""
+    from gempy_engine.API.interp_single._octree_generation import _generate_corners
+
+    if BackendTensor.engine_backend is not AvailableBackends.PYTORCH and NOT_MAKE_INPUT_DEEP_COPY is False:
+        interpolation_input = copy.deepcopy(interpolation_input)
+
+    level = options.temp_interpolation_values.current_octree_level
+    with profile_stage("centers", level=level):
+        outputs_centers: list[InterpOutput] = interpolate_fields(interpolation_input, options, data_descriptor)
+    grid_centers: EngineGrid = interpolation_input.grid
+    outputs_corners: list[InterpOutput] = []
+    grid_corners: Optional[EngineGrid] = None
+    if options.compute_corners:
+        with profile_stage("corners", level=level):
+            grid_corners = EngineGrid.from_xyz_coords(xyz_coords=_generate_corners(regular_grid=grid_centers.octree_grid))
+            interpolation_input.set_temp_grid(grid_corners)
+            outputs_corners = interpolate_fields(interpolation_input, options, data_descriptor)
+            interpolation_input.set_grid_to_original()
+
+    return OctreeLevel(
+        grid_centers=grid_centers,
+        grid_corners=grid_corners,
+        outputs_centers=outputs_centers,
+        outputs_corners=outputs_corners
+    )
+
+
+def _solutions_from_levels(output: list[OctreeLevel], gravity, interpolation_input: InterpolationInput,
+                           options: InterpolationOptions, data_descriptor: InputDataDescriptor) -> Solutions:
+    from gempy_engine.API.model import model_api
+
+    interpolation_input.set_grid_to_original()
+    meshes = None
+    if options.mesh_extraction and len(output) > 1:  # * The engine needs two levels to extract the meshes
+        with profile_stage("meshing", level=len(output) - 1):
+            meshes = model_api.dual_contouring_multi_scalar(
+                data_descriptor=data_descriptor,
+                interpolation_input=interpolation_input,
+                options=options,
+                octree_list=output[:options.number_octree_levels_surface]
+            )
+
+    solutions = model_api.Solutions(
+        octrees_output=list(output),
+        dc_meshes=meshes,
+        fw_gravity=gravity,
+        block_solution_type=options.block_solutions_type
+    )
+    if options.debug:
+        solutions.debug_input_data["stack_interpolation_input"] = interpolation_input
+    return solutions
+
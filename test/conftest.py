@@ -4,6 +4,7 @@ import os
 input_path = os.path.dirname(__file__) + '/input_data'
 input_path2 = os.path.dirname(__file__) + '/../examples/data/input_data/'
 import numpy as np
+import pytest
 
 np.random.seed(1234)
 
@@ -24,3 +25,5 @@ class Requirements(enum.Enum):
 
 TEST_SPEED = TestSpeed.MINUTES  # * Use seconds for compile errors, minutes before pushing and hours before release
 REQUIREMENT_LEVEL = Requirements.CORE  # * Use CORE for mandatory tests, OPTIONAL for optional tests and DEV for development tests
+
+skip_below_seconds = pytest.mark.skipif(TEST_SPEED.value < TestSpeed.SECONDS.value, reason="Global test speed below this test value.")
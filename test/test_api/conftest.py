@@ -0,0 +1,41 @@
+from typing import Optional, Sequence
+
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.core.data.enumerators import ExampleModel
+from gempy.core.data.grid_modules import RegularGrid
+
+
+@pytest.fixture
+def make_geo_model():
+    """
+    Factory of TWO_AND_A_HALF_D example models that are not computed. Every call builds a new model.
+
+    The model gets a dense grid of `dense_resolution` cells, an octree of `octree_levels` levels as its only active
+    grid, or both. `active_grids` overrides the active grids, e.g. to leave out the random example topography.
+    """
+
+    def make(dense_resolution: Optional[Sequence[int]] = (20, 4, 20), octree_levels: Optional[int] = None,
+             active_grids: Optional[gp.data.Grid.GridTypes] = None) -> gp.data.GeoModel:
+        geo_model: gp.data.GeoModel = gp.generate_example_model(
+            example_model=ExampleModel.TWO_AND_A_HALF_D,
+            compute_model=False
+        )
+        if dense_resolution is not None:
+            geo_model.grid.dense_grid = RegularGrid(extent=geo_model.grid.extent, resolution=np.array(dense_resolution))
+        if octree_levels is not None:
+            geo_model.grid.set_octree_grid_by_levels(octree_levels, geo_model.interpolation_options.evaluation_options)
+            geo_model.grid.active_grids = gp.data.Grid.GridTypes.OCTREE
+        if active_grids is not None:
+            geo_model.grid.active_grids = active_grids
+        return geo_model
+
+    return make
+
+
+@pytest.fixture
+def geo_model(make_geo_model) -> gp.data.GeoModel:
+    """TWO_AND_A_HALF_D example model with a 20 x 4 x 20 dense grid, not computed."""
+    return make_geo_model()
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.API import compute_API
+from gempy.modules.parallel import compute_control
+from gempy_engine.API.interp_single import interp_features
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def _create_model() -> gp.data.GeoModel:
+    geo_model = gp.generate_synthetic_model(n_surfaces=2, n_faults=1, n_surface_points=40, n_orientations=4, seed=0, refinement=3)
+    geo_model.interpolation_options.mesh_extraction = False
+    return geo_model
+
+
+def test_compute_model_async():
+    geo_model = _create_model()
+    at = np.random.default_rng(0).uniform(0, 1000, size=(10, 3))
+
+    async def compute():
+        solutions = await gp.compute_model_async(geo_model)
+        values = await gp.compute_model_at_async(geo_model, at, chunk_size=4)
+        return solutions, values
+
+    solutions, values = asyncio.run(compute())
+
+    assert geo_model.solutions is solutions
+    np.testing.assert_allclose(values, gp.compute_model_at(geo_model, at))
+
+
+def test_compute_model_async_serializes_computations(monkeypatch):
+    geo_model = _create_model()
+    other_model = _create_model()
+
+    counter_lock = threading.Lock()
+    running = []
+    max_running = []
+    original_compute_model_progressively = compute_API.compute_model_progressively
+
+    def spy_compute_model_progressively(*args, **kwargs):
+        with counter_lock:
+            running.append(None)
+            max_running.append(len(running))
+        time.sleep(.05)
+        try:
+            return original_compute_model_progressively(*args, **kwargs)
+        finally:
+            with counter_lock:
+                running.pop()
+
+    monkeypatch.setattr(compute_API, "compute_model_progressively", spy_compute_model_progressively)
+
+    async def compute():
+        return await asyncio.gather(*(gp.compute_model_async(model) for model in (geo_model, geo_model, other_model)))
+
+    first, second, other = asyncio.run(compute())
+
+    assert geo_model.solutions is first or geo_model.solutions is second
+    assert other_model.solutions is other
+    assert len(max_running) == 3 and max(max_running) == 1  # * Not even the computations of different models overlap
+
+
+def test_compute_model_async_cancellation(monkeypatch):
+    geo_model = _create_model()
+    started = threading.Event()
+    levels = []
+    original_interpolate_on_octree = interp_features.interpolate_on_octree
+    original_get_next_octree_grid = interp_features.get_next_octree_grid
+
+    def spy_interpolate_on_octree(*args, **kwargs):
+        started.set()
+        compute_control._active_cancel_event.get().wait(timeout=10)  # * Wait until the caller cancels
+        return original_interpolate_on_octree(*args, **kwargs)
+
+    def spy_get_next_octree_grid(*args, **kwargs):
+        levels.append(kwargs.get("current_octree_level"))
+        return original_get_next_octree_grid(*args, **kwargs)
+
+    monkeypatch.setattr(interp_features, "interpolate_on_octree", spy_interpolate_on_octree)
+    monkeypatch.setattr(interp_features, "get_next_octree_grid", spy_get_next_octree_grid)
+
+    async def compute():
+        task = asyncio.create_task(gp.compute_model_async(geo_model))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(compute())
+
+    assert levels == []  # * Stopped before refining the first octree level
+    assert geo_model.solutions is None
+    assert compute_control.model_lock(geo_model).acquire(blocking=False)
+
+
+def test_compute_model_async_process_pool():
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor, pytest.raises(ValueError):
+        asyncio.run(gp.compute_model_async(_create_model(), executor=executor))
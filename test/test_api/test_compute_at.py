@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy_engine.modules.weights_cache.weights_cache_interface import WeightCache
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+xyz_coord = np.array([
+        [100, 500, 600],
+        [300, 500, 600],
+        [500, 500, 600],
+        [700, 500, 600],
+        [100, 500, 100],
+        [300, 500, 100],
+        [500, 500, 100],
+        [700, 500, 100]
+])
+
+
+def test_compute_model_at_has_no_side_effects(geo_model, monkeypatch):
+    gp.compute_model(geo_model)
+
+    active_grids = geo_model.grid.active_grids
+    grid_values = geo_model.grid.values.copy()
+    solutions = geo_model.solutions
+
+    stored_weights = []
+    monkeypatch.setattr(WeightCache, "store_weights", staticmethod(lambda **kwargs: stored_weights.append(kwargs)))
+    values = gp.compute_model_at(geo_model, at=xyz_coord)
+    scalar_fields = gp.compute_scalar_fields_at(geo_model, at=xyz_coord)
+
+    assert stored_weights == []  # * No kriging system was solved
+    assert geo_model.grid.active_grids == active_grids
+    np.testing.assert_array_equal(geo_model.grid.values, grid_values)
+    assert geo_model.solutions is solutions
+
+    assert values.shape == (len(xyz_coord),)
+    assert scalar_fields.shape == (2, len(xyz_coord))
+
+
+def test_compute_model_at_matches_custom_grid(geo_model):
+    values = gp.compute_model_at(geo_model, at=xyz_coord)
+
+    gp.set_custom_grid(geo_model.grid, xyz_coord=xyz_coord)
+    sol: gp.data.Solutions = gp.compute_model(geo_model)
+
+    np.testing.assert_allclose(values, sol.raw_arrays.custom)
+
+
+def test_compute_model_at_wrong_shape(geo_model):
+    with pytest.raises(ValueError):
+        gp.compute_model_at(geo_model, at=np.zeros((2, 2)))
+
+
+def test_compute_model_at_in_chunks(geo_model, tmp_path):
+    values = gp.compute_model_at(geo_model, at=xyz_coord)
+    scalar_fields = gp.compute_scalar_fields_at(geo_model, at=xyz_coord)
+
+    # * Stream memory-mapped coordinates into a memory-mapped output
+    np.save(tmp_path / "xyz.npy", xyz_coord)
+    at = np.load(tmp_path / "xyz.npy", mmap_mode="r")
+    out = np.lib.format.open_memmap(tmp_path / "values.npy", mode="w+", dtype="float64", shape=(len(xyz_coord),))
+
+    chunked_values = gp.compute_model_at(geo_model, at=at, chunk_size=3, out=out)
+    chunked_scalar_fields = gp.compute_scalar_fields_at(geo_model, at=at, chunk_size=3)
+
+    assert chunked_values is out
+    np.testing.assert_allclose(chunked_values, values)
+    np.testing.assert_allclose(chunked_scalar_fields, scalar_fields)
+
+    with pytest.raises(ValueError):
+        gp.compute_model_at(geo_model, at=at, chunk_size=3, out=np.empty(2))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_compute_models_batch(geo_model):
+    xyz = geo_model.surface_points_copy.xyz
+    noise = np.random.default_rng(0).normal(scale=10, size=(2, *xyz.shape))
+    surface_points_xyz = np.stack([xyz, xyz + np.array([0, 0, 50]), xyz + noise[0], xyz + noise[1]])
+    lith_blocks, scalar_fields = gp.compute_models_batch(
+        geo_model=geo_model,
+        surface_points_xyz=surface_points_xyz
+    )
+
+    assert lith_blocks.shape == (4, 20 * 4 * 20)
+    assert scalar_fields.shape == (4, 2, 20 * 4 * 20)
+    assert geo_model.solutions is None  # * The batch does not touch the model
+    assert not np.array_equal(lith_blocks[0], lith_blocks[1])
+
+    # * Every realization is the same as computing the model with its surface points
+    for i, realization_xyz in enumerate(surface_points_xyz):
+        gp.modify_surface_points(geo_model, X=realization_xyz[:, 0], Y=realization_xyz[:, 1], Z=realization_xyz[:, 2])
+        sol: gp.data.Solutions = gp.compute_model(geo_model)
+        np.testing.assert_array_equal(lith_blocks[i], sol.raw_arrays.lith_block)
+        np.testing.assert_allclose(scalar_fields[i], sol.raw_arrays.scalar_field_matrix)
+
+    parallel_lith_blocks, parallel_scalar_fields = gp.compute_models_batch(
+        geo_model=geo_model,
+        surface_points_xyz=surface_points_xyz,
+        max_workers=2
+    )
+    np.testing.assert_array_equal(parallel_lith_blocks, lith_blocks)
+    np.testing.assert_allclose(parallel_scalar_fields, scalar_fields)
+
+
+def test_compute_models_batch_wrong_shape(geo_model):
+
+    with pytest.raises(ValueError):
+        gp.compute_models_batch(
+            geo_model=geo_model,
+            surface_points_xyz=np.zeros((2, 1, 3))
+        )
+    with pytest.raises(ValueError):
+        gp.compute_models_batch(
+            geo_model=geo_model,
+            surface_points_xyz=geo_model.surface_points_copy.xyz[None],
+            engine_config=gp.data.GemPyEngineConfig(backend=gp.data.AvailableBackends.PYTORCH),
+            max_workers=2
+        )
@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pytest
+
+import gempy as gp
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_compute_model_profiling(geo_model, tmp_path):
+    geo_model.interpolation_options.cache_mode = gp.data.InterpolationOptions.CacheMode.NO_CACHE  # * Force the solve
+
+    trace_path = tmp_path / "trace.json"
+    sol = gp.compute_model(
+        gempy_model=geo_model,
+        engine_config=gp.data.GemPyEngineConfig(profiling=True, profiling_trace_path=str(trace_path))
+    )
+
+    profile: gp.data.ComputeProfile = sol.profile
+    stage_names = [stage.name for stage in profile.stages]
+    n_levels = geo_model.interpolation_options.number_octree_levels
+    engine_stages = []
+    for level in range(n_levels):
+        engine_stages += ["octree level"] + (["centers"] + ["structural group"] * 2 + ["corners"] + ["structural group"] * 2)
+    assert stage_names == ["input building", "surface points transform", "orientations transform", "grids transform",
+                           "engine", *engine_stages, "meshing", "solutions post-processing"]
+    assert [stage.depth for stage in profile.stages if stage.depth < 2] == [0, 1, 1, 1, 0, *[1] * n_levels, 1, 0]
+
+    assert [stage.args["level"] for stage in profile.get_stages("octree level")] == list(range(n_levels))
+    groups = profile.get_stages("structural group")
+    assert [(stage.args["level"], stage.args["group"]) for stage in groups] == [(level, group) for level in range(n_levels) for _ in range(2) for group in range(2)]
+    assert all(stage.depth == 3 for stage in groups)
+    assert profile.get_stages("meshing")[0].args["level"] == n_levels - 1
+
+    # * The levels are computed by GemPy, with the same results as the engine
+    np.testing.assert_array_equal(sol.raw_arrays.lith_block, gp.compute_model(geo_model).raw_arrays.lith_block)
+
+    assert all(stage.peak_memory is not None and stage.peak_memory >= 0 for stage in profile.stages)
+    assert profile.get_stages("input building")[0].peak_memory >= profile.get_stages("grids transform")[0].peak_memory
+    assert profile.total_time == pytest.approx(sum(stage.duration for stage in profile.stages if stage.depth == 0))
+    assert profile.get_stages("engine")[0].duration > 0
+
+    report = repr(profile).splitlines()
+    assert len(report) == len(profile.stages) + 1
+    assert report[2].startswith("  surface points transform")
+
+    trace = json.loads(trace_path.read_text())
+    assert [event["name"] for event in trace["traceEvents"]] == stage_names
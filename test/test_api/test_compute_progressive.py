@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.modules.profiling.memory_usage import current_rss_mb
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+@pytest.fixture
+def geo_model(make_geo_model) -> gp.data.GeoModel:
+    return make_geo_model(dense_resolution=None, octree_levels=4)
+
+
+def test_progressive_snapshots_match_compute_model(geo_model):
+    reference: gp.data.Solutions = gp.compute_model(geo_model)
+
+    snapshots = list(gp.compute_model_progressive(geo_model))
+
+    assert [len(snapshot.octrees_output) for snapshot in snapshots] == [1, 2, 3, 4]
+    assert [snapshot.raw_arrays.lith_block.shape[0] for snapshot in snapshots] == [8, 64, 512, 4096]
+    assert geo_model.solutions is snapshots[-1]
+    np.testing.assert_allclose(snapshots[-1].raw_arrays.lith_block, reference.raw_arrays.lith_block)
+    assert len(snapshots[-1].dc_meshes) == len(reference.dc_meshes)
+
+
+def test_octree_callback_and_budgets(geo_model):
+    levels = []
+    solutions = gp.compute_model(geo_model, gp.data.GemPyEngineConfig(on_octree_level=lambda snapshot: levels.append(len(snapshot.octrees_output))))
+    assert levels == [1, 2, 3]
+    assert len(solutions.octrees_output) == 4
+
+    # * The first level is always computed
+    solutions = gp.compute_model(geo_model, gp.data.GemPyEngineConfig(octree_time_budget=0.))
+    assert len(solutions.octrees_output) == 1
+    assert geo_model.solutions is solutions
+
+    solutions = gp.compute_model(geo_model, gp.data.GemPyEngineConfig(octree_time_budget=3600.))
+    assert len(solutions.octrees_output) == 4
+
+    solutions = gp.compute_model(geo_model, gp.data.GemPyEngineConfig(octree_memory_budget=0.))
+    assert len(solutions.octrees_output) == 1
+
+    # * The budget is compared with the current memory, not with the peak of earlier computations
+    solutions = gp.compute_model(geo_model, gp.data.GemPyEngineConfig(octree_memory_budget=current_rss_mb() + 1024.))
+    assert len(solutions.octrees_output) == 4
+
+
+def test_progressive_computation_stops_when_closed(make_geo_model):
+    geo_model = make_geo_model(dense_resolution=None, octree_levels=5)
+
+    progressive = gp.compute_model_progressive(geo_model)
+    first = next(progressive)
+    progressive.close()
+
+    assert len(first.octrees_output) == 1
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.API import compute_API
+from gempy.core.data.gempy_engine_config import GemPyEngineConfig
+from gempy.core.data.grid_modules import RegularGrid
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+resolution = (10, 7, 9)
+
+
+@pytest.fixture
+def geo_model(make_geo_model) -> gp.data.GeoModel:
+    return make_geo_model(dense_resolution=None)
+
+
+def _implicit_grid(geo_model: gp.data.GeoModel) -> RegularGrid:
+    return RegularGrid(extent=geo_model.grid.extent, resolution=np.array(resolution), implicit=True)
+
+
+def test_grid_tiles_cover_the_grid(geo_model):
+    grid = _implicit_grid(geo_model)
+
+    counts = np.zeros(resolution, dtype=int)
+    for tile in grid.iter_tiles(tile_shape=[4, 3, 5], halo=1):
+        counts[tile.slices] += 1
+        assert all(h.start <= s.start and s.stop <= h.stop for s, h in zip(tile.slices, tile.halo_slices))
+        np.testing.assert_allclose(grid.get_values_tile(tile.halo_slices).reshape(*tile.halo_shape, 3)[tile.interior].reshape(-1, 3),
+                                   grid.get_values_tile(tile.slices))
+
+    np.testing.assert_array_equal(counts, 1)
+
+
+def test_compute_model_tiled_matches_compute_model_at(geo_model, tmp_path):
+    grid = _implicit_grid(geo_model)
+    lith_reference = gp.compute_model_at(geo_model, at=grid).reshape(resolution)
+    scalar_reference = gp.compute_scalar_fields_at(geo_model, at=grid).reshape(-1, *resolution)
+
+    lith_block = np.lib.format.open_memmap(str(tmp_path / "lith_block.npy"), mode='w+', dtype=float, shape=resolution)
+    tiles = []
+    lith, scalar = gp.compute_model_tiled(
+        geo_model,
+        tile_shape=[4, 3, 5],
+        grid=grid,
+        halo=1,
+        lith_block=lith_block,
+        on_tile=lambda tile, tile_lith, tile_scalar: tiles.append((tile, tile_lith.shape, tile_scalar.shape))
+    )
+
+    assert lith is lith_block
+    np.testing.assert_allclose(lith, lith_reference)
+    np.testing.assert_allclose(scalar, scalar_reference)
+    assert len(tiles) == 3 * 3 * 2
+    for tile, lith_shape, scalar_shape in tiles:
+        assert lith_shape == tile.halo_shape
+        assert scalar_shape == (2, *tile.halo_shape)
+
+
+def test_compute_model_tiled_in_workers(geo_model):
+    grid = _implicit_grid(geo_model)
+    lith_reference = gp.compute_model_at(geo_model, at=grid).reshape(resolution)
+
+    lith, _ = gp.compute_model_tiled(geo_model, tile_shape=[5, 7, 9], grid=grid, max_workers=1)
+
+    np.testing.assert_allclose(lith, lith_reference)
+
+
+def test_tile_workers_receive_the_solved_weights(geo_model):
+    snapshot = compute_API._tile_snapshot(geo_model, _implicit_grid(geo_model), GemPyEngineConfig(use_gpu=False))
+
+    n_groups = geo_model.input_data_descriptor.stack_structure.n_stacks
+    assert sorted(snapshot.weights) == [f"{geo_model.interpolation_options.cache_model_name}.{i}" for i in range(n_groups)]
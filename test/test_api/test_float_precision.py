@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.core.data.grid_modules import RegularGrid, Sections
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_float32_grids():
+    with gp.float_precision("float32"):
+        grid = RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[6, 5, 4])
+        implicit = RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[6, 5, 4], implicit=True)
+        sections = Sections(z_ext=[-50, 0], section_dict={'section': ([0, 0], [100, 50], [10, 5])})
+
+        assert grid.values.dtype == np.float32
+        assert implicit.values.dtype == np.float32
+        assert grid.values_vtk_format.dtype == np.float32
+        assert sections.values.dtype == np.float32
+
+        with pytest.warns(UserWarning):  # * float32 cannot resolve a small extent far from the origin
+            far_grid = RegularGrid(extent=[5e6, 5e6 + 100, 0, 100, 0, 100], resolution=[2, 2, 2])
+        assert far_grid.values.dtype == np.float64
+
+    assert gp.get_float_dtype() == np.float64
+    np.testing.assert_allclose(grid.values, RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[6, 5, 4]).values, rtol=1e-6)
+
+    with pytest.raises(ValueError):
+        gp.set_float_dtype("float16")
+
+
+def test_float32_compute(make_geo_model):
+    geo_model = make_geo_model(dense_resolution=None)
+    reference = gp.compute_model(geo_model).raw_arrays.lith_block.copy()
+    xyz = np.array([[100, 0, -300], [500, 0, -100]])
+    reference_at = gp.compute_model_at(geo_model, at=xyz)
+
+    with gp.float_precision("float32"):
+        solutions = gp.compute_model(geo_model)
+        values_at = gp.compute_model_at(geo_model, at=xyz)
+
+    assert solutions.raw_arrays.scalar_field_matrix.dtype == np.float32
+    assert np.mean(solutions.raw_arrays.lith_block != reference) < 0.01  # * Only cells on the boundaries may change
+    assert values_at.dtype == np.float32
+    np.testing.assert_allclose(values_at, reference_at)
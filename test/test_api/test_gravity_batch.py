@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_gravity_batch_matches_compute_model(make_geo_model):
+    geo_model = make_geo_model(dense_resolution=None)
+    geo_model.interpolation_options.evaluation_options.mesh_extraction = False
+    x = np.linspace(20, 900, 12)
+    gp.set_centered_grid(geo_model.grid, centers=np.column_stack((x, np.zeros_like(x), np.zeros_like(x))), resolution=[10, 5, 10], radius=[150, 10, 300])
+
+    densities = np.random.default_rng(0).uniform(2, 3, size=(4, 5))
+    geo_model.geophysics_input = gp.data.GeophysicsInput(
+        tz=gp.calculate_gravity_gradient(geo_model.grid.centered_grid),
+        densities=densities[0]
+    )
+    gp.compute_model(geo_model)
+
+    gravity = gp.compute_gravity_batch(geo_model, densities)
+    assert gravity.shape == (4, 12)
+    np.testing.assert_allclose(gravity[0], geo_model.solutions.gravity)
+    np.testing.assert_allclose(gp.compute_gravity_batch(geo_model, densities[2]), gravity[2])
+
+    geo_model.geophysics_input.densities = densities[3]
+    np.testing.assert_allclose(gp.compute_model(geo_model).gravity, gravity[3])
+
+    # * The operator is computed once per solutions
+    operator = gp.gravity_density_operator(geo_model)
+    assert gp.gravity_density_operator(geo_model) is operator
+    gp.compute_model(geo_model)
+    assert gp.gravity_density_operator(geo_model) is not operator
+
+    with pytest.raises(ValueError):
+        gp.compute_gravity_batch(geo_model, densities[:, :2])
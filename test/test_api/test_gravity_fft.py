@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.modules.geophysics.fft_gravity import _PrismStencil
+from gempy_engine.modules.geophysics.gravity_gradient import calculate_gravity_gradient as engine_gravity_gradient
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_gravity_fft_matches_direct_sum(make_geo_model):
+    geo_model = make_geo_model(dense_resolution=[20, 10, 15], active_grids=gp.data.Grid.GridTypes.DENSE)
+    gp.compute_model(geo_model)
+
+    densities = np.array([2., 2.5, 3., 2.2, 2.7])
+    cache = gp.data.GravityKernelCache()
+    gravity = gp.compute_gravity_fft(geo_model, observation_height=10., densities=densities, cache=cache)
+    assert gravity.shape == (20, 10)
+    assert len(cache) == 1
+
+    regular_grid = geo_model.grid.dense_grid
+    ids = geo_model.solutions.octrees_output[0].outputs_centers[-1].ids_block_dense_grid
+    density_block = densities[np.rint(ids).astype(int).ravel() - 1]
+    half_cell = np.broadcast_to(np.array(regular_grid.dx_dy_dz) / 2, regular_grid.values.shape)
+    for i, j in [(0, 0), (7, 3), (19, 9)]:
+        station = np.array([regular_grid.x_coord[i], regular_grid.y_coord[j], 10.])
+        tz = engine_gravity_gradient(_PrismStencil(regular_grid.values - station, half_cell, half_cell))
+        np.testing.assert_allclose(gravity[i, j], np.sum(tz * density_block))
+
+    # * Only the densities changed, so the kernel spectra are reused
+    np.testing.assert_allclose(gp.compute_gravity_fft(geo_model, observation_height=10., densities=2 * densities, cache=cache), 2 * gravity)
+    assert len(cache) == 1
+
+    with pytest.raises(ValueError):
+        gp.compute_gravity_fft(geo_model, observation_height=-10., densities=densities)
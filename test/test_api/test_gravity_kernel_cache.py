@@ -0,0 +1,51 @@
+import numpy as np
+
+import gempy as gp
+from gempy_engine.core.data.centered_grid import CenteredGrid
+from gempy_engine.modules.geophysics.gravity_gradient import calculate_gravity_gradient as engine_gravity_gradient
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_gravity_kernel_cache(tmp_path):
+    grid = gp.data.Grid()
+    centers = np.random.default_rng(0).uniform(0, 1000, size=(50, 3))
+    centered_grid = gp.set_centered_grid(grid, centers=centers, resolution=[10, 10, 15], radius=[100, 100, 200])
+    reference = CenteredGrid(centers=centers, resolution=[10, 10, 15], radius=[100, 100, 200])
+
+    np.testing.assert_array_equal(centered_grid.values, reference.values)
+    other_grid = gp.set_centered_grid(grid, centers=centers[:3], resolution=[10, 10, 15], radius=[100, 100, 200])
+    assert np.shares_memory(other_grid.kernel_grid_centers, centered_grid.kernel_grid_centers)
+
+    cache = gp.data.GravityKernelCache(cache_dir=str(tmp_path))
+    tz = gp.calculate_gravity_gradient(centered_grid, cache=cache)
+    np.testing.assert_allclose(tz, engine_gravity_gradient(reference))
+    assert gp.calculate_gravity_gradient(centered_grid, cache=cache) is tz
+    assert not tz.flags.writeable
+
+    # * A new process would read the kernel from disk
+    from_disk = gp.calculate_gravity_gradient(centered_grid, cache=gp.data.GravityKernelCache(cache_dir=str(tmp_path)))
+    np.testing.assert_array_equal(from_disk, tz)
+
+    with gp.float_precision("float32"):
+        assert gp.calculate_gravity_gradient(centered_grid, cache=cache).dtype == np.float32
+    assert len(cache) == 2
+
+
+def test_gravity_many_devices(make_geo_model):
+    geo_model = make_geo_model(dense_resolution=None)
+    x = np.linspace(20, 900, 40)
+    centers = np.column_stack((x, np.zeros_like(x), np.zeros_like(x)))
+    gp.set_centered_grid(geo_model.grid, centers=centers, resolution=[10, 5, 10], radius=[150, 10, 300])
+    geo_model.geophysics_input = gp.data.GeophysicsInput(
+        tz=gp.calculate_gravity_gradient(geo_model.grid.centered_grid),
+        densities=np.array([2., 2., 3., 2., 2.])
+    )
+
+    gravity = gp.compute_model(geo_model).gravity
+    assert gravity.shape == (40,)
+
+    # * Every device must get the gravity it gets when computed alone
+    gp.set_centered_grid(geo_model.grid, centers=centers[[7]], resolution=[10, 5, 10], radius=[150, 10, 300])
+    np.testing.assert_allclose(gp.compute_model(geo_model).gravity, gravity[[7]])
@@ -0,0 +1,61 @@
+import numpy as np
+
+import gempy as gp
+from gempy.modules.data_manipulation.engine_factory import interpolation_input_from_structural_frame, interpolation_input_at
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_structural_frame_is_dirty(geo_model):
+    structural_frame = geo_model.structural_frame
+
+    assert structural_frame.is_dirty
+    structural_frame.is_dirty = False
+    assert not structural_frame.is_dirty
+
+    # * In place edits of the tables are detected too
+    structural_frame.structural_elements[0].surface_points.data['Z'][0] += 1
+    assert structural_frame.is_dirty
+
+
+def test_unchanged_pieces_are_reused(geo_model):
+    first = interpolation_input_from_structural_frame(geo_model, reuse_unchanged=True)
+    second = interpolation_input_from_structural_frame(geo_model, reuse_unchanged=True)
+    assert second.surface_points is first.surface_points
+    assert second.orientations is first.orientations
+    assert second.original_grid is first.original_grid
+
+    gp.modify_surface_points(geo_model, slice=0, Z=geo_model.surface_points_copy.xyz[0, 2] + 10)
+    third = interpolation_input_from_structural_frame(geo_model, reuse_unchanged=True)
+    assert third.surface_points is not first.surface_points
+    assert third.orientations is first.orientations
+    assert third.original_grid is first.original_grid
+
+    gp.set_custom_grid(geo_model.grid, xyz_coord=np.array([[500, 500, 500]]))
+    fourth = interpolation_input_from_structural_frame(geo_model, reuse_unchanged=True)
+    assert fourth.surface_points is third.surface_points
+    assert fourth.original_grid is not third.original_grid
+
+
+def test_query_input_does_not_build_the_grid(geo_model):
+    query = interpolation_input_at(geo_model, np.array([[500., 500., 500.], [600., 500., 500.]]), reuse_unchanged=True)
+    assert "grid" not in geo_model._interpolation_input_pieces
+    assert query.grid.values.shape == (2, 3)
+
+    full = interpolation_input_from_structural_frame(geo_model, reuse_unchanged=True)
+    assert full.surface_points is query.surface_points
+    np.testing.assert_allclose(query.grid.values[0], geo_model.input_transform.apply(np.array([[500., 500., 500.]]))[0], rtol=1e-6)
+
+
+def test_compute_model_with_reused_pieces(geo_model, make_geo_model):
+    gp.compute_model(geo_model)
+    gp.modify_orientations(geo_model, slice=0, G_x=0.3)
+    sol = gp.compute_model(geo_model)
+
+    reference_model = make_geo_model()
+    gp.modify_orientations(reference_model, slice=0, G_x=0.3)
+    reference_sol = gp.compute_model(reference_model)
+
+    np.testing.assert_array_equal(sol.raw_arrays.lith_block, reference_sol.raw_arrays.lith_block)
+    np.testing.assert_allclose(sol.raw_arrays.scalar_field_matrix, reference_sol.raw_arrays.scalar_field_matrix)
@@ -0,0 +1,72 @@
+import numpy as np
+
+import gempy as gp
+from gempy_engine.API.interp_single import _multi_scalar_field_manager
+from gempy_engine.modules.weights_cache.weights_cache_interface import WeightCache
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+PARALLEL_CONFIG = gp.data.GemPyEngineConfig(parallel_groups=True, parallel_max_workers=2)
+RAW_ARRAYS = ("lith_block", "fault_block", "litho_faults_block", "scalar_field_matrix", "block_matrix", "mask_matrix", "values_matrix")
+
+
+def test_parallel_groups_match_sequential(make_geo_model):
+    geo_model = make_geo_model(active_grids=gp.data.Grid.GridTypes.DENSE)
+
+    sequential = gp.compute_model(geo_model)
+    lith_block = sequential.raw_arrays.lith_block.copy()
+    scalar_field_matrix = sequential.raw_arrays.scalar_field_matrix.copy()
+
+    interpolate_stack = _multi_scalar_field_manager._interpolate_stack
+    parallel = gp.compute_model(geo_model, PARALLEL_CONFIG)
+    assert _multi_scalar_field_manager._interpolate_stack is interpolate_stack  # * The engine is not patched
+
+    np.testing.assert_array_equal(parallel.raw_arrays.lith_block, lith_block)
+    np.testing.assert_allclose(parallel.raw_arrays.scalar_field_matrix, scalar_field_matrix)
+    assert len(parallel.dc_meshes) == len(sequential.dc_meshes)
+
+
+def test_parallel_independent_faults():
+    # * The faults do not offset each other, so they are solved at the same time
+    geo_model = gp.generate_synthetic_model(n_surfaces=2, n_faults=2, n_surface_points=80, n_orientations=6, seed=0, refinement=3)
+    geo_model.interpolation_options.mesh_extraction = False
+    geo_model.interpolation_options.cache_mode = gp.data.InterpolationOptions.CacheMode.NO_CACHE
+
+    lith_block = gp.compute_model(geo_model).raw_arrays.lith_block.copy()
+    parallel = gp.compute_model(geo_model, PARALLEL_CONFIG)
+
+    np.testing.assert_array_equal(parallel.raw_arrays.lith_block, lith_block)
+
+
+def test_parallel_and_profiled_groups_match_engine_on_faulted_model():
+    # * Both paths combine the groups and offset the faults with internals of the engine, so a change in them fails here
+    geo_model = gp.generate_synthetic_model(n_surfaces=2, n_faults=1, n_surface_points=60, n_orientations=6, seed=0, refinement=3)
+    geo_model.interpolation_options.cache_mode = gp.data.InterpolationOptions.CacheMode.NO_CACHE
+    assert geo_model.structural_frame.fault_relations[0, 1]  # * The fault offsets the stratigraphic group
+
+    serial = gp.compute_model(geo_model)
+    arrays = {name: getattr(serial.raw_arrays, name).copy() for name in RAW_ARRAYS}
+    vertices = [mesh.vertices.copy() for mesh in serial.dc_meshes]
+
+    for engine_config in (PARALLEL_CONFIG, gp.data.GemPyEngineConfig(profiling=True, profile_memory=False)):
+        solutions = gp.compute_model(geo_model, engine_config)
+        for name in RAW_ARRAYS:
+            np.testing.assert_allclose(getattr(solutions.raw_arrays, name), arrays[name], err_msg=name)
+        for mesh, reference in zip(solutions.dc_meshes, vertices, strict=True):
+            np.testing.assert_allclose(mesh.vertices, reference)
+
+
+def test_parallel_compute_model_at(monkeypatch):
+    geo_model = gp.generate_synthetic_model(n_surfaces=2, n_faults=1, n_surface_points=60, n_orientations=6, seed=0, refinement=3)
+    geo_model.interpolation_options.mesh_extraction = False
+    at = np.random.default_rng(0).uniform(0, 1000, size=(50, 3))
+    gp.compute_model(geo_model, PARALLEL_CONFIG)
+
+    # * The weights solved in the workers are in the weights cache of this process
+    stored_weights = []
+    monkeypatch.setattr(WeightCache, "store_weights", staticmethod(lambda **kwargs: stored_weights.append(kwargs)))
+    values = gp.compute_model_at(geo_model, at)
+    assert stored_weights == []
+
+    np.testing.assert_allclose(gp.compute_model_at(geo_model, at, PARALLEL_CONFIG, chunk_size=20), values)
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.core.data.solution_cache import solution_cache_key
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+_KEY_SCRIPT = """
+import numpy as np
+import gempy as gp
+from gempy.core.data.enumerators import ExampleModel
+from gempy.core.data.grid_modules import RegularGrid
+from gempy.core.data.solution_cache import solution_cache_key
+
+geo_model = gp.generate_example_model(ExampleModel.TWO_AND_A_HALF_D, compute_model=False)
+geo_model.grid.dense_grid = RegularGrid(extent=geo_model.grid.extent, resolution=np.array([20, 4, 20]))
+geo_model.grid.active_grids = gp.data.Grid.GridTypes.DENSE
+print(solution_cache_key(geo_model, gp.data.GemPyEngineConfig()))
+"""
+
+
+@pytest.fixture
+def geo_model(make_geo_model) -> gp.data.GeoModel:
+    return make_geo_model(active_grids=gp.data.Grid.GridTypes.DENSE)  # * The example topography is random
+
+
+def test_solution_cache_in_memory(geo_model):
+    engine_config = gp.data.GemPyEngineConfig(solution_cache=gp.data.SolutionCache(max_entries=1))
+
+    first = gp.compute_model(geo_model, engine_config)
+    hit = gp.compute_model(geo_model, engine_config)
+    assert hit is not first and hit.raw_arrays is first.raw_arrays  # * A new object sharing the cached arrays
+
+    gp.modify_surface_points(geo_model, slice=0, Z=geo_model.surface_points_copy.xyz[0, 2] + 10)
+    second = gp.compute_model(geo_model, engine_config)
+    assert second is not first
+    assert len(engine_config.solution_cache) == 1  # * The first solution was evicted
+
+
+def test_solution_cache_on_disk(geo_model, tmp_path, make_geo_model):
+    engine_config = gp.data.GemPyEngineConfig(solution_cache=gp.data.SolutionCache(cache_dir=str(tmp_path)))
+    sol = gp.compute_model(geo_model, engine_config)
+
+    # * A new cache pointing to the same directory plays the role of another worker
+    other_engine_config = gp.data.GemPyEngineConfig(solution_cache=gp.data.SolutionCache(cache_dir=str(tmp_path)))
+    other_model = make_geo_model(active_grids=gp.data.Grid.GridTypes.DENSE)
+    assert solution_cache_key(other_model, other_engine_config) in other_engine_config.solution_cache
+
+    other_sol = gp.compute_model(other_model, other_engine_config)
+    np.testing.assert_array_equal(other_sol.raw_arrays.lith_block, sol.raw_arrays.lith_block)
+
+
+def test_solution_cache_disk_eviction(geo_model, tmp_path):
+    cache = gp.data.SolutionCache(cache_dir=str(tmp_path), max_disk_bytes=1)
+    gp.compute_model(geo_model, gp.data.GemPyEngineConfig(solution_cache=cache))
+
+    assert len(os.listdir(tmp_path)) == 0
+
+
+def test_solution_cache_key_is_process_stable(geo_model):
+    key = solution_cache_key(geo_model, gp.data.GemPyEngineConfig())
+
+    for seed in ("1", "2"):
+        output = subprocess.run(
+            [sys.executable, "-c", _KEY_SCRIPT],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True, text=True, check=True
+        ).stdout
+        assert output.strip().splitlines()[-1] == key
+
+
+def test_solution_cache_hits_do_not_share_profiles(geo_model):
+    engine_config = gp.data.GemPyEngineConfig(solution_cache=gp.data.SolutionCache(), profiling=True, profile_memory=False)
+
+    first = gp.compute_model(geo_model, engine_config)
+    first_profile = first.profile
+    hit = gp.compute_model(geo_model, engine_config)
+
+    assert first.profile is first_profile
+    assert hit.profile is not first_profile
+    assert "solution cache lookup" in [stage.name for stage in hit.profile.stages]
+    assert not hasattr(gp.compute_model(geo_model, gp.data.GemPyEngineConfig(solution_cache=engine_config.solution_cache)), "profile")
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_generate_synthetic_model():
+    geo_model = gp.generate_synthetic_model(n_surfaces=4, n_faults=2, n_surface_points=301, n_orientations=7, clustering=.5, seed=42)
+
+    assert len(geo_model.structural_frame.structural_groups) == 3
+    assert len(geo_model.structural_frame.structural_elements) == 4 + 2 + 1  # * Plus basement
+    assert len(geo_model.surface_points_copy) == 301
+    assert len(geo_model.orientations_copy) == 7
+    assert geo_model.structural_frame.structural_groups[-1].number_of_orientations > 0
+
+    extent = geo_model.grid.extent
+    xyz = geo_model.surface_points_copy.xyz
+    assert np.all(xyz >= extent[::2]) and np.all(xyz <= extent[1::2])
+
+
+def test_generate_synthetic_model_is_deterministic():
+    kwargs = dict(n_surfaces=2, n_faults=1, n_surface_points=50, n_orientations=5, clustering=.8)
+
+    first = gp.generate_synthetic_model(**kwargs, seed=1)
+    second = gp.generate_synthetic_model(**kwargs, seed=1)
+    other = gp.generate_synthetic_model(**kwargs, seed=2)
+
+    assert first.structural_frame.fingerprint == second.structural_frame.fingerprint
+    assert first.structural_frame.fingerprint != other.structural_frame.fingerprint
+
+
+def test_generate_synthetic_model_wrong_arguments():
+    with pytest.raises(ValueError):
+        gp.generate_synthetic_model(n_surfaces=3, n_faults=1, n_surface_points=7)
+    with pytest.raises(ValueError):
+        gp.generate_synthetic_model(n_faults=3, n_orientations=3)
+    with pytest.raises(ValueError):
+        gp.generate_synthetic_model(clustering=2)
+
+
+def test_compute_synthetic_model():
+    geo_model = gp.generate_synthetic_model(n_surfaces=2, n_faults=1, n_surface_points=60, n_orientations=6, seed=0, refinement=3)
+    geo_model.interpolation_options.mesh_extraction = False
+    sol = gp.compute_model(geo_model)
+
+    assert len(np.unique(sol.raw_arrays.lith_block)) == 3
@@ -0,0 +1,200 @@
+"""
+Performance benchmarks over the example models.
+
+Every case generates an example model with `gp.generate_example_model`, changes one parameter (dense resolution,
+octree levels or number of surface points) and times `gp.compute_model`. The synthetic model of
+`gp.generate_synthetic_model` is swept over the total number of surface points. Each case runs in a fresh process, so the
+reported peak RSS belongs to that case only.
+
+Usage:
+    python -m test.test_benchmarks.benchmark_example_models --output benchmark_baseline.json
+    python -m test.test_benchmarks.benchmark_example_models --compare benchmark_baseline.json
+"""
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import multiprocessing
+import platform
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+BENCHMARK_MODELS = ["HORIZONTAL_STRAT", "ANTICLINE", "ONE_FAULT", "COMBINATION", "GRABEN"]
+DENSE_RESOLUTIONS = [20, 40, 80]
+OCTREE_LEVELS = [2, 3, 4, 5, 6, 7]
+SURFACE_POINTS_MULTIPLIERS = [1, 4, 16]
+SYNTHETIC_SURFACE_POINTS = [100, 1_000, 10_000]  # * Model `SYNTHETIC` is built with `gp.generate_synthetic_model`
+
+
+@dataclasses.dataclass
+class BenchmarkCase:
+    model: str  #: Name of the `ExampleModel` member or `SYNTHETIC`
+    sweep: str  #: One of `dense_resolution`, `octree_levels`, `surface_points_multiplier` or `surface_points`
+    value: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}-{self.sweep}-{self.value}"
+
+
+def default_cases(models: Optional[list[str]] = None) -> list[BenchmarkCase]:
+    """Returns the cases of `models`, which may include `SYNTHETIC`. If None, all the benchmark models and `SYNTHETIC`."""
+    cases = []
+    for model in BENCHMARK_MODELS if models is None else models:
+        if model == "SYNTHETIC":
+            continue
+        cases += [BenchmarkCase(model, "dense_resolution", resolution) for resolution in DENSE_RESOLUTIONS]
+        cases += [BenchmarkCase(model, "octree_levels", levels) for levels in OCTREE_LEVELS]
+        cases += [BenchmarkCase(model, "surface_points_multiplier", multiplier) for multiplier in SURFACE_POINTS_MULTIPLIERS]
+    if models is None or "SYNTHETIC" in models:
+        cases += [BenchmarkCase("SYNTHETIC", "surface_points", n_points) for n_points in SYNTHETIC_SURFACE_POINTS]
+    return cases
+
+
+def run_case(case: BenchmarkCase) -> dict:
+    """Runs one case in the current process and returns its measurements."""
+    import gempy as gp
+    from gempy.core.data.enumerators import ExampleModel
+    from gempy.core.data.grid_modules import RegularGrid
+    from gempy.modules.profiling.memory_usage import peak_rss_mb
+
+    if case.model == "SYNTHETIC":
+        geo_model: gp.data.GeoModel = gp.generate_synthetic_model(n_surface_points=case.value, n_orientations=max(10, case.value // 20), seed=0)
+    else:
+        geo_model: gp.data.GeoModel = gp.generate_example_model(ExampleModel[case.model], compute_model=False)
+    evaluation_options = geo_model.interpolation_options.evaluation_options
+
+    match case.sweep:
+        case "dense_resolution":
+            geo_model.grid.dense_grid = RegularGrid(extent=geo_model.grid.extent, resolution=np.array([case.value] * 3))
+            geo_model.grid.active_grids = gp.data.Grid.GridTypes.DENSE
+            evaluation_options.number_octree_levels = 1
+            evaluation_options.mesh_extraction = False
+        case "octree_levels":
+            geo_model.grid.set_octree_grid_by_levels(case.value, evaluation_options)
+            geo_model.grid.active_grids = gp.data.Grid.GridTypes.OCTREE
+        case "surface_points_multiplier":
+            _multiply_surface_points(geo_model, case.value)
+        case "surface_points" if case.model == "SYNTHETIC":
+            pass
+        case _:
+            raise ValueError(f"Sweep {case.sweep} not recognized")
+
+    start = time.perf_counter()
+    sol: gp.data.Solutions = gp.compute_model(geo_model)
+    wall_time = time.perf_counter() - start
+
+    return {
+            **dataclasses.asdict(case),
+            "name"                 : case.name,
+            "wall_time"            : wall_time,
+            "peak_rss_mb"          : peak_rss_mb(),
+            "kriging_system_sizes" : [int(output.weights.shape[0]) for output in sol.octrees_output[0].outputs_centers],
+            "n_surface_points"     : len(geo_model.surface_points_copy),
+            "n_orientations"       : len(geo_model.orientations_copy),
+            "n_evaluated_points"   : int(sum(octree.grid_centers.len_all_grids for octree in sol.octrees_output)),
+    }
+
+
+def run_suite(cases: list[BenchmarkCase]) -> dict:
+    """Runs every case in its own process and returns the results with the environment metadata."""
+    import gempy
+    import gempy_engine
+
+    results = []
+    for case in cases:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            try:
+                results.append(executor.submit(run_case, case).result())
+            except Exception as e:  # * A failing case should not hide the rest of the results
+                results.append({**dataclasses.asdict(case), "name": case.name, "error": repr(e)})
+        print(_format_result(results[-1]))
+
+    return {
+            "metadata": {
+                    "gempy"       : gempy.__version__,
+                    "gempy_engine": gempy_engine.__version__,
+                    "numpy"       : np.__version__,
+                    "python"      : sys.version.split()[0],
+                    "platform"    : platform.platform(),
+                    "processor"   : platform.processor(),
+            },
+            "results" : results
+    }
+
+
+def compare_with_baseline(current: dict, baseline: dict, time_tolerance: float = 0.25, memory_tolerance: float = 0.25) -> list[str]:
+    """Returns a description of every case that got slower or used more memory than the baseline allows."""
+    baseline_results = {result["name"]: result for result in baseline["results"] if "error" not in result}
+
+    regressions = []
+    for result in current["results"]:
+        reference = baseline_results.get(result["name"])
+        if reference is None:
+            continue
+        if "error" in result:
+            regressions.append(f"{result['name']}: failed with {result['error']}")
+            continue
+        if result["wall_time"] > reference["wall_time"] * (1 + time_tolerance):
+            regressions.append(f"{result['name']}: wall time {reference['wall_time']:.3f}s -> {result['wall_time']:.3f}s")
+        if result["peak_rss_mb"] is not None and reference["peak_rss_mb"] is not None and \
+                result["peak_rss_mb"] > reference["peak_rss_mb"] * (1 + memory_tolerance):
+            regressions.append(f"{result['name']}: peak RSS {reference['peak_rss_mb']:.1f}MB -> {result['peak_rss_mb']:.1f}MB")
+        if result["kriging_system_sizes"] != reference["kriging_system_sizes"]:
+            regressions.append(f"{result['name']}: kriging system sizes {reference['kriging_system_sizes']} -> {result['kriging_system_sizes']}")
+    return regressions
+
+
+def _multiply_surface_points(geo_model, multiplier: int):
+    """Adds `multiplier - 1` copies of every surface point on a small ring around it."""
+    import gempy as gp
+
+    extent = geo_model.grid.extent
+    radius = 0.005 * min(extent[1] - extent[0], extent[3] - extent[2])
+    angles = 2 * np.pi * np.arange(1, multiplier) / multiplier
+    for element in geo_model.structural_frame.structural_elements[:-1]:  # * Ignore basement
+        xyz = element.surface_points.xyz
+        if xyz.shape[0] == 0 or multiplier == 1:
+            continue
+        gp.add_surface_points(
+            geo_model=geo_model,
+            x=(xyz[:, 0][None, :] + radius * np.cos(angles)[:, None]).ravel(),
+            y=(xyz[:, 1][None, :] + radius * np.sin(angles)[:, None]).ravel(),
+            z=np.tile(xyz[:, 2], multiplier - 1),
+            elements_names=[element.name] * (xyz.shape[0] * (multiplier - 1))
+        )
+
+
+def _format_result(result: dict) -> str:
+    if "error" in result:
+        return f"{result['name']:<45} ERROR {result['error']}"
+    return f"{result['name']:<45} {result['wall_time']:>9.3f}s {result['peak_rss_mb'] or 0:>9.1f}MB  {result['kriging_system_sizes']}"
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Path where the results are written as JSON.")
+    parser.add_argument("--compare", help="Path of a baseline JSON to compare the results with.")
+    parser.add_argument("--models", nargs="+", default=None, help="ExampleModel members (or SYNTHETIC) to benchmark. Defaults to all of them.")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed relative increase of the wall time.")
+    args = parser.parse_args(argv)
+
+    current = run_suite(default_cases(args.models))
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(current, baseline, time_tolerance=args.time_tolerance)
+        print("\n".join(regressions) or "No regressions")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
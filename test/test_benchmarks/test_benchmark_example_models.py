@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+from test.conftest import TEST_SPEED, TestSpeed, skip_below_seconds
+from test.test_benchmarks.benchmark_example_models import BENCHMARK_MODELS, BenchmarkCase, run_case, run_suite, default_cases, compare_with_baseline
+
+#: Opt-in baseline to compare the suite with. If the file does not exist yet, the results are written there
+BASELINE_PATH = os.environ.get("GEMPY_BENCHMARK_BASELINE")
+
+
+@skip_below_seconds
+@pytest.mark.parametrize("sweep, value", [("dense_resolution", 10), ("octree_levels", 2), ("surface_points_multiplier", 2)])
+def test_run_case(sweep, value):
+    result = run_case(BenchmarkCase("TWO_AND_A_HALF_D", sweep, value))
+
+    assert result["wall_time"] > 0
+    assert len(result["kriging_system_sizes"]) == 2
+    if sweep == "surface_points_multiplier":
+        assert result["n_surface_points"] == 2 * run_case(BenchmarkCase("TWO_AND_A_HALF_D", sweep, 1))["n_surface_points"]
+
+    baseline = {"results": [{**result, "wall_time": result["wall_time"] / 10}]}
+    assert len(compare_with_baseline({"results": [result]}, baseline)) == 1
+
+
+@pytest.mark.skipif(TEST_SPEED.value < TestSpeed.HOURS.value, reason="Global test speed below this test value.")
+def test_benchmark_suite(tmp_path):
+    current = run_suite(default_cases())
+    assert not [result["name"] for result in current["results"] if "error" in result]
+    with open(tmp_path / "benchmark_results.json", "w") as f:
+        json.dump(current, f, indent=2)
+
+    if BASELINE_PATH is None:
+        return
+    if not os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(current, f, indent=2)
+        pytest.skip(f"No baseline found. Baseline written to {BASELINE_PATH}")
+
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(current, baseline)
+    assert not regressions, "\n".join(regressions)
+
+
+def test_default_cases():
+    assert {case.model for case in default_cases()} == {*BENCHMARK_MODELS, "SYNTHETIC"}
+    assert {case.model for case in default_cases(["ANTICLINE"])} == {"ANTICLINE"}
+    assert {case.model for case in default_cases(["SYNTHETIC"])} == {"SYNTHETIC"}
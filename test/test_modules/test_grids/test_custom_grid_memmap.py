@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.core.data.enumerators import ExampleModel
+from gempy.core.data.grid_modules import CustomGrid
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def _write_points(tmp_path, n_points: int = 1_000) -> tuple[str, np.ndarray]:
+    rng = np.random.default_rng(0)
+    xyz = np.column_stack((rng.uniform(0, 1000, n_points), rng.uniform(0, 1000, n_points), rng.uniform(0, 1000, n_points)))
+    path = str(tmp_path / "points.npy")
+    np.save(path, xyz)
+    return path, xyz
+
+
+def test_custom_grid_from_file_is_not_copied(tmp_path):
+    path, xyz = _write_points(tmp_path)
+    geo_model: gp.data.GeoModel = gp.generate_example_model(ExampleModel.TWO_AND_A_HALF_D, compute_model=False)
+
+    custom_grid = gp.set_custom_grid(geo_model.grid, xyz_coord=path)
+    geo_model.grid.active_grids = gp.data.Grid.GridTypes.CUSTOM
+
+    assert isinstance(custom_grid.values, np.memmap)
+    assert custom_grid.path == path
+    assert geo_model.grid.values is custom_grid.values  # * Only the custom grid is active
+    np.testing.assert_array_equal(custom_grid.values, xyz)
+
+    memmap = np.load(path, mmap_mode='r')
+    assert CustomGrid(memmap).path == path
+
+
+def test_compute_model_at_memory_mapped_custom_grid(tmp_path):
+    path, xyz = _write_points(tmp_path)
+    geo_model: gp.data.GeoModel = gp.generate_example_model(ExampleModel.TWO_AND_A_HALF_D, compute_model=False)
+    custom_grid = CustomGrid.from_file(path)
+
+    out = custom_grid.open_output()
+    gp.compute_model_at(geo_model, at=custom_grid, chunk_size=300, out=out)
+    out.flush()
+
+    assert custom_grid.output_path("lith_block") == str(tmp_path / "points.lith_block.npy")
+    np.testing.assert_allclose(np.load(custom_grid.output_path("lith_block")), gp.compute_model_at(geo_model, at=xyz))
+
+    with pytest.raises(ValueError):
+        CustomGrid(xyz).open_output()
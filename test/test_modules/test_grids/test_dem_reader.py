@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.core.data.grid_modules import RegularGrid
+from gempy.modules.grids.dem_reader import is_georeferenced_dem, read_dem_window
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+# * 40 x 60 cells of 10 m, covering [1000, 1600] x [2000, 2400]. Row 0 is the northernmost one
+RASTER = np.add.outer(np.arange(40)[::-1] * 100., np.arange(60)).astype('float32')
+RASTER[0, 0] = -9999
+RASTER_EXTENT = [1000, 1600, 2000, 2400]
+
+
+def _write_rasters(tmp_path) -> dict:
+    ascii_path = tmp_path / "dem.asc"
+    with open(ascii_path, "w") as f:
+        f.write("ncols 60\nnrows 40\nxllcorner 1000\nyllcorner 2000\ncellsize 10\nNODATA_value -9999\n")
+        np.savetxt(f, RASTER, fmt="%.1f")
+
+    npy_path = tmp_path / "dem.npy"
+    np.save(npy_path, RASTER)
+
+    bil_path = tmp_path / "dem.bil"
+    RASTER.astype('>f4').tofile(bil_path)
+    with open(tmp_path / "dem.hdr", "w") as f:
+        f.write("BYTEORDER M\nLAYOUT BIL\nNROWS 40\nNCOLS 60\nNBANDS 1\nNBITS 32\nPIXELTYPE FLOAT\n"
+                "ULXMAP 1005\nULYMAP 2395\nXDIM 10\nYDIM 10\nNODATA -9999\n")
+    return {"asc": ascii_path, "npy": npy_path, "bil": bil_path}
+
+
+def test_read_dem_window(tmp_path):
+    paths = _write_rasters(tmp_path)
+
+    for name, path in paths.items():
+        x, y, z = read_dem_window(path, extent=[1100, 1200, 2300, 2400], raster_extent=RASTER_EXTENT, nodata=-9999 if name == "npy" else None)
+        np.testing.assert_allclose(x, np.arange(1105, 1200, 10))
+        np.testing.assert_allclose(y, np.arange(2305, 2400, 10))
+        # * Row r and column c of the raster is at y = 2395 - 10 r and x = 1005 + 10 c
+        np.testing.assert_allclose(z, RASTER[9::-1, 10:20].T)
+
+        # * Blocks of 2 x 5 cells are averaged, and the missing cell is ignored
+        x, y, z = read_dem_window(path, extent=[1000, 1100, 2300, 2400], resolution=[5, 2], raster_extent=RASTER_EXTENT, nodata=-9999 if name == "npy" else None)
+        assert z.shape == (5, 2)
+        np.testing.assert_allclose(x, np.arange(1010, 1100, 20))
+        np.testing.assert_allclose(y, [2325, 2375])
+        north_west_block = RASTER[:5, :2].ravel()[1:]
+        np.testing.assert_allclose(z[0, 1], north_west_block.mean())
+
+    with pytest.raises(ValueError):
+        read_dem_window(paths["npy"], extent=[1100, 1200, 2300, 2400])
+    with pytest.raises(ValueError):
+        read_dem_window(paths["asc"], extent=[0, 100, 0, 100])
+
+
+def test_set_topography_from_dem(tmp_path):
+    paths = _write_rasters(tmp_path)
+    grid = gp.data.Grid()
+    grid.dense_grid = RegularGrid(extent=[1200, 1400, 2100, 2300, 0, 1000], resolution=[10, 10, 10])
+
+    topography = gp.set_topography_from_dem(grid, paths["bil"], resolution=[10, 5])
+    assert topography.resolution == (10, 5)
+    assert topography.x.min() > 1200 and topography.x.max() < 1400
+    assert gp.data.Grid.GridTypes.TOPOGRAPHY in grid.active_grids
+
+    # * Self-georeferenced rasters given to set_topography_from_file are read whole unless they are cropped
+    with pytest.raises(ValueError):  # * The north-west cell has no data
+        gp.set_topography_from_file(grid, str(paths["asc"]))
+    from_file = gp.set_topography_from_file(grid, str(paths["asc"]), crop_to_extent=[1100, 1600, 2000, 2300])
+    assert from_file.resolution == (50, 30)
+    np.testing.assert_array_equal(from_file.z, RASTER[39:9:-1, 10:].T)
+
+    assert is_georeferenced_dem(paths["asc"]) and is_georeferenced_dem(paths["bil"])
+    assert not is_georeferenced_dem(paths["npy"])
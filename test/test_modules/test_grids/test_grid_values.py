@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.core.data.grid_modules import RegularGrid
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+GridTypes = gp.data.Grid.GridTypes
+
+
+def _create_grid() -> gp.data.Grid:
+    grid = gp.data.Grid.init_dense_grid(extent=[0, 100, 0, 100, 0, 100], resolution=[10, 10, 10])
+    gp.set_custom_grid(grid, xyz_coord=np.array([[1., 2., 3.], [4., 5., 6.]]))
+    gp.set_section_grid(grid, section_dict={'section': ([0, 0], [100, 100], [20, 10])})
+    return grid
+
+
+def test_grid_values_are_lazy():
+    grid = _create_grid()
+    values = grid.values
+
+    assert values.shape == (1000 + 2 + 200, 3)
+    assert grid.values is values  # * Not rebuilt while nothing changes
+    np.testing.assert_array_equal(values[grid.grid_slices[GridTypes.CUSTOM]], grid.custom_grid.values)
+    np.testing.assert_array_equal(values[slice(*grid.get_grid_args('sections'))], grid.sections.values)
+    np.testing.assert_array_equal(values[slice(*grid.get_section_args('section'))], grid.sections.values)
+
+    grid.active_grids ^= GridTypes.CUSTOM
+    assert grid.values.shape == (1200, 3)
+    assert grid.get_grid_args(GridTypes.CUSTOM) == (1000, 1000)
+    np.testing.assert_array_equal(grid.length, [0, 0, 1000, 1000, 1000, 1200, 1200])
+
+    grid.dense_grid = RegularGrid(extent=grid.extent, resolution=np.array([5, 5, 5]))
+    assert grid.values.shape == (125 + 200, 3)
+
+
+def test_grid_values_reset_active_grids():
+    grid = _create_grid()
+    gp.set_active_grid(grid, [GridTypes.CUSTOM], reset=True)
+
+    np.testing.assert_array_equal(grid.values, grid.custom_grid.values)
+
+    with pytest.raises(AttributeError):
+        grid.active_grids |= GridTypes.TOPOGRAPHY
+
+
+def test_grid_values_cache_follows_versions():
+    grid = _create_grid()
+    gp.set_topography_from_random(grid, d_z=np.array([40, 60]))
+    values = grid.values
+    assert grid.values is values  # * Topography and sections do not rebuild it
+
+    topography_values = grid.topography.values.copy()
+    topography_values[:, 2] += 1
+    grid.topography.set_values(topography_values.reshape(*grid.topography.resolution, 3))
+    new_values = grid.values
+    assert new_values is not values
+    np.testing.assert_array_equal(new_values[slice(*grid.get_grid_args('topography'))], topography_values)
+
+    grid.custom_grid.set_custom_grid(np.array([[7., 8., 9.]]))
+    np.testing.assert_array_equal(grid.values[grid.grid_slices[GridTypes.CUSTOM]], [[7., 8., 9.]])
+
+    implicit_grid = gp.data.Grid()
+    implicit_grid.dense_grid = RegularGrid(extent=[0, 10, 0, 10, 0, 10], resolution=[4, 4, 4], implicit=True)
+    values = implicit_grid.values
+    assert implicit_grid.values is values
+    implicit_grid.dense_grid.set_regular_grid(extent=[0, 10, 0, 10, 0, 20], resolution=[4, 4, 4])
+    assert implicit_grid.values[:, 2].max() > values[:, 2].max()
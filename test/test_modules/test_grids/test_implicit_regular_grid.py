@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.core.data.grid_modules import RegularGrid
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+@pytest.mark.parametrize("rotated", [False, True])
+def test_implicit_regular_grid_values(rotated):
+    if rotated:
+        kwargs = dict(pivot=(10, 10), point_x_axis=(50, 40), distance_point3=30, zmin=-50, zmax=0, resolution=np.array([6, 5, 4]), plot=False)
+        eager = RegularGrid.from_corners_box(**kwargs)
+        implicit = RegularGrid(extent=eager.extent, resolution=eager.resolution, transform=eager.transform, implicit=True)
+    else:
+        eager = RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[6, 5, 4])
+        implicit = RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[6, 5, 4], implicit=True)
+
+    assert implicit._values.size == 0  # * Nothing is stored
+    assert len(implicit) == len(eager.values) == 120
+    np.testing.assert_allclose(implicit.values, eager.values)
+
+    blocks = list(implicit.iter_values_blocks(block_size=50))
+    assert [block.shape[0] for _, block in blocks] == [50, 50, 20]
+    np.testing.assert_allclose(np.concatenate([block for _, block in blocks]), eager.values)
+    np.testing.assert_allclose(implicit.get_values_block(33, 47), eager.values[33:47])
+
+
+def test_compute_model_at_implicit_grid():
+    geo_model = gp.generate_synthetic_model(n_surfaces=2, n_faults=1, n_surface_points=40, n_orientations=4, seed=0, refinement=3)
+    grid = RegularGrid(extent=geo_model.grid.extent, resolution=np.array([8, 6, 5]), implicit=True)
+
+    values = gp.compute_model_at(geo_model, at=grid, chunk_size=64)
+
+    np.testing.assert_allclose(values, gp.compute_model_at(geo_model, at=grid.values))
+    assert gp.compute_scalar_fields_at(geo_model, at=grid, chunk_size=100).shape == (2, 240)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import gempy as gp
+from gempy.core.data.enumerators import ExampleModel
+from gempy.core.data.grid_modules import OctreeROI
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_octree_roi_intersects():
+    box = OctreeROI(max_level=5, extent=[0, 10, 0, 10, 0, 10])
+    centers = np.array([[5, 5, 5], [11, 5, 5], [13, 5, 5]])
+    np.testing.assert_array_equal(box.intersects(centers, half_size=np.array([1.5, 1.5, 1.5])), [True, True, False])
+
+    mask = np.zeros((4, 4, 4), dtype=bool)
+    mask[0, 0, 0] = True
+    masked = OctreeROI(max_level=5, mask=mask, mask_extent=[0, 4, 0, 4, 0, 4])
+    np.testing.assert_array_equal(masked.intersects(np.array([[0.5, 0.5, 0.5], [2.5, 2.5, 2.5], [1.4, 1.4, 1.4]]), half_size=np.array([.5, .5, .5])),
+                                  [True, False, True])
+
+    with pytest.raises(ValueError):
+        OctreeROI(max_level=5)
+    with pytest.raises(ValueError):
+        OctreeROI(max_level=5, mask=mask)
+
+
+def test_octree_refines_only_inside_rois():
+    geo_model: gp.data.GeoModel = gp.generate_example_model(ExampleModel.TWO_AND_A_HALF_D, compute_model=False)
+    evaluation_options = geo_model.interpolation_options.evaluation_options
+
+    geo_model.grid.set_octree_grid_by_levels(4, evaluation_options)
+    geo_model.grid.active_grids = gp.data.Grid.GridTypes.OCTREE
+    uniform: gp.data.Solutions = gp.compute_model(geo_model)
+
+    roi = OctreeROI(max_level=4, extent=[0, 200, -200, 200, -582, 0])
+    geo_model.grid.set_octree_grid_by_levels(2, evaluation_options, rois=[roi])
+    geo_model.grid.active_grids = gp.data.Grid.GridTypes.OCTREE
+    assert evaluation_options.number_octree_levels == 4
+    assert geo_model.grid.octree_rois == (roi,)
+    local: gp.data.Solutions = gp.compute_model(geo_model)
+
+    # * The voxels are filtered by GemPy, the engine is left as it is
+    from gempy_engine.modules.octrees_topology import octrees_topology_interface, _octree_internals
+    assert octrees_topology_interface.compute_next_octree_locations is _octree_internals.compute_next_octree_locations
+
+    n_voxels_uniform = [octree.grid_centers.octree_grid.values.shape[0] for octree in uniform.octrees_output]
+    n_voxels_local = [octree.grid_centers.octree_grid.values.shape[0] for octree in local.octrees_output]
+    assert n_voxels_local[:2] == n_voxels_uniform[:2]
+    assert n_voxels_local[-1] < n_voxels_uniform[-1]
+
+    # * The finest voxels are all inside the region, up to the size of the voxels they were split from
+    finest_voxels = geo_model.input_transform.apply_inverse(np.asarray(local.octrees_output[-1].grid_centers.octree_grid.values))
+    assert finest_voxels[:, 0].max() < 200 + 791 / 2 ** 3
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from gempy.core.data.core_utils import calculate_line_coordinates_2points
+from gempy.core.data.grid_modules import Sections
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def _section_by_meshgrid(p1, p2, resolution, z_ext):
+    xy = calculate_line_coordinates_2points(np.array(p1, dtype=float), np.array(p2, dtype=float), resolution[0])
+    z = np.linspace(z_ext[0], z_ext[1], resolution[1])
+    X, Z = np.meshgrid(xy[:, 0], z, indexing='ij')
+    Y, _ = np.meshgrid(xy[:, 1], z, indexing='ij')
+    return np.vstack((X.ravel(), Y.ravel(), Z.ravel())).T
+
+
+def test_section_coordinates_match_meshgrid():
+    section_dict = {
+            'section_a': ([0, 0], [100, 50], [20, 10]),
+            'section_b': ([10, 5], [3, 80], [1, 4]),
+            'section_c': ([5, 5], [6, 6], [7, 1]),
+    }
+    sections = Sections(z_ext=[-50, 10], section_dict=section_dict)
+
+    np.testing.assert_array_equal(sections.length, [0, 200, 204, 211])
+    for name, (p1, p2, resolution) in section_dict.items():
+        np.testing.assert_allclose(sections.get_section_grid(name), _section_by_meshgrid(p1, p2, resolution, [-50, 10]))
+
+
+def test_sections_from_arrays():
+    rng = np.random.default_rng(0)
+    start = rng.uniform(0, 100, (50, 2))
+    stop = rng.uniform(100, 200, (50, 2))
+
+    sections = Sections.from_arrays(start=start, stop=stop, resolution=[8, 5], z_ext=[-10, 0])
+
+    assert sections.values.shape == (50 * 8 * 5, 3)
+    assert list(sections.df.index[:2]) == ['section_0', 'section_1']
+    np.testing.assert_allclose(sections.get_section_grid('section_7'), _section_by_meshgrid(start[7], stop[7], [8, 5], [-10, 0]))
+
+    with pytest.raises(ValueError):
+        Sections.from_arrays(start=start, stop=stop[:10], resolution=[8, 5], z_ext=[-10, 0])
@@ -0,0 +1,45 @@
+import numpy as np
+
+from gempy.core.data.grid_modules import RegularGrid
+from gempy.core.data.grid_modules.topography import Topography
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def _plane_topography(regular_grid: RegularGrid, offset: float) -> np.ndarray:
+    x, y = np.meshgrid(np.linspace(0, 100, 7), np.linspace(0, 50, 4), indexing='ij')
+    return np.dstack([x, y, offset + 0.1 * x - 0.2 * y])
+
+
+def _expected_mask(regular_grid: RegularGrid, offset: float) -> np.ndarray:
+    # * Bilinear interpolation is exact for a plane
+    topography_z = offset + 0.1 * regular_grid.x_coord[:, None, None] - 0.2 * regular_grid.y_coord[None, :, None]
+    return regular_grid.values[:, 2].reshape(regular_grid.resolution) > topography_z - 2 * regular_grid.dz
+
+
+def test_topography_mask():
+    regular_grid = RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[20, 10, 25])
+    topography = Topography(regular_grid, _plane_topography(regular_grid, offset=-25))
+
+    index = topography.topography_mask_index
+    assert index.shape == (20, 10) and index.dtype == np.int32
+    np.testing.assert_array_equal(topography.topography_mask, _expected_mask(regular_grid, offset=-25))
+    assert topography.topography_mask_index is index
+
+    # * The mask follows the topography and the grid
+    topography.set_values(_plane_topography(regular_grid, offset=-10))
+    np.testing.assert_array_equal(topography.topography_mask, _expected_mask(regular_grid, offset=-10))
+
+    regular_grid.set_regular_grid(extent=[0, 100, 0, 50, -50, 0], resolution=[8, 6, 10])
+    assert topography.topography_mask.shape == (8, 6, 10)
+    np.testing.assert_array_equal(topography.topography_mask, _expected_mask(regular_grid, offset=-10))
+
+
+def test_topography_interpolate_z_descending_axes():
+    regular_grid = RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[4, 4, 4])
+    values_2d = _plane_topography(regular_grid, offset=-25)[::-1, ::-1]
+    topography = Topography(regular_grid, values_2d)
+
+    z = topography.interpolate_z(np.array([-10., 50., 110.]), np.array([25.]))
+    np.testing.assert_allclose(z[:, 0], [-30., -25., -20.])
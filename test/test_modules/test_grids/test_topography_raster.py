@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from gempy.core.data.grid_modules import RegularGrid
+from gempy.core.data.grid_modules.topography import Topography
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def test_topography_stores_raster_axes():
+    regular_grid = RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[4, 4, 4])
+    x, y = np.linspace(0, 100, 6), np.linspace(0, 50, 3)
+    z = np.arange(18, dtype=float).reshape(6, 3)
+
+    topography = Topography.from_arrays(regular_grid, x, y, z)
+    assert topography.x is topography.x
+    np.testing.assert_array_equal(topography.y, y)
+    assert topography.resolution == (6, 3)
+
+    x_2d, y_2d = np.meshgrid(x, y, indexing='ij')
+    values_2d = np.dstack([x_2d, y_2d, z])
+    np.testing.assert_array_equal(topography.values_2d, values_2d)
+    np.testing.assert_array_equal(topography.values, values_2d.reshape(-1, 3))
+
+    # * Rasters given as XYZ coordinates are split into their axes
+    from_values = Topography(regular_grid, values_2d)
+    np.testing.assert_array_equal(from_values.x, x)
+    np.testing.assert_array_equal(from_values.z, z)
+
+    with pytest.raises(ValueError):
+        Topography(regular_grid, values_2d.transpose(1, 0, 2))
+    with pytest.raises(ValueError):
+        Topography.from_arrays(regular_grid, x, y, z.T)
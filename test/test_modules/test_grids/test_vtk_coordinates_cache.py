@@ -0,0 +1,55 @@
+import numpy as np
+
+import gempy as gp
+from gempy.core.data.enumerators import ExampleModel
+from gempy.core.data.grid_modules import RegularGrid
+from test.conftest import skip_below_seconds
+
+pytestmark = skip_below_seconds
+
+
+def _meshgrid_corners(extent, resolution):
+    axes = [np.linspace(extent[2 * i], extent[2 * i + 1], resolution[i] + 1) for i in range(3)]
+    xv, yv, zv = np.meshgrid(*axes, indexing="ij")
+    return np.vstack((xv.ravel(), yv.ravel(), zv.ravel())).T
+
+
+def test_vtk_axes_are_cached_until_the_grid_changes():
+    grid = RegularGrid(extent=[0, 100, 0, 50, -50, 0], resolution=[6, 5, 4])
+
+    axes = grid.vtk_axes
+    assert grid.vtk_axes is axes
+    assert not axes[0].flags.writeable
+
+    # * The corners are built on every call, so callers can modify them
+    values = grid.values_vtk_format
+    assert values.flags.writeable and grid.values_vtk_format is not values
+    np.testing.assert_allclose(values, _meshgrid_corners(grid.extent, grid.resolution))
+    np.testing.assert_allclose(np.meshgrid(*axes, indexing="ij")[0].ravel(), values[:, 0])
+
+    grid.set_regular_grid(extent=[0, 100, 0, 50, -50, 0], resolution=[3, 3, 3])
+    assert grid.vtk_axes is not axes
+    np.testing.assert_allclose(grid.values_vtk_format, _meshgrid_corners(grid.extent, grid.resolution))
+
+
+def test_vtk_values_follow_the_transform():
+    grid = RegularGrid.from_corners_box(pivot=(10, 10), point_x_axis=(50, 40), distance_point3=30, zmin=-50, zmax=0,
+                                        resolution=np.array([4, 3, 2]), plot=False)
+
+    orthogonal = grid.get_values_vtk_format(orthogonal=True)
+    rotated = grid.get_values_vtk_format(orthogonal=False)
+    np.testing.assert_allclose(orthogonal, _meshgrid_corners(grid.extent, grid.resolution))
+    np.testing.assert_allclose(rotated, grid.transform.apply_inverse_with_pivot(
+        points=orthogonal, pivot=np.array([grid.extent[0], grid.extent[2], grid.extent[4]]))
+    )
+
+
+def test_geo_model_transformed_coordinates():
+    geo_model: gp.data.GeoModel = gp.generate_example_model(ExampleModel.TWO_AND_A_HALF_D, compute_model=False)
+
+    transformed = geo_model.regular_grid_coordinates_transformed
+    assert transformed.flags.writeable
+    np.testing.assert_allclose(transformed, geo_model.input_transform.apply(geo_model.grid.regular_grid.get_values_vtk_format(orthogonal=True)))
+
+    geo_model.input_transform.scale = geo_model.input_transform.scale * 2
+    np.testing.assert_allclose(geo_model.regular_grid_coordinates_transformed, geo_model.input_transform.apply(geo_model.grid.regular_grid.get_values_vtk_format(orthogonal=True)))